@@ -1,71 +1,35 @@
-import pandas as pd
-import plotly.express as px
 import streamlit as st
-import io
-from pathlib import Path
 
-from utils import load_data, load_data2
+from page_shell import ouvrir_page
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Data Analytics Dashboard",
-    page_icon="📊",
-    layout="wide",
+# En-tête affiché avant d'importer les bibliothèques d'analyse et de charger les données
+timer = ouvrir_page(
+    "Home",
+    "Data Analytics Dashboard",
+    "📊",
+    "🚀 Data Analytics Dashboard",
+    "### Bienvenue dans votre tableau de bord d'analyse de données",
     initial_sidebar_state="expanded",
 )
 
+timer.etape("imports")
+import time
+from functools import lru_cache
+from pathlib import Path
 
-# Définir le chemin absolu du logo
-logo_path = Path(__file__).parent / "assets" / "images" / "logo.png"
-# --- HEADER ---
-st.markdown(
-    """
-    <style>
-        .header {
-            background-color: #003366;
-            padding: 30px;
-            text-align: center;
-            color: white;
-            font-size: 24px;
-            font-weight: bold;
-            border-radius: 10px;
-        }
-        .footer {
-            position: bottom;
-            bottom: 0;
-            width: 100%;
-            background-color: #003366;
-            color: white;
-            text-align: center;
-            padding: 10px;
-            font-size: 14px;
-            border-radius: 10px;
-        }
-        .sidebar .sidebar-content {
-            background-color: #f0f2f6;
-        }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-# Affichage du logo et du titre
-col1, col2 = st.columns([1, 3])
-with col1:
-    st.image(logo_path, width=400)
-with col2:
-    st.markdown("<div class='header'>Hôpitaux Universitaires - Pitié Salpêtrière</div>", unsafe_allow_html=True)
-
-
-
-css_file = Path(__file__).parent / "assets" / "css" / "style.css"
-# Chargement des styles CSS personnalisés
-with open(css_file, "r") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+import numpy as np
+import pandas as pd
+import plotly.express as px
 
-# Titre principal
-st.title("🚀 Data Analytics Dashboard")
-st.markdown("### Bienvenue dans votre tableau de bord d'analyse de données")
+import config
+import snapshots
+from census import indicateurs_occupation, jours_occupes, recensement_lits
+from exports import bouton_export
+from jobs import executor
+from live_feed import RunningTotals, start_feed
+from loaders import get_admissions, get_echantillon, version_donnees
+from rollups import TimeRollups
+from sampling import arrondi_marge, effectifs, moyennes, quantile_normal
 
 # Sidebar pour les filtres généraux
 st.sidebar.header("Filtres Globaux")
@@ -73,17 +37,20 @@ st.sidebar.info("Ces filtres s'appliquent à toutes les pages de l'application."
 
 
 
-dataset_path = Path(__file__).parent / "data" / "dataset_admission.csv"
+# Flux en direct partagé par toutes les sessions : les événements sont agrégés au fil de l'eau
+@st.cache_resource
+def get_live_feed():
+    source = config.LIVE_FEED["source"]
+    if not source.startswith("tcp://"):
+        source = str(Path(__file__).parent / source)
+    aggregates, _ = start_feed(source, from_start=config.LIVE_FEED["from_start"])
+    return aggregates
 
-# Chargement et mise en cache des données
-@st.cache_data
-def get_data():
-    return load_data2(str(dataset_path))  # Convertir en string pour compatibilité
 
+timer.etape("chargement")
+df = get_admissions()
 
-
-df = get_data()
-
+timer.etape("widgets de filtre")
 # Filtres pour la période
 start_date, end_date = st.sidebar.date_input(
     "Période d'admission",
@@ -149,126 +116,328 @@ selected_saisons = st.sidebar.multiselect(
     key="c=saisons_home",
 )
 
-# Application des filtres
-filtered_df = df[
-    (df["Date_admission"] >= start_datetime) 
-    & (df["Date_admission"] <= end_datetime) 
-    & (df["Service d'admission"].isin(selected_services)) 
-    & (df["Saison"].isin(selected_saisons))
-    & (df["Sexe"].isin(selected_sexes)) 
-    & (df["Gravité"].isin(selected_gravites)) 
-    & (df["Mode d'arrivée"].isin(selected_modes_arrivee)) 
-    & (df["Type d'hospitalisation"].isin(selected_types_hosp))
-]
-
-# Affichage des indicateurs principaux
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric("Total Admissions", len(filtered_df))
-
-with col2:
-    st.metric("Durée Moyenne du Séjour", round(filtered_df["Durée du séjour estimé"].mean(), 1)) # type: ignore
-
-with col3:
-    lits_occupes_total = filtered_df["Lits occupes"].fillna(0).sum()
-
-    if len(filtered_df) > 0:
-        taux_occupation = (lits_occupes_total / len(filtered_df)) * 100
-        st.metric("Taux d'Occupation des Lits", f"{int(round(taux_occupation, 1))}%")
-    else:
-        st.metric("Taux d'Occupation des Lits", "nan")
-with col4:
-    temperature_moyenne = round(filtered_df["Température"].mean()) if not filtered_df["Température"].isna().all() else 0
-    st.metric("Température Moyenne", f"{temperature_moyenne}°C")
-# Ajout de nouveaux KPI
-col5, col6, col7, col8 = st.columns(4)
-
-with col5:
-    materiel_utilise = filtered_df["Materiel utilise"].sum()
-    st.metric("Total Matériel Consommé", int(materiel_utilise))
-with col6:
-    total_medecins = (filtered_df["Nb medecin"].sum() / 4).round().astype(int)
-    st.metric("Nombre de Médecins Mobilisés", int(total_medecins))
-with col7:
-    total_infirmiers = (filtered_df["Nb infirmier"].sum() / 4).round().astype(int)
-    st.metric("Nombre d'Infirmiers Mobilisés", int(total_infirmiers))
-with col8:
-    total_aide_soignants = (filtered_df["Nb aide soignant"].sum() / 4).round().astype(int)
-    st.metric("Nombre AS Mobilisés", int(total_aide_soignants))
+timer.etape("filtrage")
+# Application des filtres : filtres patients seuls (recensement des lits) et filtres avec la période
+def appliquer_filtres(donnees):
+    filtres_patients = (
+        (donnees["Service d'admission"].isin(selected_services)) 
+        & (donnees["Saison"].isin(selected_saisons))
+        & (donnees["Sexe"].isin(selected_sexes)) 
+        & (donnees["Gravité"].isin(selected_gravites)) 
+        & (donnees["Mode d'arrivée"].isin(selected_modes_arrivee)) 
+        & (donnees["Type d'hospitalisation"].isin(selected_types_hosp))
+    )
+    filtres_periode = (
+        (donnees["Date_admission"] >= start_datetime) 
+        & (donnees["Date_admission"] <= end_datetime) 
+        & filtres_patients
+    )
+    return filtres_patients, filtres_periode
+
+
+def _lignes(donnees, poids, masque):
+    # Lignes retenues et leurs poids de sondage (None pour un calcul exact)
+    return donnees[masque], None if poids is None else poids[masque.to_numpy()]
+
+
+def agregat_indicateurs(donnees, poids, filtres_patients, filtres_periode):
+    selection, poids_selection = _lignes(donnees, poids, filtres_periode)
+    patients, poids_patients = _lignes(donnees, poids, filtres_patients)
+    # Recensement des lits sur la période : les séjours commencés avant le début de la période sont comptés
+    occupation = indicateurs_occupation(recensement_lits(patients, start_datetime, end_datetime, poids=poids_patients))
+    return {"totaux": RunningTotals.from_frame(selection, poids_selection).to_dict(), "occupation": occupation}
+
+
+def agregat_quotidien(donnees, poids, filtres_patients, filtres_periode):
+    # Admissions par jour, service et gravité : un seul passage sur les lignes filtrées
+    selection, poids_selection = _lignes(donnees, poids, filtres_periode)
+    cles = ["Date_admission", "Service d'admission", "Gravité"]
+    return effectifs(selection, cles, poids_selection).rename("ID_patient").reset_index()
+
+
+def agregat_repartitions(donnees, poids, filtres_patients, filtres_periode):
+    # Répartition des admissions filtrées selon chaque colonne des camemberts, comptée avant le tracé :
+    # la figure transporte une valeur par modalité plutôt qu'un libellé par admission
+    selection, poids_selection = _lignes(donnees, poids, filtres_periode)
+    colonnes = ["Tranche_age", "Sexe", "Vacances_scolaires", "Evenement_Special"]
+    return {colonne: effectifs(selection, [colonne], poids_selection).rename("count").reset_index() for colonne in colonnes}
+
+
+def agregat_globaux(donnees, poids, filtres_patients, filtres_periode):
+    # Vues sur l'ensemble des admissions, indépendantes des filtres
+    return {
+        "mode": effectifs(donnees, ["Mode d'arrivée"], poids).rename("ID_patient").reset_index(),
+        "hospitalisation": effectifs(donnees, ["Type d'hospitalisation"], poids).rename("ID_patient").reset_index(),
+        "duree": moyennes(donnees, ["Service d'admission", "Type d'hospitalisation"], "Durée du séjour estimé", poids).reset_index(),
+    }
+
+
+AGREGATS = {
+    "indicateurs": agregat_indicateurs,
+    "quotidien": agregat_quotidien,
+    "repartitions": agregat_repartitions,
+    "globaux": agregat_globaux,
+}
+
+
+def calculer_exact():
+    filtres = appliquer_filtres(df)
+    return {"filtres": filtres, **{nom: calcul(df, None, *filtres) for nom, calcul in AGREGATS.items()}}
+
+
+# Vue pré-calculée (snapshots.py) quand les filtres correspondent à un préréglage : figures et
+# indicateurs servis sans recalcul, sinon calculés en direct ci-dessous
+vue = snapshots.vue(
+    "Home",
+    periode=(start_date, end_date),
+    sexes=selected_sexes,
+    gravites=selected_gravites,
+    modes_arrivee=selected_modes_arrivee,
+    types_hosp=selected_types_hosp,
+    services=selected_services,
+    saisons=selected_saisons,
+)
+
+# Mode approché (sampling.py) : sur un très grand historique, une vue qui n'est pas pré-calculée est
+# d'abord estimée sur l'échantillon stratifié, pendant que le calcul exact tourne dans un job partagé
+# par les sessions (jobs.py) ; la page est relancée avec les valeurs exactes dès qu'il est terminé
+echantillon = get_echantillon() if not vue.servie and vue.capture is None else None
+job_exact = None
+if echantillon is not None:
+    job_exact = executor().soumettre(
+        ("accueil", version_donnees(), start_date, end_date, *(tuple(valeurs) for valeurs in (
+            selected_sexes, selected_gravites, selected_modes_arrivee, selected_types_hosp, selected_services, selected_saisons,
+        ))),
+        calculer_exact,
+        groupe="accueil",
+    )
+approche = job_exact is not None and not job_exact.future.done()
+donnees, poids = (echantillon.df, echantillon.poids) if approche else (df, None)
+
+
+# Filtres et agrégats calculés à la première demande qui n'est pas servie par l'instantané
+@lru_cache(maxsize=1)
+def get_filtres():
+    if job_exact is not None and not approche:
+        return job_exact.future.result()["filtres"]
+    return appliquer_filtres(donnees)
+
+
+@lru_cache(maxsize=None)
+def get_agregat(nom):
+    if job_exact is not None and not approche:
+        return job_exact.future.result()[nom]
+    return AGREGATS[nom](donnees, poids, *get_filtres())
+
+
+def calculer_marges():
+    """Demi-largeurs des intervalles de confiance des indicateurs estimés sur l'échantillon"""
+    filtres_patients, filtres_periode = get_filtres()
+    selection = filtres_periode.to_numpy(dtype=np.float64)
+
+    def valeurs(colonne):
+        return donnees[colonne].to_numpy(dtype=np.float64)
+
+    def moyenne(colonne):
+        presents = selection * ~np.isnan(valeurs(colonne))
+        return echantillon.ratio(np.nan_to_num(valeurs(colonne)) * presents, presents)[1]
+
+    def somme(colonne):
+        return echantillon.total(np.nan_to_num(valeurs(colonne)) * selection)[1]
+
+    nb_jours = max((end_datetime - start_datetime).days + 1, 1)
+    lits = jours_occupes(donnees, start_datetime, end_datetime) * filtres_patients.to_numpy()
+    ecarts = {
+        "admissions": echantillon.total(selection)[1],
+        "duree": moyenne("Durée du séjour estimé"),
+        "lits": echantillon.total(lits)[1] / nb_jours,
+        "temperature": moyenne("Température"),
+        "materiel": somme("Materiel utilise"),
+        "medecins": somme("Nb medecin") / 4,
+        "infirmiers": somme("Nb infirmier") / 4,
+        "aides_soignants": somme("Nb aide soignant") / 4,
+    }
+    z = quantile_normal(config.APPROXIMATION["confidence"])
+    return {nom: arrondi_marge(z * ecart) for nom, ecart in ecarts.items()}
+
+
+# Affichage des indicateurs principaux ; en mode approché, chaque valeur est suivie de la demi-largeur
+# de son intervalle de confiance
+def afficher_indicateurs(totals, occupation, marges=None):
+    def valeur(nom, estimation, unite=""):
+        if marges is None:
+            return f"{estimation}{unite}" if unite else estimation
+        return f"≈ {estimation}{unite} ± {marges[nom]}{unite}"
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Admissions", valeur("admissions", round(totals.count)))
+
+    with col2:
+        st.metric("Durée Moyenne du Séjour", valeur("duree", round(totals.mean("Durée du séjour estimé"), 1)))
+
+    with col3:
+        pic = f"Pic : {occupation['pic']} lits le {occupation['date_pic']:%d/%m/%Y}" if occupation["date_pic"] else None
+        st.metric("Lits Occupés par Jour (moyenne)", valeur("lits", round(occupation["moyenne"])), help=pic)
+    with col4:
+        temperature_moyenne = round(totals.mean("Température")) if totals.counts["Température"] else 0
+        st.metric("Température Moyenne", valeur("temperature", temperature_moyenne, "°C"))
+    # Ajout de nouveaux KPI
+    col5, col6, col7, col8 = st.columns(4)
+
+    with col5:
+        st.metric("Total Matériel Consommé", valeur("materiel", int(totals.sums["Materiel utilise"])))
+    with col6:
+        st.metric("Nombre de Médecins Mobilisés", valeur("medecins", int(round(totals.sums["Nb medecin"] / 4))))
+    with col7:
+        st.metric("Nombre d'Infirmiers Mobilisés", valeur("infirmiers", int(round(totals.sums["Nb infirmier"] / 4))))
+    with col8:
+        st.metric("Nombre AS Mobilisés", valeur("aides_soignants", int(round(totals.sums["Nb aide soignant"] / 4))))
+
+
+timer.etape("indicateurs")
+indicateurs = vue.valeurs("indicateurs", lambda: get_agregat("indicateurs"))
+totals_snapshot = RunningTotals.from_dict(indicateurs["totaux"])
+occupation = indicateurs["occupation"]
+marges = calculer_marges() if approche else None
+
+if config.LIVE_FEED["enabled"]:
+    live_feed = get_live_feed()
+    filtres_flux = {
+        "Service d'admission": selected_services,
+        "Saison": selected_saisons,
+        "Sexe": selected_sexes,
+        "Gravité": selected_gravites,
+        "Mode d'arrivée": selected_modes_arrivee,
+        "Type d'hospitalisation": selected_types_hosp,
+    }
+
+    # Seuls les indicateurs sont rafraîchis : les agrégats du jeu filtré sont complétés par ceux du flux
+    @st.fragment(run_every=config.LIVE_FEED["refresh_seconds"])
+    def indicateurs_en_direct():
+        live_totals = live_feed.filtered(start_date, end_date, filtres_flux)
+        afficher_indicateurs(totals_snapshot.copy().merge(live_totals), occupation, marges)
+        dernier = live_feed.last_event.strftime("%d/%m/%Y %H:%M") if live_feed.last_event else "aucun"
+        st.caption(f"🔴 En direct : {live_totals.count} admission(s) reçue(s) pour ces filtres — dernier événement : {dernier}")
+        # Événements illisibles ou incomplets : ignorés par les indicateurs, signalés ici
+        if live_feed.errors:
+            with st.expander(f"⚠️ {live_feed.errors} événement(s) rejeté(s)"):
+                st.dataframe(pd.DataFrame(live_feed.recent_rejections()), hide_index=True, use_container_width=True)
+
+    indicateurs_en_direct()
+else:
+    afficher_indicateurs(totals_snapshot, occupation, marges)
+
+if approche:
+    # Vérifie l'avancement du calcul exact sans relancer toute la page, puis la relance une fois prêt
+    @st.fragment(run_every=config.APPROXIMATION["refresh_seconds"])
+    def affinage():
+        if job_exact.future.done():
+            st.rerun()
+        taille = f"{len(echantillon):,} admissions sur {echantillon.nb_lignes_source:,}".replace(",", " ")
+        st.caption(
+            f"≈ Estimations sur un échantillon stratifié de {taille} (intervalles de confiance à "
+            f"{config.APPROXIMATION['confidence']:.0%}) — calcul exact en cours ({time.monotonic() - job_exact.debut:.0f} s)"
+        )
+
+    affinage()
+
+
+# Admissions par jour, service et gravité : les vues mensuelles, hebdomadaires et annuelles sont
+# ensuite servies par les agrégats matérialisés.
+# Calculés à la première figure qui n'est pas servie par l'instantané
+@lru_cache(maxsize=1)
+def get_rollups():
+    return TimeRollups(get_agregat("quotidien"), mesures=["ID_patient"], cles=["Service d'admission", "Gravité"])
+
+
+def figure_evolution():
+    admissions_over_time = get_rollups().niveau("mois").rename(columns={"Période": "Date_admission"})
+
+    fig = px.line(
+        admissions_over_time,
+        x="Date_admission",
+        y="ID_patient",
+        title="Admissions Mensuelles",
+        labels={"ID_patient": "Nombre d'Admissions", "Date_admission": "Mois"},
+        template="plotly_white",
+    )
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig
 
 
+timer.etape("évolution : figure")
 # Évolution des admissions
 st.subheader("📈 Évolution des Admissions")
-admissions_over_time = (
-    filtered_df.groupby(pd.to_datetime(filtered_df["Date_admission"]).dt.to_period("M"))
-    .agg({"ID_patient": "count"})
-    .reset_index()
-)
-admissions_over_time["Date_admission"] = admissions_over_time["Date_admission"].dt.to_timestamp()
-
-fig = px.line(
-    admissions_over_time,
-    x="Date_admission",
-    y="ID_patient",
-    title="Admissions Mensuelles",
-    labels={"ID_patient": "Nombre d'Admissions", "Date_admission": "Mois"},
-    template="plotly_white",
-)
-fig.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=40, b=20),
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-)
+fig = vue.figure("evolution", figure_evolution)
+timer.etape("évolution : affichage")
 st.plotly_chart(fig, use_container_width=True)
 
+timer.etape("aperçu et export")
 # Aperçu des données
 with st.expander("Aperçu des données"):
+    filtered_df = donnees[get_filtres()[1]]
     st.dataframe(filtered_df.head(50), use_container_width=True)
-    
-    # Option pour télécharger les données filtrées en CSV
-    csv_buffer = io.StringIO()
-    filtered_df.to_csv(csv_buffer, index=False)
-    st.download_button(
-        label="Télécharger les données filtrées (CSV)",
-        data=csv_buffer.getvalue(),
-        file_name="donnees_filtrees.csv",
-        mime="text/csv",
-    )
+
+    if approche:
+        st.caption("Aperçu tiré de l'échantillon : l'export des données filtrées sera proposé à la fin du calcul exact.")
+    else:
+        # Téléchargement des données filtrées : produit au clic seulement, et conservé par filtres
+        bouton_export(
+            filtered_df,
+            "donnees_filtrees",
+            cle=(
+                version_donnees(), start_date, end_date, selected_services, selected_saisons, selected_sexes,
+                selected_gravites, selected_modes_arrivee, selected_types_hosp,
+            ),
+            label="Télécharger les données filtrées",
+            key="home",
+        )
 
 st.markdown("\n") 
 
+def camembert(names, title, **options):
+    # Répartition des admissions filtrées selon une colonne (agregat_repartitions)
+    fig_pie = px.pie(get_agregat("repartitions")[names], names=names, values="count", title=title, **options)
+    fig_pie.update_layout(legend=dict(yanchor="middle", y=0.5, xanchor="left", x=1))
+    return fig_pie
+
+
+timer.etape("profil patients")
 # Affichage des camemberts
 st.subheader("📊 Profil des Patients")
 col_pie1, col_pie2 = st.columns(2)
 
 with col_pie1:
-    fig_age = px.pie(filtered_df, names="Tranche_age", title="Répartition par Tranche d'Âge")
-    fig_age.update_layout(legend=dict(yanchor="middle", y=0.5, xanchor="left", x=1))
+    fig_age = vue.figure("age", lambda: camembert("Tranche_age", "Répartition par Tranche d'Âge"))
     st.plotly_chart(fig_age, use_container_width=True)
 
 with col_pie2:
-    fig_sexe = px.pie(filtered_df, names="Sexe", title="Répartition par Sexe", hole=0.4)
-    fig_sexe.update_layout(legend=dict(yanchor="middle", y=0.5, xanchor="left", x=1))
+    fig_sexe = vue.figure("sexe", lambda: camembert("Sexe", "Répartition par Sexe", hole=0.4))
     st.plotly_chart(fig_sexe, use_container_width=True)
 
 
+timer.etape("facteurs spéciaux")
 # Répartition des admissions par vacances scolaires et événements spéciaux
 st.subheader("🏥 Répartition des Admissions par Facteurs Spéciaux")
 col_pie3, col_pie4 = st.columns(2)
 
 with col_pie3:
-    fig_vacances = px.pie(filtered_df, names="Vacances_scolaires", title="Admissions pendant les Vacances Scolaires")
-    fig_vacances.update_layout(legend=dict(yanchor="middle", y=0.5, xanchor="left", x=1))
+    fig_vacances = vue.figure("vacances", lambda: camembert("Vacances_scolaires", "Admissions pendant les Vacances Scolaires"))
     st.plotly_chart(fig_vacances, use_container_width=True)
 
 with col_pie4:
-    fig_evenements = px.pie(filtered_df, names="Evenement_Special", title="Admissions lors d'Événements Spéciaux")
-    fig_evenements.update_layout(legend=dict(yanchor="middle", y=0.5, xanchor="left", x=1))
+    fig_evenements = vue.figure("evenements", lambda: camembert("Evenement_Special", "Admissions lors d'Événements Spéciaux"))
     st.plotly_chart(fig_evenements, use_container_width=True)
 
 
 
+timer.etape("vue par service : figure")
 # Sélection de la vue
 st.subheader("🔍 Sélectionnez une vue")
 vue_selection = st.radio("Selectionner", ["Vue Mensuelle", "Vue Journalière", "Vue Annuelle"], horizontal=True, label_visibility="hidden" )
@@ -283,44 +452,38 @@ else:
     x_axis = "Annee"
     category_orders = {}
 
+def barres_empilees(dimension, libelle):
+    # Admissions empilées par `dimension` selon la vue sélectionnée
+    admissions = get_rollups().par(x_axis, by=[dimension])
+    return px.bar(
+        admissions,
+        x=x_axis,
+        y="ID_patient",
+        color=dimension,
+        title=f"Admissions {vue_selection} par {libelle}",
+        labels={"ID_patient": "Nombre d'Admissions", x_axis: x_axis},
+        barmode="relative",
+        category_orders=category_orders,
+        template="plotly_white",
+    )
+
+
 # Graphique Admissions empilées par la sélection
 st.subheader(f"📊 Admissions par Service : {vue_selection}")
-admissions_service = filtered_df.groupby([x_axis, "Service d'admission"], observed=True).agg({"ID_patient": "count"}).reset_index()
-fig_service = px.bar(
-    admissions_service,
-    x=x_axis,
-    y="ID_patient",
-    color="Service d'admission",
-    title=f"Admissions {vue_selection} par Service",
-    labels={"ID_patient": "Nombre d'Admissions", x_axis: x_axis},
-    barmode="relative",
-    category_orders=category_orders,
-    template="plotly_white",
-)
+fig_service = vue.figure("service", lambda: barres_empilees("Service d'admission", "Service"), vue_selection)
+timer.etape("vue par service : affichage")
 st.plotly_chart(fig_service, use_container_width=True)
 
+timer.etape("vue par gravité : figure")
 st.subheader(f"📊 Admissions par niveau de Gravité : {vue_selection}")
-admissions_gravite = filtered_df.groupby([x_axis, "Gravité"], observed=True).agg({"ID_patient": "count"}).reset_index()
-fig_gravite = px.bar(
-    admissions_gravite,
-    x=x_axis,
-    y="ID_patient",
-    color="Gravité",
-    title=f"Admissions {vue_selection} par Gravité",
-    labels={"ID_patient": "Nombre d'Admissions", x_axis: x_axis},
-    barmode="relative",
-    category_orders=category_orders,
-    template="plotly_white",
-)
+fig_gravite = vue.figure("gravite", lambda: barres_empilees("Gravité", "Gravité"), vue_selection)
+timer.etape("vue par gravité : affichage")
 st.plotly_chart(fig_gravite, use_container_width=True)
 
 
-st.subheader("🚑 Mode d'arrivée et hospitalisation")
-col_bar1, col_bar2 = st.columns(2)
-# Graphique Admissions par Mode d'Arrivée
-with col_bar1:
-    admissions_mode = df.groupby("Mode d'arrivée", observed=True).agg({"ID_patient": "count"}).reset_index()
-    fig_mode = px.bar(
+def figure_mode():
+    admissions_mode = get_agregat("globaux")["mode"]
+    return px.bar(
         admissions_mode,
         x="Mode d'arrivée",
         y="ID_patient",
@@ -329,35 +492,54 @@ with col_bar1:
         color = "Mode d'arrivée",
         template="plotly_white",
     )
-    st.plotly_chart(fig_mode, use_container_width=True)
 
-# Graphique Admissions par Type d'Hospitalisation
-with col_bar2:
-    admissions_hosp = df.groupby("Type d'hospitalisation", observed=True).agg({"ID_patient": "count"}).reset_index()
-    fig_hosp = px.pie(
+
+def figure_hospitalisation():
+    admissions_hosp = get_agregat("globaux")["hospitalisation"]
+    return px.pie(
         admissions_hosp,
         names="Type d'hospitalisation",
         values="ID_patient",
         title="Admissions par Type d'Hospitalisation",
         template="plotly_white",
     )
-    st.plotly_chart(fig_hosp, use_container_width=True)
 
+
+def figure_duree():
+    duree_service = get_agregat("globaux")["duree"]
+    return px.bar(
+        duree_service,
+        x="Service d'admission",
+        y="Durée du séjour estimé",
+        color="Type d'hospitalisation",
+        title="Durée Moyenne de Séjour par Service",
+        labels={"Durée du séjour estimé": "Durée Moyenne (jours)", "Service d'admission": "Service"},
+        barmode="relative",
+        template="plotly_white",
+    )
+
+
+timer.etape("mode d'arrivée et hospitalisation")
+st.subheader("🚑 Mode d'arrivée et hospitalisation")
+col_bar1, col_bar2 = st.columns(2)
+# Graphique Admissions par Mode d'Arrivée
+with col_bar1:
+    st.plotly_chart(vue.figure("mode_arrivee", figure_mode), use_container_width=True)
+
+# Graphique Admissions par Type d'Hospitalisation
+with col_bar2:
+    st.plotly_chart(vue.figure("hospitalisation", figure_hospitalisation), use_container_width=True)
+
+timer.etape("durée de séjour : figure")
 # Graphique Durée Moyenne de Séjour par Service avec Type d'Hospitalisation
 st.subheader("⏳ Durée Moyenne de Séjour par Service et Type d'Hospitalisation")
-duree_service = df.groupby(["Service d'admission", "Type d'hospitalisation"], observed=True).agg({"Durée du séjour estimé": "mean"}).reset_index()
-fig_duree = px.bar(
-    duree_service,
-    x="Service d'admission",
-    y="Durée du séjour estimé",
-    color="Type d'hospitalisation",
-    title="Durée Moyenne de Séjour par Service",
-    labels={"Durée du séjour estimé": "Durée Moyenne (jours)", "Service d'admission": "Service"},
-    barmode="relative",
-    template="plotly_white",
-)
+fig_duree = vue.figure("duree_sejour", figure_duree)
+timer.etape("durée de séjour : affichage")
 st.plotly_chart(fig_duree, use_container_width=True)
 
 
+timer.etape("pied de page")
 # --- FOOTER ---
-st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
+
+timer.fin()
@@ -0,0 +1,251 @@
+"""Backtesting à origine glissante et mesure de latence des modèles de prévision.
+
+Usage :
+    python backtest.py --candidate models --candidate /chemin/nouveaux_modeles --output backtest_report.json
+    python backtest.py --candidate models --baseline ancien_rapport.json
+
+Chaque candidat est un dossier de modèles (mêmes fichiers que `models/`). Pour chaque pli,
+les modèles sont réajustés avec leurs hyperparamètres sur les données antérieures à l'origine,
+puis évalués sur l'horizon suivant, comme sur la page Prédictions (admissions prédites -> effectifs).
+"""
+import argparse
+import json
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+from inference import MODELS_DIR, STAFFING_TARGETS, load_personnel_models, load_prophet_model, load_transformers
+from training import DATA_PATH, DATE_LIMITE, NON_FEATURES, encode_daily, load_daily
+
+# Correspondance colonnes du jeu journalier -> cibles de l'application
+TARGET_COLUMNS = dict(zip(["Nb medecin", "Nb infirmier", "Nb aide soignant"], STAFFING_TARGETS))
+
+# Paramètres de Prophet repris à l'identique lors du réajustement
+PROPHET_PARAMS = [
+    "growth", "n_changepoints", "changepoint_range", "yearly_seasonality", "weekly_seasonality",
+    "daily_seasonality", "seasonality_mode", "seasonality_prior_scale", "holidays_prior_scale",
+    "changepoint_prior_scale", "mcmc_samples", "interval_width", "holidays",
+]
+
+
+def rolling_origins(dates, nb_folds, horizon, step):
+    """Origines des plis : la dernière laisse `horizon` jours avant la date limite, puis on recule de `step` jours"""
+    last_origin = dates.max() - pd.Timedelta(days=horizon)
+    origins = [last_origin - pd.Timedelta(days=step * i) for i in range(nb_folds)]
+    return sorted(origin for origin in origins if origin > dates.min() + pd.Timedelta(days=365))
+
+
+def clone_prophet(model):
+    """Nouveau modèle Prophet non ajusté avec les mêmes hyperparamètres et régresseurs"""
+    from prophet import Prophet
+
+    clone_model = Prophet(**{param: getattr(model, param) for param in PROPHET_PARAMS}, uncertainty_samples=0)
+    for name, props in model.extra_regressors.items():
+        clone_model.add_regressor(name, prior_scale=props["prior_scale"], standardize=props["standardize"], mode=props["mode"])
+    return clone_model
+
+
+def clone_estimator(model):
+    """Nouveau modèle scikit-learn/XGBoost non ajusté avec les mêmes hyperparamètres"""
+    try:
+        return clone(model)
+    except AttributeError:
+        # Modèle picklé par une version antérieure : on ne reprend que les paramètres qu'il possède
+        fresh = type(model)()
+        params = {key: getattr(model, key) for key in fresh.get_params(deep=False) if key in vars(model)}
+        return fresh.set_params(**params)
+
+
+def _errors(y_true, y_pred):
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    return {
+        "mae": float(np.mean(np.abs(y_true - y_pred))),
+        "rmse": float(np.sqrt(np.mean((y_true - y_pred) ** 2))),
+    }
+
+
+def evaluate_fold(models_dir, data_path, date_limite, origin, horizon):
+    """Réajuste les modèles d'un candidat jusqu'à `origin` et mesure les erreurs sur l'horizon suivant"""
+    from training import _quiet_prophet_logs
+
+    _quiet_prophet_logs()
+    prophet_model = load_prophet_model(models_dir)
+    personnel_models = load_personnel_models(models_dir)
+    data = encode_daily(load_daily(data_path, date_limite), load_transformers(models_dir))
+
+    end = origin + pd.Timedelta(days=horizon)
+    train = data[data["Date_admission"] <= origin]
+    test = data[(data["Date_admission"] > origin) & (data["Date_admission"] <= end)]
+
+    # Admissions : Prophet réajusté sur les données antérieures à l'origine
+    regressors = list(prophet_model.extra_regressors)
+    model = clone_prophet(prophet_model)
+    model.fit(train[["Date_admission", "Nombre_admissions", *regressors]].rename(
+        columns={"Date_admission": "ds", "Nombre_admissions": "y"}
+    ))
+    forecast = model.predict(test[["Date_admission", *regressors]].rename(columns={"Date_admission": "ds"}))
+    admissions_pred = forecast["yhat"].round().to_numpy()
+    errors = {"Nombre_admissions": _errors(test["Nombre_admissions"], admissions_pred)}
+
+    # Effectifs : modèles réajustés, alimentés par les admissions prédites comme sur la page
+    X_train = train.drop(columns=NON_FEATURES)
+    X_test = test.drop(columns=NON_FEATURES).assign(Nombre_admissions=admissions_pred)
+    for (column, target), personnel_model in zip(TARGET_COLUMNS.items(), personnel_models):
+        feature_names = list(personnel_model.feature_names_in_)
+        estimator = clone_estimator(personnel_model)
+        if "n_jobs" in estimator.get_params():
+            estimator.set_params(n_jobs=1)  # le parallélisme est entre plis
+        fitted = estimator.fit(X_train[feature_names], train[column])
+        errors[target] = _errors(test[column], fitted.predict(X_test[feature_names]).round())
+
+    return {"origin": str(origin.date()), "nb_days": len(test), "errors": errors}
+
+
+def _rss_mb():
+    """Pic de mémoire résidente du processus (Mo)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_latency(models_dir, start, horizon, repeat):
+    """Temps de chargement, latence de prédiction (p50/p95) et mémoire, mesurés dans un processus neuf"""
+    from forecast_server import ForecastRequest, ForecastService
+
+    rss_before = _rss_mb()
+    t0 = time.perf_counter()
+    service = ForecastService.from_models_dir(models_dir)
+    load_seconds = time.perf_counter() - t0
+    rss_loaded = _rss_mb()
+
+    request = ForecastRequest(str(start.date()), horizon)
+    service.predict_batch([request])  # premier appel hors mesure
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        service.predict_batch([request])
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    return {
+        "load_seconds": round(load_seconds, 4),
+        "predict_p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "predict_p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "models_rss_mb": round(rss_loaded - rss_before, 1),
+        "peak_rss_mb": round(_rss_mb(), 1),
+        "models_size_mb": round(sum(f.stat().st_size for f in Path(models_dir).glob("*.pkl")) / 2**20, 2),
+    }
+
+
+def _aggregate(folds):
+    """Erreurs moyennes sur les plis, pondérées par le nombre de jours"""
+    weights = np.array([fold["nb_days"] for fold in folds], dtype=np.float64)
+    summary = {}
+    for target in folds[0]["errors"]:
+        mae = np.array([fold["errors"][target]["mae"] for fold in folds])
+        mse = np.array([fold["errors"][target]["rmse"] ** 2 for fold in folds])
+        summary[target] = {
+            "mae": round(float(np.average(mae, weights=weights)), 4),
+            "rmse": round(float(np.sqrt(np.average(mse, weights=weights))), 4),
+        }
+    return summary
+
+
+def run_backtest(candidates, data_path=DATA_PATH, date_limite=DATE_LIMITE, nb_folds=6, horizon=30, step=30,
+                 repeat=50, n_jobs=None):
+    """Exécute tous les plis de tous les candidats en parallèle puis mesure les latences, et retourne le rapport"""
+    dates = load_daily(data_path, date_limite)["Date_admission"]
+    origins = rolling_origins(dates, nb_folds, horizon, step)
+    date_limite = str(pd.Timestamp(date_limite).date())
+
+    with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        futures = {
+            (name, origin): executor.submit(evaluate_fold, models_dir, data_path, date_limite, origin, horizon)
+            for name, models_dir in candidates.items()
+            for origin in origins
+        }
+        folds = {name: [futures[(name, origin)].result() for origin in origins] for name in candidates}
+
+    # Latence mesurée candidat par candidat, chacun dans un processus neuf pour isoler la mémoire
+    latency = {}
+    for name, models_dir in candidates.items():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            latency[name] = executor.submit(
+                measure_latency, models_dir, dates.max() + pd.Timedelta(days=1), horizon, repeat
+            ).result()
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "data": str(data_path),
+        "date_limite": date_limite,
+        "horizon": horizon,
+        "origins": [str(origin.date()) for origin in origins],
+        "candidates": {
+            name: {
+                "models_dir": str(models_dir),
+                "accuracy": _aggregate(folds[name]),
+                "latency": latency[name],
+                "folds": folds[name],
+            }
+            for name, models_dir in candidates.items()
+        },
+    }
+
+
+def print_report(report, baseline=None):
+    """Affiche le résumé du rapport, avec l'écart au rapport de référence s'il est fourni"""
+    for name, candidate in report["candidates"].items():
+        reference = (baseline or {}).get("candidates", {}).get(name)
+        print(f"\n📊 {name} ({candidate['models_dir']})")
+        for target, errors in candidate["accuracy"].items():
+            line = f"   {target:<20} MAE = {errors['mae']:.2f}  RMSE = {errors['rmse']:.2f}"
+            if reference:
+                delta = errors["mae"] - reference["accuracy"][target]["mae"]
+                line += f"  (ΔMAE {delta:+.2f})"
+            print(line)
+        latency = candidate["latency"]
+        line = (
+            f"   ⏱ chargement {latency['load_seconds']:.2f} s, prédiction p50 {latency['predict_p50_ms']:.1f} ms"
+            f" / p95 {latency['predict_p95_ms']:.1f} ms, mémoire modèles {latency['models_rss_mb']:.0f} Mo"
+        )
+        if reference:
+            line += f"  (Δp95 {latency['predict_p95_ms'] - reference['latency']['predict_p95_ms']:+.1f} ms)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidate", action="append", default=None,
+                        help="Dossier de modèles à évaluer (répétable, `nom=dossier` accepté)")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--date-limite", default=DATE_LIMITE)
+    parser.add_argument("--folds", type=int, default=6)
+    parser.add_argument("--horizon", type=int, default=30, help="Nombre de jours projetés par pli")
+    parser.add_argument("--step", type=int, default=30, help="Écart en jours entre deux origines")
+    parser.add_argument("--repeat", type=int, default=50, help="Nombre de prédictions pour la latence")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--output", default="backtest_report.json")
+    parser.add_argument("--baseline", default=None, help="Rapport précédent à comparer")
+    args = parser.parse_args()
+
+    candidates = {}
+    for candidate in args.candidate or [str(MODELS_DIR)]:
+        name, _, models_dir = candidate.rpartition("=")
+        candidates[name or Path(models_dir).name] = models_dir
+
+    report = run_backtest(candidates, args.data, args.date_limite, args.folds, args.horizon, args.step,
+                          args.repeat, args.jobs)
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+    print_report(report, baseline)
+    print(f"\n✅ Rapport écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
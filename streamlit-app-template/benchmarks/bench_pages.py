@@ -0,0 +1,233 @@
+"""Benchmark des réexécutions de pages Streamlit, sans navigateur, avec `AppTest`.
+
+Usage :
+    python benchmarks/bench_pages.py --rows 50000 --repeat 10 --output bench_pages.json
+    python benchmarks/bench_pages.py --pages Home.py "pages/3_🔮_Predictions.py" --cold 5
+
+Chaque page est d'abord exécutée à froid (caches Streamlit vidés) `--cold` fois, puis réexécutée
+à chaud après chaque interaction typique (période, service désélectionné, choix de vue, curseur
+de projection). Une interaction alterne entre la valeur modifiée et la valeur initiale, les deux
+réexécutions sont mesurées. Le rapport donne p50/p95/max (ms) par page et par interaction.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+# Ajout du chemin racine au path pour pouvoir importer les modules de l'application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from generate_data import generer
+
+ROOT = Path(__file__).parent.parent
+FIXTURES_DIR = ROOT / ".cache" / "benchmarks"
+TIMEOUT = 300
+
+
+def fixture(nb_rows, seed=42):
+    """Dossier contenant un seul jeu d'admissions de `nb_rows` lignes, utilisable comme `SITES_DIR`"""
+    path = FIXTURES_DIR / f"pages_{nb_rows}_{seed}" / "dataset_admission.csv"
+    if not path.exists():
+        generer(nb_rows, "2022-01-01", "2024-11-15", path, seed=seed)
+    return path.parent
+
+
+def _radio(at, label):
+    return next(radio for radio in at.radio if radio.label == label)
+
+
+def _periode(key):
+    """Restreint la période aux 90 derniers jours, ou rétablit la période initiale"""
+    def interaction(at, initial, modifier):
+        widget = at.date_input(key=key)
+        debut, fin = initial[key]
+        widget.set_value((fin - timedelta(days=90), fin) if modifier else (debut, fin))
+    return interaction
+
+
+def _deselection(key):
+    """Retire la première valeur d'un filtre multiple, ou rétablit la sélection initiale"""
+    def interaction(at, initial, modifier):
+        at.multiselect(key=key).set_value(initial[key][1:] if modifier else initial[key])
+    return interaction
+
+
+def _vue(label):
+    """Passe d'une option à la suivante d'un bouton radio, ou revient à l'option initiale"""
+    def interaction(at, initial, modifier):
+        radio = _radio(at, label)
+        options = list(radio.options)
+        radio.set_value(options[(options.index(initial[label]) + 1) % len(options)] if modifier else initial[label])
+    return interaction
+
+
+def _curseur(key, valeur):
+    def interaction(at, initial, modifier):
+        at.slider(key=key).set_value(valeur if modifier else initial[key])
+    return interaction
+
+
+# Page -> (widgets dont la valeur initiale est relevée, interactions)
+SCENARIOS = {
+    "Home.py": (
+        {"date_input": ["date_range_home"], "multiselect": ["services_home"], "radio": ["Selectionner"]},
+        {
+            "periode": _periode("date_range_home"),
+            "service": _deselection("services_home"),
+            "vue": _vue("Selectionner"),
+        },
+    ),
+    "pages/1_📊_Exploratory_Analysis.py": (
+        {"date_input": ["date_range_explore"], "multiselect": ["c=saisons_explore"],
+         "radio": ["Choisir une analyse temporelle :"]},
+        {
+            "periode": _periode("date_range_explore"),
+            "saison": _deselection("c=saisons_explore"),
+            "vue": _vue("Choisir une analyse temporelle :"),
+        },
+    ),
+    "pages/2_📈_Advanced_Visualizations.py": (
+        {"date_input": ["date_range_explore"],
+         "radio": ["Choisir un type de carte de chaleur :", "Choisir un type de visualisation :"]},
+        {
+            "periode": _periode("date_range_explore"),
+            "carte_chaleur": _vue("Choisir un type de carte de chaleur :"),
+            "hierarchie": _vue("Choisir un type de visualisation :"),
+        },
+    ),
+    "pages/3_🔮_Predictions.py": (
+        {"date_input": ["date_range_pred"], "slider": ["num_days"]},
+        {
+            "periode": _periode("date_range_pred"),
+            "projection": _curseur("num_days", 60),
+        },
+    ),
+    "pages/4_🛏️_Bed_Occupancy.py": (
+        {"date_input": ["date_range_occupation"], "multiselect": ["services_occupation"]},
+        {
+            "periode": _periode("date_range_occupation"),
+            "service": _deselection("services_occupation"),
+        },
+    ),
+    "pages/5_🩺_Patients.py": (
+        {"date_input": ["date_range_patients"], "multiselect": ["services_patients"], "slider": ["jours_readmission"]},
+        {
+            "periode": _periode("date_range_patients"),
+            "service": _deselection("services_patients"),
+            "delai": _curseur("jours_readmission", 7),
+        },
+    ),
+}
+
+
+def _valeurs_initiales(at, widgets):
+    valeurs = {}
+    for kind, cles in widgets.items():
+        for cle in cles:
+            widget = _radio(at, cle) if kind == "radio" else getattr(at, kind)(key=cle)
+            valeurs[cle] = widget.value
+    return valeurs
+
+
+def _run(at):
+    """Réexécute la page et retourne sa durée (ms) ; une exception de la page interrompt le benchmark"""
+    t0 = time.perf_counter()
+    at.run(timeout=TIMEOUT)
+    elapsed = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+def _stats(timings):
+    return {
+        "n": len(timings),
+        "p50_ms": round(float(np.percentile(timings, 50)), 1),
+        "p95_ms": round(float(np.percentile(timings, 95)), 1),
+        "max_ms": round(float(np.max(timings)), 1),
+    }
+
+
+def bench_page(page, cold, repeat):
+    """Latences à froid puis à chaud (réexécution seule et par interaction) d'une page"""
+    widgets, interactions = SCENARIOS[page]
+    script = str(ROOT / page)
+
+    froid = []
+    for _ in range(cold):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        at = AppTest.from_file(script, default_timeout=TIMEOUT)
+        froid.append(_run(at))
+
+    initial = _valeurs_initiales(at, widgets)
+    chaud = {"reexecution": [_run(at) for _ in range(repeat)]}
+    for nom, interaction in interactions.items():
+        chaud[nom] = []
+        for i in range(repeat):
+            interaction(at, initial, modifier=(i % 2 == 0))
+            chaud[nom].append(_run(at))
+        if repeat % 2:
+            interaction(at, initial, modifier=False)
+            _run(at)
+
+    return {"froid": _stats(froid), "chaud": {nom: _stats(timings) for nom, timings in chaud.items()}}
+
+
+def run_benchmark(pages, cold=3, repeat=10, nb_rows=None):
+    if nb_rows:
+        # Les pages lisent `config.SITES_DIR` à chaque exécution : un dossier d'un seul fichier remplace le jeu par défaut
+        config.SITES_DIR = str(fixture(nb_rows))
+    report = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": st.__version__,
+        "cpu_count": os.cpu_count(),
+        "rows": nb_rows,
+        "cold": cold,
+        "repeat": repeat,
+        "pages": {},
+    }
+    for page in pages:
+        print(f"⏱️ {page}...")
+        report["pages"][page] = bench_page(page, cold, repeat)
+    return report
+
+
+def print_report(report):
+    print(f"{'page':<40} {'mesure':<14} {'p50 (ms)':>10} {'p95 (ms)':>10} {'max (ms)':>10}")
+    for page, mesures in report["pages"].items():
+        for nom, stats in [("froid", mesures["froid"]), *mesures["chaud"].items()]:
+            print(f"{page:<40} {nom:<14} {stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f} {stats['max_ms']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--rows", type=int, default=None, help="Taille du jeu généré (défaut : données de l'application)")
+    parser.add_argument("--cold", type=int, default=3, help="Exécutions à froid par page")
+    parser.add_argument("--repeat", type=int, default=10, help="Réexécutions à chaud par interaction")
+    parser.add_argument("--output", default="bench_pages.json")
+    args = parser.parse_args()
+
+    # Avertissements de dépréciation et journaux du mode sans serveur, sans intérêt ici
+    warnings.filterwarnings("ignore")
+    set_log_level("error")
+    report = run_benchmark(args.pages, args.cold, args.repeat, args.rows)
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print_report(report)
+    print(f"✅ Rapport écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Benchmark de montée en charge : chargement, filtres, indicateurs, agrégations et prévision.
+
+Usage :
+    python benchmarks/bench_scaling.py --rows 50000 500000 5000000 --output bench_scaling.json
+    python benchmarks/bench_scaling.py --rows 50000 500000 --baseline bench_scaling.json
+
+Les jeux d'admissions sont générés une fois par `generate_data.py` (graine fixe) et gardés dans
+`.cache/benchmarks`. Chaque étape est chronométrée `--repeat` fois, puis exécutée une dernière fois
+pour mesurer le pic de mémoire (allouée et résidente). Le rapport JSON porte le commit mesuré,
+ce qui permet de comparer deux versions avec `--baseline`.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ajout du chemin racine au path pour pouvoir importer les modules de l'application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from census import indicateurs_occupation, recensement_lits
+from decomposition import decompose
+from generate_data import generer
+from live_feed import RunningTotals
+from rollups import TimeRollups
+from utils import load_data2, load_data3
+
+ROOT = Path(__file__).parent.parent
+FIXTURES_DIR = ROOT / ".cache" / "benchmarks"
+
+# Colonnes filtrées par la barre latérale de la page d'accueil
+FILTRES_HOME = ["Service d'admission", "Saison", "Sexe", "Gravité", "Mode d'arrivée", "Type d'hospitalisation"]
+
+
+def fixture(nb_rows, start="2022-01-01", end="2024-11-15", seed=42):
+    """Chemin du jeu d'admissions de `nb_rows` lignes, généré au premier appel"""
+    path = FIXTURES_DIR / f"admissions_{nb_rows}_{seed}.csv"
+    if not path.exists():
+        generer(nb_rows, start, end, path, seed=seed)
+    return path
+
+
+def home_filter(df, start, end):
+    """Masque de la page d'accueil : période puis toutes les valeurs de chaque filtre sélectionnées"""
+    masque = (df["Date_admission"] >= start) & (df["Date_admission"] <= end)
+    for colonne in FILTRES_HOME:
+        masque &= df[colonne].isin(df[colonne].unique().tolist())
+    return df[masque]
+
+
+def home_kpis(df, filtered_df, start, end):
+    """Bloc d'indicateurs de la page d'accueil : totaux des admissions filtrées et recensement des lits"""
+    totals = RunningTotals.from_frame(filtered_df)
+    occupation = indicateurs_occupation(recensement_lits(df, start, end))
+    return totals, occupation
+
+
+def home_groupbys(df, filtered_df):
+    """Agrégations principales de la page d'accueil (agrégats matérialisés, modes d'arrivée, durées)"""
+    quotidiennes = (
+        filtered_df.groupby(["Date_admission", "Service d'admission", "Gravité"], observed=True)
+        .size()
+        .rename("ID_patient")
+        .reset_index()
+    )
+    rollups = TimeRollups(quotidiennes, mesures=["ID_patient"], cles=["Service d'admission", "Gravité"])
+    rollups.niveau("mois")
+    for attribut in ["Mois", "Jour_semaine", "Annee"]:
+        rollups.par(attribut, by=["Service d'admission"])
+        rollups.par(attribut, by=["Gravité"])
+    df.groupby("Mode d'arrivée", observed=True).agg({"ID_patient": "count"})
+    df.groupby(["Service d'admission", "Type d'hospitalisation"], observed=True).agg({"Durée du séjour estimé": "mean"})
+
+
+def _rss_mb(champ):
+    """Mémoire résidente courante (VmRSS) ou pic depuis la dernière remise à zéro (VmHWM), en Mo ; Linux uniquement"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(champ + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_rss_peak():
+    """Remet le pic de mémoire résidente (VmHWM) au niveau courant"""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def measure(fn, repeat):
+    """Temps (s) sur `repeat` exécutions, puis pics de mémoire (Mo) sur une exécution supplémentaire.
+
+    `peak_mb` est le pic alloué suivi par `tracemalloc` (Python et NumPy) ; `peak_rss_mb` la hausse
+    de la mémoire résidente, qui compte aussi les buffers Arrow des colonnes texte.
+    """
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - t0)
+
+    _reset_rss_peak()
+    rss_before = _rss_mb("VmRSS")
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_peak = _rss_mb("VmHWM")
+
+    return result, {
+        "seconds_min": round(min(timings), 4),
+        "seconds_p50": round(float(np.median(timings)), 4),
+        "peak_mb": round(peak / 2**20, 1),
+        "peak_rss_mb": round(max(rss_peak - rss_before, 0), 1) if rss_peak is not None else None,
+    }
+
+
+def bench_size(nb_rows, repeat, max_workers=None):
+    """Mesure toutes les étapes sur le jeu de `nb_rows` admissions"""
+    path = str(fixture(nb_rows))
+    results = {}
+
+    df, results["load_data2"] = measure(lambda: load_data2(path, max_workers), repeat)
+    daily_df, results["load_data3"] = measure(lambda: load_data3(path, max_workers), repeat)
+
+    # Dernière année de données, comme une sélection typique de la barre latérale
+    end = df["Date_admission"].max()
+    start = end - pd.Timedelta(days=365)
+    filtered_df, results["home_filter"] = measure(lambda: home_filter(df, start, end), repeat)
+    _, results["home_kpis"] = measure(lambda: home_kpis(df, filtered_df, start, end), repeat)
+    _, results["home_groupbys"] = measure(lambda: home_groupbys(df, filtered_df), repeat)
+
+    series = daily_df.set_index("Date_admission")["Nombre_admissions"].asfreq("D", fill_value=0)
+    for method in ["classique", "stl"]:
+        _, results[f"decompose_{method}"] = measure(lambda: decompose(series, method), repeat)
+    return results
+
+
+def bench_forecast(repeat, nb_days=30):
+    """Chemin de prévision de la page Prédictions : Prophet puis effectifs XGBoost / Régression Linéaire"""
+    from forecast_server import ForecastRequest, ForecastService
+
+    try:
+        service, load = measure(ForecastService.from_models_dir, 1)
+    except (ImportError, FileNotFoundError) as error:
+        return {"error": str(error)}
+    start = service.prophet_model.history["ds"].max() + pd.Timedelta(days=1)
+    request = ForecastRequest(str(start.date()), nb_days)
+    service.predict_batch([request])  # premier appel hors mesure
+    _, predict = measure(lambda: service.predict_batch([request]), repeat)
+    return {"load_models": load, "predict": predict}
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(rows, repeat=3, max_workers=None, forecast=True):
+    report = {
+        "commit": _commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "sizes": {},
+    }
+    for nb_rows in rows:
+        print(f"⏱️ {nb_rows} admissions...")
+        report["sizes"][str(nb_rows)] = bench_size(nb_rows, repeat, max_workers)
+    if forecast:
+        report["forecast"] = bench_forecast(max(repeat, 10))
+    return report
+
+
+def _rows(report):
+    """Lignes (taille, étape, mesures) d'un rapport, prévision comprise"""
+    for size, steps in report["sizes"].items():
+        for step, stats in steps.items():
+            yield size, step, stats
+    for step, stats in report.get("forecast", {}).items():
+        if isinstance(stats, dict):
+            yield "-", f"forecast_{step}", stats
+
+
+def print_report(report, baseline=None):
+    reference = {(size, step): stats for size, step, stats in _rows(baseline)} if baseline else {}
+    header = f"{'lignes':>8} {'étape':<20} {'p50 (s)':>10} {'pic (Mo)':>10} {'pic RSS (Mo)':>13}"
+    if baseline:
+        header += f" {'vs ' + str(baseline.get('commit')):>14}"
+    print(header)
+    for size, step, stats in _rows(report):
+        rss = f"{stats['peak_rss_mb']:.1f}" if stats.get("peak_rss_mb") is not None else "-"
+        line = f"{size:>8} {step:<20} {stats['seconds_p50']:>10.4f} {stats['peak_mb']:>10.1f} {rss:>13}"
+        if (size, step) in reference and reference[(size, step)]["seconds_p50"]:
+            line += f" {stats['seconds_p50'] / reference[(size, step)]['seconds_p50']:>13.2f}x"
+        print(line)
+    if "error" in report.get("forecast", {}):
+        print(f"⚠️ Prévision non mesurée : {report['forecast']['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 500_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=None, help="Processus pour le chargement multi-sites")
+    parser.add_argument("--no-forecast", action="store_true", help="Ne mesure pas le chemin de prévision")
+    parser.add_argument("--output", default="bench_scaling.json")
+    parser.add_argument("--baseline", default=None, help="Rapport JSON d'une version précédente à comparer")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.rows, args.repeat, args.jobs, forecast=not args.no_forecast)
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    print_report(report, baseline)
+    print(f"✅ Rapport écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
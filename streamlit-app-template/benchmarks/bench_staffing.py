@@ -0,0 +1,88 @@
+"""Benchmark de la prédiction des effectifs : trois appels `.predict` vs `StaffingPredictor`.
+
+Usage :
+    python benchmarks/bench_staffing.py --rows 30 90 1000 --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Ajout du chemin racine au path pour pouvoir importer les modules de l'application
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference import StaffingPredictor
+
+models_dir = Path(__file__).parent.parent / "models"
+
+
+def make_future_df(feature_names, nb_rows, seed=42):
+    """Génère un `future_df` de même forme que celui de la page Prédictions"""
+    rng = np.random.default_rng(seed)
+    future_df = pd.DataFrame({"ds": pd.date_range("2024-11-16", periods=nb_rows, freq="D")})
+    for feature in feature_names:
+        if feature.startswith("Evenement_Special_"):
+            future_df[feature] = 0.0
+        elif feature == "Nombre_admissions":
+            future_df[feature] = rng.integers(20, 80, nb_rows)
+        else:
+            future_df[feature] = rng.normal(size=nb_rows)
+    return future_df
+
+
+def current_path(models, future_df):
+    """Chemin actuel de la page : réindexation puis un `.predict` par modèle"""
+    future_df_xgb = future_df.drop(columns=["ds"], errors="ignore")
+    future_df_xgb = future_df_xgb[models[0].feature_names_in_]
+    return np.column_stack([model.predict(future_df_xgb) for model in models])
+
+
+def fused_path(predictor, future_df):
+    """Nouveau chemin : matrice float32 construite une fois, trois cibles en un appel"""
+    return predictor.predict(predictor.build_matrix(future_df))
+
+
+def timeit(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[30, 90, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    models = [
+        joblib.load(models_dir / "model_nb_medecins.pkl"),
+        joblib.load(models_dir / "model_nb_infirmiers.pkl"),
+        joblib.load(models_dir / "model_nb_aides_soignants.pkl"),
+    ]
+    predictor = StaffingPredictor(*models)
+
+    print(f"{'lignes':>8} {'actuel p50 (ms)':>16} {'fusionné p50 (ms)':>18} {'gain':>6} {'écart max':>10}")
+    for nb_rows in args.rows:
+        future_df = make_future_df(predictor.feature_names, nb_rows)
+
+        # Les deux chemins doivent donner les mêmes effectifs après arrondi
+        ref = current_path(models, future_df)
+        new = fused_path(predictor, future_df)
+        ecart = np.abs(ref - new).max()
+        if not np.array_equal(ref.round(), new.round()):
+            print(f"⚠️ Effectifs arrondis différents pour {nb_rows} lignes (écart max {ecart:.2e})")
+
+        t_ref = np.median(timeit(lambda: current_path(models, future_df), args.repeat))
+        t_new = np.median(timeit(lambda: fused_path(predictor, future_df), args.repeat))
+        print(f"{nb_rows:>8} {t_ref:>16.3f} {t_new:>18.3f} {t_ref / t_new:>5.1f}x {ecart:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Benchmark du temps avant premier rendu des pages, dans un processus neuf à chaque mesure.
+
+Usage :
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --max-ttfr-ms 800 --rows 2000000
+    python benchmarks/bench_startup.py --pages "pages/3_🔮_Predictions.py" --warm --output bench_startup.json
+
+Chaque mesure lance un interpréteur neuf (imports et caches froids, comme la première visite
+après un déploiement) qui exécute la page avec `AppTest`. Le temps avant premier rendu va du
+début de l'exécution à l'émission de l'en-tête (`page_shell.ouvrir_page`). Le rapport donne aussi
+la durée des sections « en-tête », « imports » et « chargement », les bibliothèques lourdes
+importées par la page et le coût d'import de chacune, mesuré seul après Streamlit. Le script sort
+avec le code 1 si le premier rendu d'une page (p50) dépasse `--max-ttfr-ms` (1500 ms par défaut,
+0 pour ne pas vérifier) ; `tests/test_startup.py` applique le même seuil dans la suite de tests.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+
+PAGES = [
+    "Home.py",
+    "pages/1_📊_Exploratory_Analysis.py",
+    "pages/2_📈_Advanced_Visualizations.py",
+    "pages/3_🔮_Predictions.py",
+    "pages/4_🛏️_Bed_Occupancy.py",
+    "pages/5_🩺_Patients.py",
+]
+
+# Seuil par défaut du temps avant premier rendu (p50), par page
+MAX_TTFR_MS = 1500
+
+# Bibliothèques dont l'import se compte en centaines de millisecondes
+MODULES_LOURDS = ["pandas", "pyarrow", "plotly", "scipy", "statsmodels", "sklearn", "xgboost", "prophet", "joblib"]
+
+# Module importé pour mesurer le coût d'une bibliothèque dont le paquet racine ne charge presque rien
+POINTS_ENTREE = {"plotly": "plotly.express", "statsmodels": "statsmodels.tsa.seasonal"}
+
+SECTIONS = ["en-tête", "imports", "chargement"]
+
+
+def mesure_enfant(page, nb_rows=None, warm=False):
+    """Exécute la page une fois dans ce processus et retourne les mesures (appelé via --child)"""
+    import warnings
+
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    warnings.filterwarnings("ignore")
+    set_log_level("error")
+    sys.path.insert(0, str(ROOT))
+    import config
+
+    config.PROFILING["enabled"] = True
+    config.PROFILING["panel"] = False
+    if nb_rows:
+        from bench_pages import fixture
+
+        config.SITES_DIR = str(fixture(nb_rows))
+    if warm:
+        import warmup
+
+        warmup.rechauffer()
+
+    import page_shell
+    import timings
+
+    at = AppTest.from_file(str(ROOT / page), default_timeout=300)
+    debut = time.perf_counter()
+    at.run()
+    total = time.perf_counter() - debut
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    (nom, premier_rendu), = page_shell.premiers_rendus.items()
+    stats = timings.statistiques(nom).set_index("Section")["dernière (ms)"]
+    return {
+        "ttfr_ms": (premier_rendu - debut) * 1000,
+        "total_ms": total * 1000,
+        "sections_ms": {section: float(stats[section]) for section in SECTIONS if section in stats},
+        "modules": [module for module in MODULES_LOURDS if module in sys.modules],
+    }
+
+
+def cout_import(module):
+    """Coût d'import (ms) d'une bibliothèque seule, dans un processus neuf où Streamlit est déjà importé"""
+    code = (
+        "import time, streamlit\n"
+        "t = time.perf_counter()\n"
+        f"import {POINTS_ENTREE.get(module, module)}\n"
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return round(float(sortie.stdout.strip().splitlines()[-1]), 1)
+
+
+def bench_page(page, repeat, nb_rows=None, warm=False):
+    commande = [sys.executable, __file__, "--child", page]
+    if nb_rows:
+        commande += ["--rows", str(nb_rows)]
+    if warm:
+        commande.append("--warm")
+
+    mesures = []
+    for _ in range(repeat):
+        sortie = subprocess.run(commande, capture_output=True, text=True, cwd=ROOT)
+        if sortie.returncode != 0:
+            raise RuntimeError(f"{page} : {sortie.stderr.strip().splitlines()[-1]}")
+        mesures.append(json.loads(sortie.stdout.strip().splitlines()[-1]))
+
+    def p50(valeurs):
+        return round(float(np.percentile(valeurs, 50)), 1)
+
+    return {
+        "ttfr_p50_ms": p50([m["ttfr_ms"] for m in mesures]),
+        "ttfr_max_ms": round(max(m["ttfr_ms"] for m in mesures), 1),
+        "total_p50_ms": p50([m["total_ms"] for m in mesures]),
+        "sections_p50_ms": {
+            section: p50([m["sections_ms"][section] for m in mesures])
+            for section in SECTIONS if all(section in m["sections_ms"] for m in mesures)
+        },
+        "modules": mesures[-1]["modules"],
+    }
+
+
+def run_benchmark(pages, repeat=5, nb_rows=None, warm=False):
+    report = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "rows": nb_rows,
+        "warm": warm,
+        "repeat": repeat,
+        "pages": {},
+    }
+    for page in pages:
+        print(f"⏱️ {page}...")
+        report["pages"][page] = bench_page(page, repeat, nb_rows, warm)
+    modules = sorted({module for mesures in report["pages"].values() for module in mesures["modules"]})
+    report["imports_ms"] = {module: cout_import(module) for module in modules}
+    return report
+
+
+def print_report(report, max_ttfr_ms=None):
+    print(f"{'page':<40} {'1er rendu p50':>14} {'max':>8} {'total p50':>10}  sections p50 (ms)")
+    for page, mesures in report["pages"].items():
+        sections = ", ".join(f"{nom} {duree:.0f}" for nom, duree in mesures["sections_p50_ms"].items())
+        alerte = " ❌" if max_ttfr_ms and mesures["ttfr_p50_ms"] > max_ttfr_ms else ""
+        print(f"{page:<40} {mesures['ttfr_p50_ms']:>14.1f} {mesures['ttfr_max_ms']:>8.1f} {mesures['total_p50_ms']:>10.1f}  {sections}{alerte}")
+    print()
+    print(f"{'bibliothèque':<14} {'import (ms)':>12}  pages")
+    for module, duree in sorted(report["imports_ms"].items(), key=lambda item: -item[1]):
+        pages = ", ".join(Path(page).stem for page, mesures in report["pages"].items() if module in mesures["modules"])
+        print(f"{module:<14} {duree:>12.1f}  {pages}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--rows", type=int, default=None, help="Taille du jeu généré (défaut : données de l'application)")
+    parser.add_argument("--repeat", type=int, default=5, help="Processus neufs par page")
+    parser.add_argument("--warm", action="store_true", help="Exécuter warmup.py avant la page (caches chauds, imports compris)")
+    parser.add_argument("--max-ttfr-ms", type=float, default=MAX_TTFR_MS, help="Seuil du premier rendu (p50) par page, 0 = sans vérification")
+    parser.add_argument("--output", default="bench_startup.json")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(mesure_enfant(args.child, args.rows, args.warm)))
+        return
+
+    report = run_benchmark(args.pages, args.repeat, args.rows, args.warm)
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print_report(report, args.max_ttfr_ms)
+    print(f"✅ Rapport écrit dans {args.output}")
+
+    lentes = [page for page, mesures in report["pages"].items() if args.max_ttfr_ms and mesures["ttfr_p50_ms"] > args.max_ttfr_ms]
+    if lentes:
+        print(f"❌ Premier rendu au-delà de {args.max_ttfr_ms:.0f} ms : {', '.join(lentes)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import functools
+import inspect
+import pickle
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import config
+
+_verrou = threading.RLock()
+_local = threading.local()
+
+
+# Valeurs rattachées à un objet sans en faire partie : classes, modules, fonctions
+_NON_PARCOURUS = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def _attributs(valeur):
+    """Attributs d'un objet à parcourir, ou None s'il a sa propre sérialisation (ex. booster XGBoost)"""
+    if type(valeur).__getstate__ is not object.__getstate__ or type(valeur).__reduce_ex__ is not object.__reduce_ex__:
+        return None
+    attributs = dict(getattr(valeur, "__dict__", {}))
+    for classe in type(valeur).__mro__:
+        for nom in getattr(classe, "__slots__", ()):
+            if nom not in ("__dict__", "__weakref__") and hasattr(valeur, nom):
+                attributs[nom] = getattr(valeur, nom)
+    return attributs if attributs or hasattr(valeur, "__dict__") else None
+
+
+def taille_memoire(valeur, _vus=None):
+    """Taille mémoire profonde (octets) d'une valeur mise en cache : DataFrame, tableau, modèle...
+
+    Les objets composites sont parcourus attribut par attribut ; un DataFrame ou un tableau référencé
+    plusieurs fois n'est compté qu'une fois. Seuls les objets qui définissent leur propre
+    sérialisation (petits modèles compilés) sont mesurés par `pickle`.
+    """
+    if isinstance(valeur, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(valeur)
+    vus = set() if _vus is None else _vus
+    if id(valeur) in vus:
+        return 0
+    vus.add(id(valeur))
+    if isinstance(valeur, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = valeur.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(valeur, np.ndarray):
+        return int(valeur.nbytes)
+    if isinstance(valeur, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valeur) + sum(taille_memoire(element, vus) for element in valeur)
+    if isinstance(valeur, dict):
+        return sys.getsizeof(valeur) + sum(taille_memoire(k, vus) + taille_memoire(v, vus) for k, v in valeur.items())
+    if isinstance(valeur, _NON_PARCOURUS):
+        return 0
+    attributs = _attributs(valeur)
+    if attributs is not None:
+        return sys.getsizeof(valeur) + sum(taille_memoire(v, vus) for v in attributs.values())
+    # Modèles à sérialisation propre : taille sérialisée, à défaut taille de l'objet seul
+    try:
+        return len(pickle.dumps(valeur, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(valeur)
+
+
+class CacheStats:
+    """Compteurs et entrées (ordre LRU) d'un cache nommé, éventuellement partagé par plusieurs pages"""
+
+    def __init__(self, nom, type_cache, budget_octets=None):
+        self.nom = nom
+        self.type_cache = type_cache
+        self.budget_octets = budget_octets
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.secondes_chargement = 0.0
+        self.dernier_chargement = None
+        # (fichier, fonction, clé) -> (taille, args, kwargs, fonction Streamlit à vider)
+        self.entrees = OrderedDict()
+
+    @property
+    def octets(self):
+        return sum(entree[0] for entree in self.entrees.values())
+
+    def ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _evincer(self, protegee):
+        """Vide les entrées les moins récemment utilisées jusqu'à respecter le budget (sauf l'entrée `protegee`)"""
+        if self.budget_octets is None:
+            return []
+        evincees = []
+        while self.octets > self.budget_octets and len(self.entrees) > 1:
+            cle = next(cle for cle in self.entrees if cle != protegee)
+            evincees.append(self.entrees.pop(cle))
+            self.evictions += 1
+        return evincees
+
+
+_caches = {}
+
+
+def _stats(nom, type_cache):
+    with _verrou:
+        if nom not in _caches:
+            budget_mb = config.CACHES["budgets_mb"].get(nom, config.CACHES["default_budget_mb"])
+            _caches[nom] = CacheStats(nom, type_cache, budget_mb * 2**20 if budget_mb else None)
+        return _caches[nom]
+
+
+def _cle(signature, args, kwargs):
+    """Clé d'entrée : arguments liés, sans ceux préfixés par `_` (non hachés par Streamlit)"""
+    lies = signature.bind(*args, **kwargs)
+    lies.apply_defaults()
+    valeurs = tuple((nom, valeur) for nom, valeur in lies.arguments.items() if not nom.startswith("_"))
+    try:
+        hash(valeurs)
+        return valeurs
+    except TypeError:
+        return repr(valeurs)
+
+
+def _vider(fonction_st, args, kwargs):
+    try:
+        fonction_st.clear(*args, **kwargs)
+    except TypeError:
+        # Versions de Streamlit sans suppression d'une entrée précise : tout le cache de la fonction
+        fonction_st.clear()
+
+
+def _cache(type_cache, nom, **options):
+    decorateur_st = st.cache_data if type_cache == "data" else st.cache_resource
+    options = {**config.CACHES["options"].get(nom, {}), **options}
+
+    def decorateur(fonction):
+        stats = _stats(nom, type_cache)
+        signature = inspect.signature(fonction)
+
+        @functools.wraps(fonction)
+        def chargement(*args, **kwargs):
+            # Exécuté seulement quand Streamlit ne trouve pas la valeur : c'est un défaut de cache
+            debut = time.perf_counter()
+            valeur = fonction(*args, **kwargs)
+            _local.charge = (valeur, time.perf_counter() - debut)
+            return valeur
+
+        fonction_st = decorateur_st(**options)(chargement)
+
+        @functools.wraps(fonction)
+        def appel(*args, **kwargs):
+            _local.charge = None
+            valeur = fonction_st(*args, **kwargs)
+            charge, _local.charge = _local.charge, None
+            # Le script de la page redéfinit la fonction à chaque exécution : on l'identifie par fichier et nom
+            cle = (fonction.__code__.co_filename, fonction.__qualname__, _cle(signature, args, kwargs))
+            with _verrou:
+                if charge is None:
+                    stats.hits += 1
+                    if cle in stats.entrees:
+                        stats.entrees.move_to_end(cle)
+                    evincees = []
+                else:
+                    stats.misses += 1
+                    stats.secondes_chargement += charge[1]
+                    stats.dernier_chargement = charge[1]
+                    stats.entrees[cle] = (taille_memoire(charge[0]), args, kwargs, fonction_st)
+                    stats.entrees.move_to_end(cle)
+                    evincees = stats._evincer(protegee=cle)
+            for _, args_evinces, kwargs_evinces, fonction_evincee in evincees:
+                _vider(fonction_evincee, args_evinces, kwargs_evinces)
+            return valeur
+
+        appel.clear = fonction_st.clear
+        return appel
+
+    return decorateur
+
+
+def cache_data(nom, **options):
+    """`st.cache_data` instrumenté : hits, défauts, taille des entrées, temps de chargement et budget LRU"""
+    return _cache("data", nom, **options)
+
+
+def cache_resource(nom, **options):
+    """`st.cache_resource` instrumenté (mêmes mesures que `cache_data`)"""
+    return _cache("resource", nom, **options)
+
+
+def statistiques():
+    """Une ligne par cache : type, entrées, mémoire, budget, hits, défauts, ratio, évictions, temps de chargement"""
+    with _verrou:
+        lignes = [
+            {
+                "Cache": stats.nom,
+                "Type": stats.type_cache,
+                "Entrées": len(stats.entrees),
+                "Mémoire (Mo)": stats.octets / 2**20,
+                "Budget (Mo)": stats.budget_octets / 2**20 if stats.budget_octets else None,
+                "Hits": stats.hits,
+                "Défauts": stats.misses,
+                "Ratio": stats.ratio(),
+                "Évictions": stats.evictions,
+                "Chargement total (s)": stats.secondes_chargement,
+                "Dernier chargement (s)": stats.dernier_chargement,
+            }
+            for stats in _caches.values()
+        ]
+    return pd.DataFrame(lignes)
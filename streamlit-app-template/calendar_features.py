@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Correspondance mois -> saison, identique à celle utilisée à l'entraînement
+SAISON_PAR_MOIS = {12: "Hiver", 1: "Hiver", 2: "Hiver",
+                   3: "Printemps", 4: "Printemps", 5: "Printemps",
+                   6: "Été", 7: "Été", 8: "Été",
+                   9: "Automne", 10: "Automne", 11: "Automne"}
+
+# Colonnes encodées par l'encodeur ordinal
+ORDINAL_COLUMNS = ["Jour_semaine", "Mois", "Saison"]
+
+
+class CalendarFeatureTable:
+    """Table calendaire pré-encodée pour construire les features de projection sans appel sklearn"""
+
+    def __init__(self, ordinal_encoder, onehot_encoder, scaler, start, nb_days=5 * 366):
+        # Calendrier complet sur l'horizon, encodé une seule fois
+        self.dates = pd.date_range(start=pd.Timestamp(start).normalize(), periods=nb_days, freq="D")
+        calendar = pd.DataFrame({
+            "Jour_semaine": self.dates.day_name(),
+            "Mois": self.dates.month_name(),
+            "Saison": self.dates.month.map(SAISON_PAR_MOIS),
+        })
+        self.codes = np.ascontiguousarray(ordinal_encoder.transform(calendar[ORDINAL_COLUMNS]), dtype=np.float64)
+
+        # Table de correspondance événement -> vecteur OneHot (vecteur nul pour une catégorie inconnue)
+        self.event_columns = list(onehot_encoder.get_feature_names_out(["Evenement_Special"]))
+        categories = list(onehot_encoder.categories_[0])
+        vectors = onehot_encoder.transform(pd.DataFrame({"Evenement_Special": categories}))
+        self.event_vectors = {category: np.asarray(vector, dtype=np.float64) for category, vector in zip(categories, vectors)}
+        self._no_event = np.zeros(len(self.event_columns))
+
+        # Le scaler est affine : on retient sa pente et son ordonnée à l'origine
+        bornes = scaler.transform(pd.DataFrame({"Température": [0.0, 1.0]})).ravel()
+        self.temperature_offset = float(bornes[0])
+        self.temperature_slope = float(bornes[1] - bornes[0])
+
+    @property
+    def start(self):
+        return self.dates[0]
+
+    @property
+    def end(self):
+        return self.dates[-1]
+
+    def scale_temperature(self, temperature):
+        """Applique la standardisation de la température apprise à l'entraînement"""
+        return self.temperature_offset + self.temperature_slope * np.asarray(temperature, dtype=np.float64)
+
+    def _slice(self, start, nb_days):
+        """Retourne la tranche de la table couvrant `nb_days` jours à partir de `start`"""
+        offset = 0 if start is None else (pd.Timestamp(start).normalize() - self.start).days
+        if offset < 0 or offset + nb_days > len(self.dates):
+            raise ValueError(
+                f"Horizon demandé hors de la table calendaire ({self.start.date()} - {self.end.date()})."
+            )
+        return slice(offset, offset + nb_days)
+
+    def build(self, nb_days, evenement, vacances, temperature, start=None):
+        """Construit le DataFrame d'entrée du modèle par découpage de la table et diffusion du scénario"""
+        rows = self._slice(start, nb_days)
+
+        future_df = pd.DataFrame(self.codes[rows], columns=ORDINAL_COLUMNS)
+        future_df.insert(0, "ds", self.dates[rows])
+        future_df["Vacances_scolaires"] = int(vacances)
+        future_df["Température"] = float(self.scale_temperature(temperature))
+
+        # Le même événement s'applique à chaque jour projeté : simple diffusion du vecteur OneHot
+        event_vector = self.event_vectors.get(evenement, self._no_event)
+        events = pd.DataFrame(
+            np.broadcast_to(event_vector, (nb_days, len(self.event_columns))),
+            columns=self.event_columns,
+        )
+        return pd.concat([future_df, events], axis=1)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+SERVICE = "Service d'admission"
+DUREE = "Durée du séjour estimé"
+
+
+def intervalles_sejour(df):
+    """Premier jour et lendemain du dernier jour d'hospitalisation de chaque admission.
+
+    Un séjour de d jours occupe un lit du jour d'admission au jour d'admission + d - 1 ;
+    une durée nulle ou manquante compte pour le seul jour d'admission.
+    """
+    debut = pd.to_datetime(df["Date_admission"]).dt.normalize().to_numpy(dtype="datetime64[D]")
+    duree = df[DUREE].fillna(0).clip(lower=1).to_numpy(dtype=np.int64)
+    return debut, debut + duree
+
+
+def recensement_lits(df, start=None, end=None, by=SERVICE, poids=None):
+    """Lits occupés par jour (une colonne par valeur de `by`) par balayage d'un tableau de différences.
+
+    Chaque séjour ajoute +1 à son premier jour et -1 au lendemain de son dernier jour ; la somme
+    cumulée donne l'occupation, en O(admissions + jours). Les séjours commencés avant `start`
+    sont comptés sur les jours de la fenêtre. Avec `poids` (un par admission, ex. poids de sondage
+    d'un échantillon), chaque séjour compte pour son poids et l'occupation est estimée.
+    """
+    debut, fin = intervalles_sejour(df)
+    groupes, categories = pd.factorize(df[by], sort=True) if by else (np.zeros(len(df), dtype=np.int64), ["Total"])
+    if start is None:
+        start = debut.min() if len(df) else np.datetime64("today", "D")
+    if end is None:
+        end = (fin.max() - 1) if len(df) else start
+    start, end = np.datetime64(pd.Timestamp(start), "D"), np.datetime64(pd.Timestamp(end), "D")
+    nb_jours = max(int((end - start).astype(int)) + 1, 0)
+    nb_groupes = len(categories)
+
+    # Bornes ramenées dans la fenêtre [start, end + 1] ; les séjours hors fenêtre s'annulent
+    i = np.clip((debut - start).astype(np.int64), 0, nb_jours)
+    j = np.clip((fin - start).astype(np.int64), 0, nb_jours)
+    valides = groupes >= 0
+    taille = (nb_jours + 1) * nb_groupes
+    w = None if poids is None else np.asarray(poids)[valides]
+    diff = (
+        np.bincount(i[valides] * nb_groupes + groupes[valides], weights=w, minlength=taille)
+        - np.bincount(j[valides] * nb_groupes + groupes[valides], weights=w, minlength=taille)
+    ).reshape(nb_jours + 1, nb_groupes)
+
+    return pd.DataFrame(
+        np.cumsum(diff, axis=0)[:nb_jours],
+        index=pd.date_range(pd.Timestamp(start), periods=nb_jours, freq="D", name="Date"),
+        columns=pd.Index(categories, name=by or None),
+    )
+
+
+def jours_occupes(df, start, end):
+    """Jours d'hospitalisation de chaque admission compris dans la fenêtre [start, end]"""
+    debut, fin = intervalles_sejour(df)
+    start = np.datetime64(pd.Timestamp(start), "D")
+    lendemain = np.datetime64(pd.Timestamp(end), "D") + 1
+    return (np.clip(fin, start, lendemain) - np.clip(debut, start, lendemain)).astype(np.int64)
+
+
+def indicateurs_occupation(recensement):
+    """Occupation moyenne, pic (et sa date) et occupation du dernier jour, tous services confondus"""
+    total = recensement.sum(axis=1)
+    if total.empty:
+        return {"moyenne": 0.0, "pic": 0, "date_pic": None, "dernier_jour": 0}
+    return {
+        "moyenne": float(total.mean()),
+        "pic": int(round(total.max())),
+        "date_pic": total.idxmax(),
+        "dernier_jour": int(round(total.iloc[-1])),
+    }
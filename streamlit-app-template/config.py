@@ -33,3 +33,125 @@ TEXTS = {
     "welcome_message": "Bienvenue dans votre tableau de bord d'analyse de données",
     "sidebar_info": "Ces filtres s'appliquent à toutes les pages de l'application.",
 }
+
+# Serveur de prévision local (forecast_server.py)
+# Si désactivé, les prévisions sont regroupées par lots dans le processus Streamlit lui-même
+FORECAST_SERVER = {
+    "enabled": False,
+    "host": "127.0.0.1",
+    "port": 8765,
+}
+
+# Flux d'admissions en direct (live_feed.py)
+# source : journal JSONL/CSV en ajout seul (chemin relatif au dossier de l'application),
+# ou "tcp://127.0.0.1:8766" pour recevoir les événements sur un port local
+LIVE_FEED = {
+    "enabled": False,
+    "source": "data/admissions_live.jsonl",
+    "refresh_seconds": 5,
+    "from_start": False,
+}
+
+# Données multi-sites : dossier contenant un fichier d'admissions (CSV ou Parquet) par site,
+# chemin relatif au dossier de l'application. None = jeu unique data/dataset_admission.csv
+SITES_DIR = None
+
+# Chronométrage des sections des pages (timings.py) : percentiles glissants sur les `window`
+# dernières exécutions de chaque section, affichés dans la barre latérale si `panel`
+PROFILING = {
+    "enabled": False,
+    "panel": True,
+    "window": 500,
+}
+
+# Caches instrumentés (cache_manager.py) : budget mémoire par cache en Mo (None = illimité),
+# au-delà duquel les entrées les moins récemment utilisées sont vidées, et options transmises
+# à st.cache_data / st.cache_resource par cache (ex. {"admissions": {"ttl": 3600}})
+CACHES = {
+    "default_budget_mb": None,
+    "budgets_mb": {
+        "admissions": 2048,
+        "admissions_journalieres": 256,
+        "agregats": 512,
+        "modeles": 1024,
+    },
+    "options": {},
+}
+
+# Exposition des métriques au format Prometheus (metrics_exporter.py) : durées des pages et des
+# sections, caches, prévisions, sessions actives. Servies sur http://host:port/metrics (port None
+# pour désactiver) et/ou écrites toutes les `textfile_interval` secondes dans `textfile`
+# (collecteur textfile de node-exporter, ex. "/var/lib/node_exporter/textfile/dashboard.prom")
+METRICS = {
+    "enabled": False,
+    "host": "127.0.0.1",
+    "port": 9464,
+    "textfile": None,
+    "textfile_interval": 15,
+}
+
+# Préchauffage au démarrage (warmup.py --serve) : données, agrégats et modèles chargés avant la
+# première visite. État exposé sur http://host:port/ready (503 tant que le préchauffage n'est pas
+# terminé, 200 ensuite) pour le répartiteur de charge, et fichier `ready_file` créé une fois prêt
+WARMUP = {
+    "host": "127.0.0.1",
+    "port": 8599,
+    "ready_file": None,
+}
+
+# Calculs lourds hors du thread du script (jobs.py) : décompositions, chargement des modèles et
+# prévisions. `workers` threads partagés par toutes les sessions, `max_results` résultats terminés
+# conservés par empreinte des entrées
+JOBS = {
+    "workers": 2,
+    "max_results": 32,
+}
+
+# Exports téléchargeables (exports.py) : produits au clic, par blocs de `chunk_rows` lignes, et
+# conservés dans `dir` (relatif au dossier de l'application) par empreinte des filtres, dans la
+# limite de `max_mb`. Au-delà de `background_rows` lignes, l'export est préparé dans un job
+EXPORTS = {
+    "dir": ".cache/exports",
+    "max_mb": 2048,
+    "chunk_rows": 250_000,
+    "background_rows": 500_000,
+}
+
+# Instantanés pré-calculés (snapshots.py, à lancer chaque nuit) : figures et indicateurs des vues
+# par défaut, servis sans calcul quand les filtres d'une session correspondent à un préréglage.
+# À activer une fois la tâche de nuit planifiée ; désactivé, les pages calculent toujours en direct.
+# Préréglage : `nom`, période (`jours` derniers jours, ou `debut`/`fin` au format AAAA-MM-JJ ; toute
+# la période par défaut) et `widgets` (clé -> valeur). `pages` remplace la liste pour une page
+# (ex. {"Predictions": [{"nom": "defaut"}, {"nom": "60_jours", "widgets": {"num_days": 60}}]})
+SNAPSHOTS = {
+    "enabled": False,
+    "dir": ".cache/snapshots",
+    "presets": [
+        {"nom": "defaut"},
+        {"nom": "90_derniers_jours", "jours": 90},
+    ],
+    "pages": {},
+}
+
+# Mode approché de l'accueil (sampling.py) : au-delà de `min_rows` admissions, indicateurs et
+# répartitions sont d'abord estimés sur un échantillon stratifié (service x gravité x mois) de
+# `sample_size` admissions, au moins `min_per_stratum` par strate, avec des intervalles de confiance
+# au niveau `confidence`. Le calcul exact tourne dans un job (jobs.py) et remplace l'estimation dès
+# qu'il est prêt (vérifié toutes les `refresh_seconds` secondes). Désactivé : calcul exact seul, sans
+# valeurs approchées affichées
+APPROXIMATION = {
+    "enabled": False,
+    "sample_size": 200_000,
+    "min_rows": 1_000_000,
+    "min_per_stratum": 30,
+    "confidence": 0.95,
+    "refresh_seconds": 1,
+}
+
+# Page Patients (patients.py) : délai par défaut (jours après la sortie) au-delà duquel une nouvelle
+# admission du même patient n'est plus comptée comme une réadmission, et nombre de patients proposés
+# dans la liste des plus fréquemment admis
+PATIENTS = {
+    "readmission_days": 30,
+    "top_patients": 20,
+}
@@ -0,0 +1,163 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+PERIODE_ANNUELLE = 365
+PERIODE_HEBDOMADAIRE = 7
+
+# Libellé affiché -> méthode de décomposition
+METHODS = {
+    "Classique (annuelle)": "classique",
+    "STL (annuelle)": "stl",
+    "MSTL (hebdomadaire + annuelle)": "mstl",
+}
+
+# Nombre minimal de jours par méthode (deux cycles complets pour la décomposition classique et MSTL)
+MIN_LENGTH = {
+    "classique": 2 * PERIODE_ANNUELLE,
+    "stl": PERIODE_ANNUELLE + 1,
+    "mstl": 2 * PERIODE_ANNUELLE,
+}
+
+
+def _trend_filter(period):
+    """Filtre de moyenne mobile centrée utilisé par `seasonal_decompose`"""
+    if period % 2 == 0:
+        return np.r_[0.5, np.ones(period - 1), 0.5] / period
+    return np.ones(period) / period
+
+
+class ClassicalDecomposition:
+    """Décomposition additive classique (équivalente à `seasonal_decompose`), extensible aux deux extrémités.
+
+    La tendance n'est recalculée que sur les bords touchés par l'extension et les moyennes
+    saisonnières sont tenues à jour par des sommes et effectifs par phase.
+    """
+
+    def __init__(self, series, period=PERIODE_ANNUELLE):
+        self.period = period
+        self.filt = _trend_filter(period)
+        self.half = len(self.filt) // 2
+        self.index = series.index
+        self.values = series.to_numpy(dtype=np.float64)
+        self.trend = np.full(len(self.values), np.nan)
+        self.phase_sums = np.zeros(period)
+        self.phase_counts = np.zeros(period)
+        self._update_trend(0, len(self.values))
+
+    def _update_trend(self, lo, hi):
+        """Recalcule la tendance sur les positions [lo, hi) et met à jour les statistiques par phase"""
+        n = len(self.values)
+        lo, hi = max(lo, self.half), min(hi, n - self.half)
+        if lo >= hi:
+            return
+        window = self.values[lo - self.half:hi + self.half]
+        new_trend = np.convolve(window, self.filt, mode="valid")
+
+        # Retrait des anciennes contributions puis ajout des nouvelles sur la plage recalculée
+        positions = np.arange(lo, hi)
+        self._add_phase_stats(positions, self.values[lo:hi] - self.trend[lo:hi], sign=-1)
+        self.trend[lo:hi] = new_trend
+        self._add_phase_stats(positions, self.values[lo:hi] - new_trend, sign=1)
+
+    def _add_phase_stats(self, positions, detrended, sign):
+        valid = ~np.isnan(detrended)
+        phases = positions[valid] % self.period
+        self.phase_sums += sign * np.bincount(phases, weights=detrended[valid], minlength=self.period)
+        self.phase_counts += sign * np.bincount(phases, minlength=self.period)
+
+    def covers(self, series):
+        return self.index.equals(series.index)
+
+    def extend(self, series):
+        """Étend la décomposition à une série qui contient la série actuelle comme bloc contigu.
+
+        Retourne False si la série ne prolonge pas la série actuelle (recalcul complet nécessaire).
+        """
+        n_old = len(self.values)
+        if n_old == 0 or self.index[0] not in series.index:
+            return False
+        head = series.index.get_loc(self.index[0])
+        if not isinstance(head, int) or not series.index[head:head + n_old].equals(self.index):
+            return False
+        values = series.to_numpy(dtype=np.float64)
+        if not np.array_equal(values[head:head + n_old], self.values, equal_nan=True):
+            return False
+
+        tail = len(values) - head - n_old
+        trend = np.full(len(values), np.nan)
+        trend[head:head + n_old] = self.trend
+        self.index, self.values, self.trend = series.index, values, trend
+
+        # Les phases sont relatives au premier jour : un ajout en tête les décale
+        self.phase_sums = np.roll(self.phase_sums, head)
+        self.phase_counts = np.roll(self.phase_counts, head)
+
+        # Seuls les bords (anciens points sans tendance et nouveaux points) sont recalculés
+        if head:
+            self._update_trend(0, head + self.half)
+        if tail:
+            self._update_trend(head + n_old - self.half, len(values))
+        return True
+
+    def components(self):
+        """Retourne les composantes (observé, tendance, saisonnalité, résidu) indexées par date"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = self.phase_sums / self.phase_counts
+        averages = np.where(self.phase_counts > 0, averages, np.nan)
+        averages -= averages.mean()
+        n = len(self.values)
+        seasonal = np.tile(averages, n // self.period + 1)[:n]
+        return pd.DataFrame(
+            {
+                "observed": self.values,
+                "trend": self.trend,
+                "seasonal": seasonal,
+                "resid": self.values - self.trend - seasonal,
+            },
+            index=self.index,
+        )
+
+
+def decompose(series, method="classique"):
+    """Décompose la série des admissions journalières selon la méthode choisie"""
+    if method == "classique":
+        return ClassicalDecomposition(series).components()
+
+    if method == "stl":
+        from statsmodels.tsa.seasonal import STL
+
+        result = STL(series, period=PERIODE_ANNUELLE).fit()
+        seasonal = pd.DataFrame({"seasonal": result.seasonal})
+    elif method == "mstl":
+        from statsmodels.tsa.seasonal import MSTL
+
+        result = MSTL(series, periods=(PERIODE_HEBDOMADAIRE, PERIODE_ANNUELLE)).fit()
+        seasonal = result.seasonal.to_frame() if isinstance(result.seasonal, pd.Series) else result.seasonal
+        seasonal = seasonal.assign(seasonal=seasonal.sum(axis=1))
+    else:
+        raise ValueError(f"Méthode de décomposition inconnue : {method}")
+
+    components = pd.DataFrame({"observed": series, "trend": result.trend, "resid": result.resid}, index=series.index)
+    return components.join(seasonal)[["observed", "trend", "seasonal", "resid", *seasonal.columns.drop("seasonal")]]
+
+
+class DecompositionStore:
+    """Dernières décompositions classiques par filtre (hors dates), prolongées quand la période s'étend"""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def classical(self, key, series):
+        with self._lock:
+            state = self._states.pop(key, None)
+            if state is None or not (state.covers(series) or state.extend(series)):
+                state = ClassicalDecomposition(series)
+            self._states[key] = state
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+            return state.components()
@@ -0,0 +1,142 @@
+import functools
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+import config
+from jobs import attendre, empreinte, executor
+
+APP_DIR = Path(__file__).parent
+
+
+@dataclass(frozen=True)
+class Format:
+    extension: str
+    mime: str
+    compression: str = None
+
+
+# Formats proposés ; les flux compressés gzip/zstd sont ceux de pyarrow, déjà requis pour Parquet
+FORMATS = {
+    "CSV": Format(".csv", "text/csv"),
+    "CSV (gzip)": Format(".csv.gz", "application/gzip", "gzip"),
+    "CSV (zstd)": Format(".csv.zst", "application/zstd", "zstd"),
+    "Parquet": Format(".parquet", "application/vnd.apache.parquet"),
+}
+
+_verrou = threading.Lock()
+
+
+def dossier_exports():
+    return APP_DIR / config.EXPORTS["dir"]
+
+
+def chemin_export(cle, nom_format, index=False):
+    """Fichier d'export associé à une clé de filtres : partagé par les sessions et les réexécutions"""
+    return dossier_exports() / f"{empreinte(cle, nom_format, index)}{FORMATS[nom_format].extension}"
+
+
+def ecrire_export(df, chemin, nom_format, index=False, job=None):
+    """Écrit `df` par blocs de `config.EXPORTS["chunk_rows"]` lignes, sans copie sérialisée complète en mémoire.
+
+    Le fichier est écrit à côté puis renommé : un export interrompu ne laisse jamais de fichier partiel.
+    """
+    import pyarrow as pa
+
+    format_export = FORMATS[nom_format]
+    chemin = Path(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = chemin.with_name(f"{chemin.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    taille_bloc = config.EXPORTS["chunk_rows"]
+    nb_lignes = len(df)
+
+    try:
+        if nom_format == "Parquet":
+            import pyarrow.parquet as pq
+
+            writer = None
+            try:
+                for debut in range(0, max(nb_lignes, 1), taille_bloc):
+                    table = pa.Table.from_pandas(df.iloc[debut:debut + taille_bloc], preserve_index=index)
+                    if writer is None:
+                        writer = pq.ParquetWriter(temporaire, table.schema, compression="zstd")
+                    writer.write_table(table.cast(writer.schema))
+                    if job is not None:
+                        job.avancer((debut + taille_bloc) / max(nb_lignes, 1))
+            finally:
+                if writer is not None:
+                    writer.close()
+        else:
+            with pa.output_stream(str(temporaire), compression=format_export.compression) as flux:
+                for debut in range(0, max(nb_lignes, 1), taille_bloc):
+                    bloc = df.iloc[debut:debut + taille_bloc]
+                    flux.write(bloc.to_csv(index=index, header=(debut == 0)).encode("utf-8"))
+                    if job is not None:
+                        job.avancer((debut + taille_bloc) / max(nb_lignes, 1))
+        os.replace(temporaire, chemin)
+    finally:
+        temporaire.unlink(missing_ok=True)
+
+    _elaguer()
+    return chemin
+
+
+def _elaguer():
+    # Budget disque : les exports les moins récemment écrits sont supprimés au-delà de `max_mb`
+    budget = config.EXPORTS["max_mb"] * 2**20
+    with _verrou:
+        fichiers = sorted(
+            (fichier for fichier in dossier_exports().glob("*") if not fichier.name.endswith(".tmp")),
+            key=lambda fichier: fichier.stat().st_mtime,
+        )
+        total = sum(fichier.stat().st_size for fichier in fichiers)
+        for fichier in fichiers[:-1]:
+            if total <= budget:
+                break
+            total -= fichier.stat().st_size
+            fichier.unlink(missing_ok=True)
+
+
+def _contenu(df, chemin, nom_format, index):
+    # Appelé par Streamlit au clic : l'export n'est produit que s'il est demandé
+    if not chemin.exists():
+        ecrire_export(df, chemin, nom_format, index)
+    return chemin.read_bytes()
+
+
+def bouton_export(df, nom_fichier, cle, label="Télécharger", index=False, key=None):
+    """Choix du format et bouton de téléchargement, sans sérialiser les données à chaque exécution.
+
+    `cle` décrit les filtres (et la version des données, et celle des modèles pour une prévision) qui
+    déterminent `df`. Les petits exports sont produits au clic ; au-delà de
+    `config.EXPORTS["background_rows"]` lignes, un bouton lance la préparation dans un job (`jobs.py`)
+    partagé par les sessions, avec sa progression.
+    """
+    key = key or nom_fichier
+    col_format, col_bouton = st.columns([1, 3])
+    with col_format:
+        nom_format = st.selectbox("Format", list(FORMATS), key=f"format_{key}", label_visibility="collapsed")
+    format_export = FORMATS[nom_format]
+    chemin = chemin_export(cle, nom_format, index)
+
+    with col_bouton:
+        if len(df) > config.EXPORTS["background_rows"] and not chemin.exists():
+            cle_job = ("export", chemin.name)
+            job = executor().trouver(cle_job)
+            if job is None and st.button(f"Préparer l'export ({len(df):,} lignes)".replace(",", " "), key=f"preparer_{key}"):
+                job = executor().soumettre(cle_job, ecrire_export, df, chemin, nom_format, index, groupe=f"export_{key}", suivi=True)
+            if job is None:
+                return
+            attendre(job, "Préparation de l'export...")
+
+        st.download_button(
+            label=label,
+            data=functools.partial(_contenu, df, chemin, nom_format, index),
+            file_name=f"{nom_fichier}{format_export.extension}",
+            mime=format_export.mime,
+            on_click="ignore",
+            key=f"telecharger_{key}",
+        )
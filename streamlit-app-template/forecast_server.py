@@ -0,0 +1,321 @@
+"""Serveur local de prévision : regroupe les requêtes de toutes les sessions en lots vectorisés.
+
+Usage :
+    python forecast_server.py --host 127.0.0.1 --port 8765
+
+Protocole : une requête JSON par ligne, une réponse JSON par ligne.
+    {"start": "2024-11-16", "nb_days": 30, "evenement": "Aucun", "vacances": 0, "temperature": 15.0}
+    {"op": "stats"}
+"""
+import argparse
+import json
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from calendar_features import CalendarFeatureTable
+from inference import (
+    MODELS_DIR,
+    StaffingPredictor,
+    load_personnel_models,
+    load_prophet_model,
+    load_transformers,
+)
+from metrics_exporter import PREDICT
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+@dataclass(frozen=True)
+class ForecastRequest:
+    """Scénario de projection : mêmes paramètres que la page Prédictions"""
+
+    start: str
+    nb_days: int
+    evenement: str = "Aucun"
+    vacances: int = 0
+    temperature: float = 15.0
+
+    @classmethod
+    def from_dict(cls, payload):
+        return cls(
+            start=str(pd.Timestamp(payload["start"]).date()),
+            nb_days=int(payload["nb_days"]),
+            evenement=str(payload.get("evenement", "Aucun")),
+            vacances=int(payload.get("vacances", 0)),
+            temperature=float(payload.get("temperature", 15.0)),
+        )
+
+
+class ForecastService:
+    """Possède les modèles et calcule un lot de scénarios en un seul appel par modèle"""
+
+    def __init__(self, prophet_model, staffing_predictor, calendar_table):
+        self.prophet_model = prophet_model
+        self.staffing_predictor = staffing_predictor
+        self.calendar_table = calendar_table
+
+    @classmethod
+    def from_models(cls, prophet_model, personnel_models, transformers, horizon_days=5 * 366):
+        """Construit le service à partir des objets chargés par `inference`"""
+        # Table calendaire couvrant l'historique du modèle puis plusieurs années de projection
+        history = prophet_model.history["ds"]
+        nb_days = (history.max() - history.min()).days + 1 + horizon_days
+        calendar_table = CalendarFeatureTable(*transformers, start=history.min(), nb_days=nb_days)
+        return cls(prophet_model, StaffingPredictor(*personnel_models), calendar_table)
+
+    @classmethod
+    def from_models_dir(cls, models_dir=MODELS_DIR):
+        return cls.from_models(
+            load_prophet_model(models_dir),
+            load_personnel_models(models_dir),
+            load_transformers(models_dir),
+        )
+
+    def predict_batch(self, requests):
+        """Retourne un DataFrame (ds, y, effectifs) par requête, avec un seul predict Prophet pour tout le lot"""
+        debut = time.perf_counter()
+        frames = [
+            self.calendar_table.build(
+                request.nb_days,
+                evenement=request.evenement,
+                vacances=request.vacances,
+                temperature=request.temperature,
+                start=request.start,
+            )
+            for request in requests
+        ]
+        future_df = pd.concat(frames, ignore_index=True)
+
+        # Prophet trie les lignes par date (tri stable) : on rétablit l'ordre d'origine
+        forecast = self.prophet_model.predict(future_df)
+        order = np.argsort(future_df["ds"].to_numpy(), kind="stable")
+        yhat = np.empty(len(future_df))
+        yhat[order] = forecast["yhat"].to_numpy()
+        future_df["Nombre_admissions"] = yhat.round().astype(int)
+
+        # Effectifs des trois métiers pour toutes les lignes du lot
+        staffing = self.staffing_predictor.predict(future_df).round().astype(int)
+
+        results = []
+        offset = 0
+        for frame in frames:
+            rows = slice(offset, offset + len(frame))
+            result = pd.DataFrame({"ds": frame["ds"], "y": future_df["Nombre_admissions"].to_numpy()[rows]})
+            for i, target in enumerate(self.staffing_predictor.targets):
+                result[target] = staffing[rows, i]
+            results.append(result)
+            offset += len(frame)
+        PREDICT.observe(time.perf_counter() - debut)
+        return results
+
+
+class BatchingForecaster:
+    """File d'attente qui regroupe les requêtes concurrentes en micro-lots"""
+
+    def __init__(self, service, max_batch_size=64, max_wait_ms=5.0):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = {"requests": 0, "batches": 0, "coalesced": 0, "rows": 0}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="forecast-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, request):
+        """Ajoute une requête à la file et retourne un `Future` de son résultat"""
+        future = Future()
+        self._queue.put((request, future))
+        return future
+
+    def forecast(self, request, timeout=None):
+        return self.submit(request).result(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            closing = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            self._process(batch)
+            if closing:
+                return
+
+    def _process(self, batch):
+        # Les requêtes identiques du lot ne sont calculées qu'une fois
+        groups = {}
+        for request, future in batch:
+            if future.set_running_or_notify_cancel():
+                groups.setdefault(request, []).append(future)
+        if not groups:
+            return
+
+        requests = list(groups)
+        try:
+            results = self.service.predict_batch(requests)
+        except Exception:
+            # Une requête invalide ne doit pas faire échouer les autres : on rejoue le lot requête par requête
+            results = []
+            for request in requests:
+                try:
+                    results.extend(self.service.predict_batch([request]))
+                except Exception as exc:
+                    results.append(exc)
+
+        for request, result in zip(requests, results):
+            for future in groups[request]:
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result.copy())
+
+        with self._lock:
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["coalesced"] += len(batch) - len(requests)
+            self.stats["rows"] += sum(len(result) for result in results if not isinstance(result, Exception))
+
+
+def _encode_forecast(result):
+    payload = {"ds": result["ds"].dt.strftime("%Y-%m-%d").tolist()}
+    for column in result.columns.drop("ds"):
+        payload[column] = result[column].tolist()
+    return payload
+
+
+def _decode_forecast(payload):
+    result = pd.DataFrame(payload)
+    result["ds"] = pd.to_datetime(result["ds"])
+    return result
+
+
+class _ForecastRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+                if payload.get("op") == "stats":
+                    response = {"ok": True, "stats": dict(self.server.forecaster.stats)}
+                else:
+                    result = self.server.forecaster.forecast(ForecastRequest.from_dict(payload))
+                    response = {"ok": True, "forecast": _encode_forecast(result)}
+            except Exception as exc:
+                response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class ForecastServer(socketserver.ThreadingTCPServer):
+    """Serveur TCP local : un thread par connexion, un seul thread de calcul par lots"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, forecaster, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.forecaster = forecaster
+        super().__init__((host, port), _ForecastRequestHandler)
+
+
+def start_server(forecaster, host=DEFAULT_HOST, port=0):
+    """Démarre le serveur dans un thread de fond (port 0 = port libre) et le retourne"""
+    server = ForecastServer(forecaster, host, port)
+    threading.Thread(target=server.serve_forever, name="forecast-server", daemon=True).start()
+    return server
+
+
+class LocalForecastClient:
+    """Client en mémoire : même interface que `ForecastClient`, sans socket"""
+
+    def __init__(self, forecaster):
+        self.forecaster = forecaster
+
+    def forecast(self, start, nb_days, evenement="Aucun", vacances=0, temperature=15.0, timeout=None):
+        request = ForecastRequest.from_dict(
+            {"start": start, "nb_days": nb_days, "evenement": evenement, "vacances": vacances, "temperature": temperature}
+        )
+        return self.forecaster.forecast(request, timeout)
+
+    def stats(self):
+        return dict(self.forecaster.stats)
+
+
+class ForecastClient:
+    """Client du serveur de prévision local (une connexion par appel)"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=30.0):
+        self.address = (host, port)
+        self.timeout = timeout
+
+    def _call(self, payload):
+        with socket.create_connection(self.address, timeout=self.timeout) as sock:
+            sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+            with sock.makefile("rb") as stream:
+                response = json.loads(stream.readline())
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    def forecast(self, start, nb_days, evenement="Aucun", vacances=0, temperature=15.0):
+        payload = {
+            "start": str(pd.Timestamp(start).date()),
+            "nb_days": int(nb_days),
+            "evenement": evenement,
+            "vacances": int(vacances),
+            "temperature": float(temperature),
+        }
+        return _decode_forecast(self._call(payload)["forecast"])
+
+    def stats(self):
+        return self._call({"op": "stats"})["stats"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--models-dir", default=str(MODELS_DIR))
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    forecaster = BatchingForecaster(ForecastService.from_models_dir(args.models_dir), args.max_batch_size, args.max_wait_ms)
+    with ForecastServer(forecaster, args.host, args.port) as server:
+        print(f"✅ Serveur de prévision à l'écoute sur {args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            forecaster.close()
+
+
+if __name__ == "__main__":
+    main()
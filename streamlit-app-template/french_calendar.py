@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Version du calendrier embarqué : à incrémenter à chaque mise à jour des vacances scolaires
+CALENDAR_VERSION = "2026.1"
+
+# Zone scolaire de l'hôpital (Paris)
+ZONE = "C"
+
+# Bits du calendrier journalier
+HOLIDAY = 1
+SCHOOL_VACATION = 2
+
+# Plage couverte par la table journalière (jours fériés calculés)
+PREMIERE_ANNEE = 1990
+DERNIERE_ANNEE = 2100
+
+# Vacances scolaires de la zone C (calendrier officiel) : premier jour de vacances, jour de reprise des cours
+VACANCES_ZONE_C = [
+    ("2020-12-19", "2021-01-04"),
+    ("2021-02-13", "2021-03-01"),
+    ("2021-04-10", "2021-04-26"),
+    ("2021-07-06", "2021-09-02"),
+    ("2021-10-23", "2021-11-08"),
+    ("2021-12-18", "2022-01-03"),
+    ("2022-02-19", "2022-03-07"),
+    ("2022-04-23", "2022-05-09"),
+    ("2022-07-07", "2022-09-01"),
+    ("2022-10-22", "2022-11-07"),
+    ("2022-12-17", "2023-01-03"),
+    ("2023-02-18", "2023-03-06"),
+    ("2023-04-22", "2023-05-09"),
+    ("2023-07-08", "2023-09-04"),
+    ("2023-10-21", "2023-11-06"),
+    ("2023-12-23", "2024-01-08"),
+    ("2024-02-10", "2024-02-26"),
+    ("2024-04-06", "2024-04-22"),
+    ("2024-07-06", "2024-09-02"),
+    ("2024-10-19", "2024-11-04"),
+    ("2024-12-21", "2025-01-06"),
+    ("2025-02-15", "2025-03-03"),
+    ("2025-04-12", "2025-04-28"),
+    ("2025-07-05", "2025-09-01"),
+    ("2025-10-18", "2025-11-03"),
+    ("2025-12-20", "2026-01-05"),
+    ("2026-02-21", "2026-03-09"),
+    ("2026-04-18", "2026-05-04"),
+    ("2026-07-04", "2026-09-01"),
+]
+
+# Période pour laquelle les vacances scolaires sont connues ; en dehors, `is_school_vacation` renvoie False
+SCHOOL_CALENDAR_COVERAGE = (VACANCES_ZONE_C[0][0], VACANCES_ZONE_C[-1][1])
+
+
+def paques(annee):
+    """Date de Pâques (algorithme de Meeus/Jones/Butcher)"""
+    a, b, c = annee % 19, annee // 100, annee % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    lv = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * lv) // 451
+    mois, jour = divmod(h + lv - 7 * m + 114, 31)
+    return date(annee, mois, jour + 1)
+
+
+def jours_feries(annee):
+    """Jours fériés de métropole (mêmes dates que calendrier.api.gouv.fr)"""
+    fixes = [date(annee, mois, jour) for mois, jour in [(1, 1), (5, 1), (5, 8), (7, 14), (8, 15), (11, 1), (11, 11), (12, 25)]]
+    # Lundi de Pâques, Ascension, lundi de Pentecôte
+    mobiles = [paques(annee) + timedelta(days=delta) for delta in (1, 39, 50)]
+    return sorted(fixes + mobiles)
+
+
+@lru_cache(maxsize=None)
+def _calendrier():
+    """Table journalière (un octet de bits par jour), construite une seule fois par processus"""
+    origine = np.datetime64(f"{PREMIERE_ANNEE}-01-01", "D")
+    nb_jours = (np.datetime64(f"{DERNIERE_ANNEE + 1}-01-01", "D") - origine).astype(np.int64)
+    bits = np.zeros(nb_jours, dtype=np.uint8)
+
+    feries = np.array(
+        [jour for annee in range(PREMIERE_ANNEE, DERNIERE_ANNEE + 1) for jour in jours_feries(annee)],
+        dtype="datetime64[D]",
+    )
+    bits[(feries - origine).astype(np.int64)] |= HOLIDAY
+    for debut, reprise in VACANCES_ZONE_C:
+        i, j = (np.array([debut, reprise], dtype="datetime64[D]") - origine).astype(np.int64)
+        bits[i:j] |= SCHOOL_VACATION
+
+    bits.flags.writeable = False
+    return origine, bits
+
+
+def day_flags(dates):
+    """Bits du calendrier (HOLIDAY, SCHOOL_VACATION) pour un tableau de dates ; 0 hors de la table"""
+    origine, bits = _calendrier()
+    jours = np.asarray(pd.to_datetime(np.atleast_1d(dates)).values, dtype="datetime64[D]")
+    index = (jours - origine).astype(np.int64)
+    dans_table = (index >= 0) & (index < len(bits))
+    flags = np.zeros(len(index), dtype=np.uint8)
+    flags[dans_table] = bits[index[dans_table]]
+    return flags
+
+
+def is_holiday(dates):
+    """Jour férié en métropole, pour chaque date"""
+    return (day_flags(dates) & HOLIDAY) > 0
+
+
+def is_school_vacation(dates):
+    """Jour de vacances scolaires (zone C), pour chaque date"""
+    return (day_flags(dates) & SCHOOL_VACATION) > 0
@@ -0,0 +1,353 @@
+"""Génération vectorisée d'un jeu d'admissions synthétique (même schéma que `notebooks/Generateur_dataset.ipynb`).
+
+Usage :
+    python generate_data.py --samples 50000 --start 2022-01-01 --end 2024-11-15 --output data/dataset_admission.csv
+    python generate_data.py --samples 20000000 --format parquet --output data/admissions.parquet --jobs 8
+    python generate_data.py --samples 1000000 --retours 0.15 --output data/dataset_admission.csv
+
+Les admissions sont réparties sur les jours selon les facteurs hebdomadaires et saisonniers du notebook,
+puis chaque bloc de jours est généré colonne par colonne avec NumPy, en parallèle, avec sa propre graine.
+Les règles du notebook (motifs et antécédents par tranche d'âge, gravité, service, durée, personnel)
+sont précalculées en tables de correspondance. Avec `--retours`, une part des admissions reprend
+l'identifiant d'un patient admis dans les 90 jours précédents (réadmissions, page Patients), avec
+son sexe et ses antécédents, et son âge avancé du temps écoulé ; le retour commence au plus tôt le
+jour de sa sortie, et les retours qui chevaucheraient un séjour deviennent de nouveaux patients.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from french_calendar import is_holiday, is_school_vacation
+
+COLUMNS = [
+    "ID_patient", "Date_heure_admission", "Âge", "Sexe", "Jour_semaine", "Mois", "Saison", "Vacances_scolaires",
+    "Météo", "Température", "Evenement_Special", "Antécédents", "Motif d'admission", "Gravité", "Mode d'arrivée",
+    "Service d'admission", "Durée du séjour estimé", "Type d'hospitalisation", "Lits occupes", "Materiel utilise",
+    "Materiel dispo", "Nb medecin", "Nb infirmier", "Nb aide soignant",
+]
+
+STOCK_MATERIEL_TOTAL = 6000000
+AGE_MAX = 95
+
+# --------- RÈGLES DU NOTEBOOK ---------
+ANTECEDENTS_AGE = {
+    (0, 2): ["Cardiopathies congénitales", "Anomalies chromosomiques", "Bronchiolite", "Otites", "Méningites", "Allergies alimentaires", "Eczéma"],
+    (3, 10): ["Asthme", "Angines", "Otites", "Autisme", "TDAH", "Varicelle", "Rougeole"],
+    (11, 20): ["Acné", "SOPK", "Diabète de type 1", "Lupus", "Anxiété", "Dépression", "Scolioses"],
+    (21, 40): ["Hypertension", "Diabète de type 2", "Obésité", "Crohn", "RCH", "Athérosclérose précoce"],
+    (41, 60): ["Hypertension", "Infarctus", "AVC", "Cancers", "Arthrose", "Hypothyroïdie", "Diabète"],
+    (61, 80): ["Alzheimer", "Démence", "Ostéoporose", "Insuffisance cardiaque", "Maladies pulmonaires chroniques", "Cancers"],
+    (81, 95): ["Polypathologies", "Fragilité osseuse", "Insuffisance rénale", "Troubles de la mémoire", "Déclin fonctionnel"],
+}
+
+MOTIF_ADMISSION_AGE = {
+    (0, 10): ["Détresse respiratoire", "Bronchiolite", "Méningite", "Otites sévères", "Brûlures"],
+    (11, 20): ["Fractures", "Accidents", "Anxiété sévère", "Dépression", "Mononucléose", "Méningite", "Troubles de la croissance", "Diabète"],
+    (21, 40): ["Accidents", "Appendicite", "Calculs biliaires", "Pancréatite", "Pneumonie", "Infections sexuellement transmissibles", "Crises d’angoisse", "Troubles bipolaires"],
+    (41, 60): ["Infarctus", "Hypertension", "AVC", "Diabète", "Obésité", "Cirrhose", "Cancers", "Arthrose", "Hernies discales", "Asthme sévère"],
+    (61, 80): ["Insuffisance cardiaque", "AVC", "Hypertension sévère", "Cancers", "Alzheimer", "Parkinson", "Fractures", "Ostéoporose"],
+    (81, 95): ["Hospitalisation pour chute", "Troubles cognitifs avancés", "Insuffisance cardiaque terminale", "Maladies neurodégénératives", "Accompagnement de fin de vie", "Gestion de la douleur", "Pneumonie", "Infections urinaires à répétition"],
+}
+
+ANTECEDENTS_CRITIQUES = ["Infarctus", "AVC", "Insuffisance cardiaque", "Cancers", "Pancréatite", "Pneumonie", "Insuffisance rénale", "Détresse respiratoire", "Bronchiolite", "Méningite", "Otites sévères", "Brûlures", "Ingestion de corps étrangers"]
+MOTIFS_ELEVES = ["Accidents de la route", "Tentative de suicide", "Fractures", "Alzheimer", "Hernies discales", "Asthme sévère"]
+ANTECEDENTS_MOYENS = ["Diabète", "Obésité", "Arthrose", "Infections sexuellement transmissibles"]
+
+GRAVITES = ["Critique", "Élevée", "Moyenne", "Faible"]
+
+SERVICES_MOTIF = [
+    (["Infarctus", "AVC", "Insuffisance cardiaque"], "Cardiologie"),
+    (["Fractures", "Accidents de la route", "Brûlures"], "Traumatologie"),
+    (["Pneumonie", "Bronchiolite", "Méningite"], "Médecine"),
+    (["Dépression", "Troubles bipolaires", "Tentatives de suicide", "Anxiété sévère"], "Psychiatrie générale"),
+    (["Troubles de la croissance", "TDAH", "Autisme", "Psychose infantile"], "Psychiatrie infanto-juvénile"),
+    (["Grossesse compliquée", "Accouchement", "Problèmes gynécologiques"], "Gynéco-Obstétrique"),
+    (["Appendicite", "Hernie", "Calculs biliaires", "Cancer colorectal"], "Chirurgie"),
+]
+
+MODES_ARRIVEE = ["Accompagné par famille", "Ambulance", "SAMU", "Véhicule personnel", "Transport public"]
+MODES_ENFANT = [0, 1, 2]
+MODES_GRAVE = [1, 2]
+MODES_AUTRES = [3, 4, 1]
+
+JOURS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MOIS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+SAISONS = ["Hiver", "Printemps", "Été", "Automne"]
+SAISON_MOIS = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])  # index = mois (1..12)
+
+METEO_SAISON = {
+    "Hiver": ["Neige", "Pluie", "Froid", "Gris"],
+    "Printemps": ["Soleil", "Pluie", "Doux"],
+    "Été": ["Soleil", "Chaleur", "Canicule"],
+    "Automne": ["Pluie", "Vent", "Frais"],
+}
+TEMPERATURE_METEO = {
+    "Neige": (-20, -2), "Pluie": (5, 15), "Froid": (-2, 5), "Gris": (3, 10), "Soleil": (10, 25),
+    "Chaleur": (25, 35), "Canicule": (30, 40), "Doux": (15, 20), "Vent": (10, 18), "Frais": (8, 15),
+}
+EVENEMENT_SAISON = {
+    "Hiver": "Épidémie de grippe", "Printemps": "Pollens allergènes", "Été": "Canicule", "Automne": "Épidémie de gastro",
+}
+
+# Bornes (incluses) par gravité, dans l'ordre de GRAVITES
+DUREE_GRAVITE = np.array([[10, 30], [5, 15], [2, 7], [1, 3]])
+MATERIEL_GRAVITE = np.array([[300, 500], [100, 300], [50, 100], [5, 50]])
+PERSONNEL_GRAVITE = {
+    "Nb medecin": np.array([[2, 5], [1, 3], [1, 2], [1, 2]]),
+    "Nb infirmier": np.array([[2, 5], [1, 3], [1, 2], [0, 2]]),
+    "Nb aide soignant": np.array([[2, 5], [1, 3], [1, 2], [0, 2]]),
+}
+# Capacité par créneau de 8 h et minimum par patient
+PERSONNEL_DISPONIBLE = {"Nb medecin": (50, 1), "Nb infirmier": (100, 2), "Nb aide soignant": (80, 1)}
+FACTEUR_PERSONNEL_SAISON = np.array([1.2, 1.0, 0.9, 1.1])
+
+FACTEURS_HEBDO = np.array([1.1, 1.0, 0.9, 1.0, 1.2, 0.7, 0.6])  # lundi -> dimanche
+FACTEURS_SAISON = np.array([1.2, 0.9, 1.4, 1.0])
+
+
+def _table_par_age(regles):
+    """Vocabulaire, et pour chaque âge : codes possibles (complétés par -1) et nombre de choix"""
+    vocabulaire = sorted({valeur for valeurs in regles.values() for valeur in valeurs})
+    code = {valeur: i for i, valeur in enumerate(vocabulaire)}
+    largeur = max(len(valeurs) for valeurs in regles.values())
+    choix = np.full((AGE_MAX + 1, largeur), -1)
+    nb_choix = np.zeros(AGE_MAX + 1, dtype=np.int64)
+    for (age_min, age_max), valeurs in regles.items():
+        choix[age_min:age_max + 1, :len(valeurs)] = [code[valeur] for valeur in valeurs]
+        nb_choix[age_min:age_max + 1] = len(valeurs)
+    return vocabulaire, choix, nb_choix
+
+
+ANTECEDENTS, CHOIX_ANTECEDENTS, NB_ANTECEDENTS = _table_par_age(ANTECEDENTS_AGE)
+MOTIFS, CHOIX_MOTIFS, NB_MOTIFS = _table_par_age(MOTIF_ADMISSION_AGE)
+
+# Règles du notebook (recherche de sous-chaînes) évaluées une fois par valeur du vocabulaire
+ANTECEDENT_CRITIQUE = np.array([any(cond in valeur for cond in ANTECEDENTS_CRITIQUES) for valeur in ANTECEDENTS])
+ANTECEDENT_MOYEN = np.array([any(cond in valeur for cond in ANTECEDENTS_MOYENS) for valeur in ANTECEDENTS])
+MOTIF_ELEVE = np.array([any(cond in valeur for cond in MOTIFS_ELEVES) for valeur in MOTIFS])
+
+SERVICES = ["Réanimation", *dict.fromkeys(service for _, service in SERVICES_MOTIF), "Urgences"]
+SERVICE_MOTIF = np.array([
+    SERVICES.index(next((service for motifs, service in SERVICES_MOTIF if motif in motifs), "Urgences"))
+    for motif in MOTIFS
+])
+
+METEOS = list(TEMPERATURE_METEO)
+CHOIX_METEO = np.array([[METEOS.index(m) for m in METEO_SAISON[s]] + [-1] * (4 - len(METEO_SAISON[s])) for s in SAISONS])
+NB_METEO = np.array([len(METEO_SAISON[s]) for s in SAISONS])
+TEMPERATURES = np.array([TEMPERATURE_METEO[m] for m in METEOS])
+EVENEMENTS = ["Aucun", *EVENEMENT_SAISON.values()]
+
+TYPES_HOSPITALISATION = ["Soins intensifs", "Hospitalisation classique", "Chirurgie ambulatoire"]
+
+
+def _uniformes(tirages, bornes, codes):
+    """Entiers uniformes entre les bornes incluses `bornes[codes]`, à partir de tirages uniformes sur [0, 1)"""
+    basses, hautes = bornes[codes, 0], bornes[codes, 1]
+    return basses + np.floor(tirages * (hautes - basses + 1)).astype(np.int64)
+
+
+def _choix(tirages, table, nb_choix, lignes):
+    """Une valeur parmi `table[ligne, :nb_choix[ligne]]` pour chaque ligne, à partir de tirages uniformes sur [0, 1)"""
+    colonnes = np.floor(tirages * nb_choix[lignes]).astype(np.int64)
+    return table[lignes, colonnes]
+
+
+def repartir_admissions(nb_samples, start, end, seed):
+    """Nombre d'admissions par jour, proportionnel aux facteurs hebdomadaire et saisonnier du notebook"""
+    jours = pd.date_range(start, end, freq="D")
+    poids = FACTEURS_HEBDO[jours.weekday] * FACTEURS_SAISON[SAISON_MOIS[jours.month]]
+    return jours, np.random.default_rng(seed).multinomial(nb_samples, poids / poids.sum())
+
+
+def generer_bloc(jours, comptes, premier_id, seed, part_retours=0.0):
+    """Génère les admissions d'un bloc de jours consécutifs (sans la colonne `Materiel dispo`)"""
+    rng = np.random.default_rng(seed)
+    jours = pd.DatetimeIndex(jours)
+    n = int(comptes.sum())
+    jour_ligne = np.repeat(np.arange(len(jours)), comptes)
+
+    # Attributs du jour : saison, vacances, événement spécial (un par jour, comme dans le notebook)
+    saison_jour = SAISON_MOIS[jours.month]
+    vacances_jour = is_holiday(jours) | is_school_vacation(jours)
+    evenement_jour = np.where(rng.random(len(jours)) < 0.5, 0, saison_jour + 1)
+    saison = saison_jour[jour_ligne]
+
+    # Heure d'admission : instants uniformes dans la journée, triés
+    secondes = rng.random(n) * 86400
+    ordre = np.lexsort((secondes, jour_ligne))
+    horodatage = jours.values[jour_ligne] + (secondes[ordre] * 1e9).astype("timedelta64[ns]")
+
+    # Tirages des colonnes, dans le même ordre quelle que soit la part de retours ; les valeurs qui
+    # dépendent du patient (âge, donc motif, gravité et durée) en sont déduites plus bas
+    age_tire = rng.integers(0, AGE_MAX + 1, n)
+    sexe_tire = rng.integers(0, 2, n)
+    meteo = _choix(rng.random(n), CHOIX_METEO, NB_METEO, saison)
+    temperature = _uniformes(rng.random(n), TEMPERATURES, meteo)
+    antecedent_tire = _choix(rng.random(n), CHOIX_ANTECEDENTS, NB_ANTECEDENTS, age_tire)
+    tirage_motif = rng.random(n)
+    tirages_mode = rng.integers(0, 3, n), rng.integers(0, 2, n), rng.integers(0, 3, n)
+    tirage_duree = rng.random(n)
+
+    # Patients revenus : admission antérieure du bloc, environ 90 jours en arrière au plus, dont le patient
+    # revient (tirage avec un générateur à part pour ne pas changer les autres colonnes d'une graine donnée)
+    lien = np.arange(n)
+    if part_retours:
+        # Flux dérivé de la graine du bloc (entier ou SeedSequence) sans consommer `rng`
+        graine = rng.bit_generator.seed_seq
+        graine_retours = np.random.SeedSequence(graine.entropy, spawn_key=(*graine.spawn_key, 2**32 - 1))
+        rng_retours = np.random.default_rng(graine_retours)
+        retours = np.flatnonzero(rng_retours.random(n) < part_retours)
+        retours = retours[retours > 0]
+        par_jour = max(n // max(len(jours), 1), 1)
+        recul = 1 + np.floor(rng_retours.random(len(retours)) * np.minimum(retours, 90 * par_jour)).astype(np.int64)
+        lien[retours] = retours - recul
+
+    # Un patient revenu garde son identifiant, son sexe et ses antécédents ; son âge avance avec le temps
+    # écoulé. Un retour admis avant la sortie du séjour précédent du patient devient un nouveau patient :
+    # la durée dépend de la gravité, donc du patient, et on recommence jusqu'à ce qu'aucun séjour d'un
+    # même patient n'en chevauche un autre (chaque tour ne fait que retirer des retours)
+    while True:
+        # Première admission du patient : on remonte les retours successifs (sauts de pointeurs)
+        premiere = lien
+        while not np.array_equal(premiere[premiere], premiere):
+            premiere = premiere[premiere]
+        ecoule = ((horodatage - horodatage[premiere]) // np.timedelta64(1, "D")) / 365.25
+        age = np.minimum(age_tire[premiere] + np.floor(ecoule).astype(np.int64), AGE_MAX)
+        antecedent = antecedent_tire[premiere]
+        motif = _choix(tirage_motif, CHOIX_MOTIFS, NB_MOTIFS, age)
+        gravite = np.select(
+            [ANTECEDENT_CRITIQUE[antecedent], MOTIF_ELEVE[motif], ANTECEDENT_MOYEN[antecedent]], [0, 1, 2], default=3
+        )
+        duree = _uniformes(tirage_duree, DUREE_GRAVITE, gravite)
+
+        # Admissions consécutives d'un même patient (les lignes sont déjà dans l'ordre chronologique)
+        par_patient = np.argsort(premiere, kind="stable")
+        meme_patient = premiere[par_patient][1:] == premiere[par_patient][:-1]
+        suivantes, precedentes = par_patient[1:][meme_patient], par_patient[:-1][meme_patient]
+        chevauchent = suivantes[jour_ligne[suivantes] < jour_ligne[precedentes] + duree[precedentes]]
+        if not len(chevauchent):
+            break
+        lien = lien.copy()
+        lien[chevauchent] = chevauchent
+
+    sexe = sexe_tire[premiere]
+    mode = np.select(
+        [age < 17, gravite <= 1],
+        [np.array(MODES_ENFANT)[tirages_mode[0]], np.array(MODES_GRAVE)[tirages_mode[1]]],
+        default=np.array(MODES_AUTRES)[tirages_mode[2]],
+    )
+    service = np.where(gravite == 0, 0, SERVICE_MOTIF[motif])
+    type_hosp = np.select([(gravite == 0) | (duree > 15), (gravite == 1) | (duree > 7)], [0, 1], default=2)
+    materiel = _uniformes(rng.random(n), MATERIEL_GRAVITE, gravite)
+
+    # Personnel : besoin selon la gravité et la saison, plafonné par le rang du patient dans son créneau de 8 h
+    creneau = jour_ligne * 3 + (secondes[ordre] // (8 * 3600)).astype(np.int64)
+    debut_creneau = np.r_[0, np.flatnonzero(np.diff(creneau)) + 1]
+    rang = np.arange(n) - debut_creneau[np.searchsorted(debut_creneau, np.arange(n), side="right") - 1] + 1
+    personnel = {}
+    for colonne, bornes in PERSONNEL_GRAVITE.items():
+        capacite, minimum = PERSONNEL_DISPONIBLE[colonne]
+        besoin = (_uniformes(rng.random(n), bornes, gravite) * FACTEUR_PERSONNEL_SAISON[saison]).astype(np.int64)
+        personnel[colonne] = np.maximum(minimum, np.minimum(besoin, capacite // rang))
+
+    ids = (premier_id + premiere).astype(np.int64)
+
+    return pd.DataFrame({
+        "ID_patient": ids,
+        "Date_heure_admission": horodatage,
+        "Âge": age,
+        "Sexe": pd.Categorical.from_codes(sexe, ["Homme", "Femme"]),
+        "Jour_semaine": pd.Categorical.from_codes(jours.weekday[jour_ligne], JOURS),
+        "Mois": pd.Categorical.from_codes(jours.month[jour_ligne] - 1, MOIS),
+        "Saison": pd.Categorical.from_codes(saison, SAISONS),
+        "Vacances_scolaires": pd.Categorical.from_codes(vacances_jour[jour_ligne].astype(np.int8), ["Non", "Oui"]),
+        "Météo": pd.Categorical.from_codes(meteo, METEOS),
+        "Température": temperature,
+        "Evenement_Special": pd.Categorical.from_codes(evenement_jour[jour_ligne], EVENEMENTS),
+        "Antécédents": pd.Categorical.from_codes(antecedent, ANTECEDENTS),
+        "Motif d'admission": pd.Categorical.from_codes(motif, MOTIFS),
+        "Gravité": pd.Categorical.from_codes(gravite, GRAVITES),
+        "Mode d'arrivée": pd.Categorical.from_codes(mode, MODES_ARRIVEE),
+        "Service d'admission": pd.Categorical.from_codes(service, SERVICES),
+        "Durée du séjour estimé": duree,
+        "Type d'hospitalisation": pd.Categorical.from_codes(type_hosp, TYPES_HOSPITALISATION),
+        "Lits occupes": np.ones(n, dtype=np.int64),
+        "Materiel utilise": materiel,
+        "Materiel dispo": np.zeros(n, dtype=np.int64),
+        "Nb medecin": personnel["Nb medecin"],
+        "Nb infirmier": personnel["Nb infirmier"],
+        "Nb aide soignant": personnel["Nb aide soignant"],
+    })
+
+
+def _blocs(jours, comptes, chunk_size):
+    """Découpe les jours en blocs consécutifs d'environ `chunk_size` admissions"""
+    fins = np.searchsorted(np.cumsum(comptes), np.arange(chunk_size, comptes.sum(), chunk_size), side="left") + 1
+    bornes = np.unique(np.r_[0, fins, len(jours)])
+    premiers_ids = np.r_[0, np.cumsum(comptes)][bornes[:-1]] + 1
+    return [(jours[a:b], comptes[a:b], premier_id) for a, b, premier_id in zip(bornes[:-1], bornes[1:], premiers_ids)]
+
+
+def _generer(args):
+    return generer_bloc(*args)
+
+
+def generer(nb_samples, start, end, output, fmt="csv", chunk_size=1_000_000, n_jobs=None, seed=42, part_retours=0.0):
+    """Génère le jeu complet, bloc par bloc en parallèle, et l'écrit au fil de l'eau dans l'ordre des blocs"""
+    jours, comptes = repartir_admissions(nb_samples, start, end, seed)
+    blocs = _blocs(jours, comptes, chunk_size)
+    graines = np.random.SeedSequence(seed).spawn(len(blocs))
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Les fichiers d'une génération précédente sont remplacés
+    if fmt == "csv" and output.exists():
+        output.unlink()
+    for ancienne_partie in output.glob("Annee=*/part-*.parquet") if fmt == "parquet" else []:
+        ancienne_partie.unlink()
+
+    stock = STOCK_MATERIEL_TOTAL
+    with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        taches = [(jours_bloc, comptes_bloc, premier_id, graine, part_retours) for (jours_bloc, comptes_bloc, premier_id), graine in zip(blocs, graines)]
+        for i, bloc in enumerate(executor.map(_generer, taches)):
+            # Le stock de matériel décroît sur l'ensemble du jeu : seul calcul séquentiel, fait à l'écriture
+            bloc["Materiel dispo"] = stock - np.cumsum(bloc["Materiel utilise"].to_numpy())
+            stock = int(bloc["Materiel dispo"].iloc[-1]) if len(bloc) else stock
+
+            if fmt == "csv":
+                bloc.to_csv(output, mode="a", header=(i == 0), index=False, encoding="utf-8")
+            else:
+                # Parquet partitionné par année : <output>/Annee=AAAA/part-NNNNN.parquet
+                bloc = bloc.assign(Annee=bloc["Date_heure_admission"].dt.year)
+                for annee, partie in bloc.groupby("Annee"):
+                    dossier = output / f"Annee={annee}"
+                    dossier.mkdir(parents=True, exist_ok=True)
+                    partie.drop(columns="Annee").to_parquet(dossier / f"part-{i:05d}.parquet", index=False)
+    return int(comptes.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10000, help="Nombre d'admissions à générer")
+    parser.add_argument("--start", default="2022-01-01", help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--end", default="2023-12-31", help="Date de fin (YYYY-MM-DD)")
+    parser.add_argument("--output", default="data/dataset_admission.csv")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Nombre d'admissions par bloc")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--retours", type=float, default=0.0, help="Part des admissions de patients déjà admis (0-1)")
+    args = parser.parse_args()
+
+    nb = generer(
+        args.samples, args.start, args.end, args.output, args.format, args.chunk_size, args.jobs, args.seed, args.retours
+    )
+    print(f"✅ {nb} admissions écrites dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import numpy as np
+
+# Dossier des modèles et transformateurs entraînés
+MODELS_DIR = Path(__file__).parent / "models"
+
+# Cibles prédites par les modèles de personnel, dans l'ordre des colonnes de sortie
+STAFFING_TARGETS = ["Nb_medecins", "Nb_infirmiers", "Nb_aides_soignants"]
+
+
+def _make_predict_fn(model):
+    """Retourne une fonction de prédiction directe sur une matrice float32 contiguë"""
+    # Modèles XGBoost : prédiction en place sur le booster, sans DMatrix ni validation pandas
+    if hasattr(model, "get_booster"):
+        booster = model.get_booster()
+        return lambda X: booster.inplace_predict(X)
+
+    # Modèles linéaires : simple produit scalaire avec les coefficients appris
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+        intercept = float(np.asarray(model.intercept_).ravel()[0])
+        return lambda X: X @ coef + intercept
+
+    # Repli générique pour tout autre estimateur scikit-learn
+    return lambda X: model.predict(X)
+
+
+class StaffingPredictor:
+    """Prédit en un seul appel les effectifs médecins, infirmiers et aides-soignants"""
+
+    def __init__(self, model_medecins, model_infirmiers, model_aides_soignants):
+        models = [model_medecins, model_infirmiers, model_aides_soignants]
+
+        # Les trois modèles ont été entraînés sur les mêmes features, dans le même ordre
+        self.feature_names = list(model_medecins.feature_names_in_)
+        for model in models[1:]:
+            if list(model.feature_names_in_) != self.feature_names:
+                raise ValueError("Les modèles de personnel n'utilisent pas les mêmes features.")
+
+        self.targets = list(STAFFING_TARGETS)
+        self._predict_fns = [_make_predict_fn(model) for model in models]
+
+    def build_matrix(self, df):
+        """Construit une seule fois la matrice de features (float32, C-contiguë)"""
+        return np.ascontiguousarray(df[self.feature_names].to_numpy(dtype=np.float32))
+
+    def predict(self, X):
+        """Retourne un tableau (n_lignes, 3) des effectifs prédits, une colonne par cible"""
+        if not isinstance(X, np.ndarray):
+            X = self.build_matrix(X)
+        elif X.dtype != np.float32 or not X.flags["C_CONTIGUOUS"]:
+            X = np.ascontiguousarray(X, dtype=np.float32)
+
+        out = np.empty((X.shape[0], len(self._predict_fns)), dtype=np.float64)
+        for i, predict_fn in enumerate(self._predict_fns):
+            out[:, i] = predict_fn(X)
+        return out
+
+
+def _charger(path):
+    # joblib, et à travers les pickles prophet, xgboost et scikit-learn, n'est importé qu'au premier chargement
+    import joblib
+
+    return joblib.load(path)
+
+
+def load_transformers(models_dir=MODELS_DIR):
+    """Charge les encodeurs et le scaler utilisés à l'entraînement"""
+    models_dir = Path(models_dir)
+    ordinal_encoder = _charger(models_dir / "ordinal_encoder.pkl")
+    onehot_encoder = _charger(models_dir / "onehot_encoder.pkl")
+    scaler = _charger(models_dir / "scaler.pkl")
+    return ordinal_encoder, onehot_encoder, scaler
+
+
+def load_prophet_model(models_dir=MODELS_DIR):
+    """Charge le modèle Prophet de prédiction des admissions"""
+    return _charger(Path(models_dir) / "prophet_model.pkl")
+
+
+def load_personnel_models(models_dir=MODELS_DIR):
+    """Charge les modèles de prédiction des effectifs (médecins, infirmiers, aides-soignants)"""
+    models_dir = Path(models_dir)
+    model_medecins = _charger(models_dir / "model_nb_medecins.pkl")
+    model_infirmiers = _charger(models_dir / "model_nb_infirmiers.pkl")
+    model_aides_soignants = _charger(models_dir / "model_nb_aides_soignants.pkl")
+    return model_medecins, model_infirmiers, model_aides_soignants
@@ -0,0 +1,185 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import config
+
+
+class JobAnnule(Exception):
+    """Levée dans un calcul abandonné par toutes les sessions qui l'attendaient"""
+
+
+def empreinte(*valeurs):
+    """Empreinte stable des entrées d'un calcul (DataFrame, Series, scalaires, tuples...)"""
+    import pandas as pd
+
+    h = hashlib.blake2b(digest_size=16)
+    for valeur in valeurs:
+        if isinstance(valeur, (pd.DataFrame, pd.Series, pd.Index)):
+            h.update(pd.util.hash_pandas_object(valeur, index=not isinstance(valeur, pd.Index)).to_numpy().tobytes())
+            h.update(repr(getattr(valeur, "columns", getattr(valeur, "name", None))).encode())
+        else:
+            h.update(repr(valeur).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _session():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+class Job:
+    """Calcul en cours ou terminé : futur du résultat, avancement et demande d'annulation"""
+
+    def __init__(self, cle):
+        self.cle = cle
+        self.future = None
+        self.debut = time.monotonic()
+        self.progression = None
+        self.annulation = threading.Event()
+        # (session, groupe) qui attendent ce résultat ; une demande sans groupe n'est jamais abandonnée
+        self.emplacements = set()
+        self.hors_groupe = False
+
+    def avancer(self, fraction):
+        """Appelé par le calcul (`suivi=True`) ; lève `JobAnnule` si plus personne n'attend le résultat"""
+        self.progression = min(max(float(fraction), 0.0), 1.0)
+        if self.annulation.is_set():
+            raise JobAnnule(self.cle)
+
+
+class JobExecutor:
+    """Exécute les calculs lourds hors du thread du script Streamlit.
+
+    Les résultats sont indexés par l'empreinte des entrées : deux sessions qui demandent le même
+    calcul partagent le même futur. Chaque session occupe un emplacement par `groupe` (ex.
+    « prévision ») : une nouvelle demande dans le même emplacement abandonne la précédente, annulée
+    si aucune autre session ne l'attend (retirée de la file, ou interrompue au prochain `avancer`).
+    """
+
+    def __init__(self, max_workers=2, max_results=32):
+        self.max_results = max_results
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._emplacements = {}
+        self._verrou = threading.Lock()
+        self.soumis = 0
+        self.partages = 0
+        self.annules = 0
+
+    def soumettre(self, cle, fonction, *args, groupe=None, suivi=False, **kwargs):
+        """Retourne le `Job` de la clé `cle`, en le lançant s'il n'existe pas déjà.
+
+        Avec `suivi=True`, le calcul reçoit le job en argument `job` pour signaler son avancement.
+        """
+        emplacement = (_session(), groupe) if groupe else None
+        with self._verrou:
+            job = self._jobs.get(cle)
+            if job is not None and (job.future.cancelled() or (job.future.done() and job.future.exception())):
+                # Échec ou annulation : la demande suivante relance le calcul
+                del self._jobs[cle]
+                job = None
+            if job is None:
+                job = Job(cle)
+                if suivi:
+                    kwargs["job"] = job
+                job.future = self._pool.submit(self._executer, job, fonction, args, kwargs)
+                self._jobs[cle] = job
+                self.soumis += 1
+            else:
+                self.partages += 1
+            self._jobs.move_to_end(cle)
+
+            if emplacement is None:
+                job.hors_groupe = True
+            else:
+                precedente = self._emplacements.get(emplacement)
+                self._emplacements[emplacement] = cle
+                job.emplacements.add(emplacement)
+                if precedente is not None and precedente != cle:
+                    self._abandonner(precedente, emplacement)
+            self._elaguer()
+        return job
+
+    def trouver(self, cle):
+        """Job en cours ou réussi pour `cle`, sans en lancer un nouveau"""
+        with self._verrou:
+            job = self._jobs.get(cle)
+            if job is None or job.future.cancelled() or (job.future.done() and job.future.exception()):
+                return None
+            return job
+
+    @staticmethod
+    def _executer(job, fonction, args, kwargs):
+        if job.annulation.is_set():
+            raise JobAnnule(job.cle)
+        return fonction(*args, **kwargs)
+
+    def _abandonner(self, cle, emplacement):
+        job = self._jobs.get(cle)
+        if job is None:
+            return
+        job.emplacements.discard(emplacement)
+        if not job.emplacements and not job.hors_groupe and not job.future.done():
+            job.annulation.set()
+            job.future.cancel()
+            del self._jobs[cle]
+            self.annules += 1
+
+    def _elaguer(self):
+        # Les résultats terminés les plus anciens sont oubliés ; les calculs en cours sont conservés
+        termines = [cle for cle, job in self._jobs.items() if job.future.done()]
+        for cle in termines[: max(len(termines) - self.max_results, 0)]:
+            del self._jobs[cle]
+
+    def statistiques(self):
+        with self._verrou:
+            en_cours = sum(not job.future.done() for job in self._jobs.values())
+            return {"soumis": self.soumis, "partagés": self.partages, "annulés": self.annules, "en cours": en_cours}
+
+
+_executor = None
+_verrou_executor = threading.Lock()
+
+
+def executor():
+    """Exécuteur partagé par toutes les sessions du processus (`config.JOBS`)"""
+    global _executor
+    with _verrou_executor:
+        if _executor is None:
+            _executor = JobExecutor(config.JOBS["workers"], config.JOBS["max_results"])
+        return _executor
+
+
+def attendre(job, message="Calcul en cours...", intervalle=0.25):
+    """Attend le résultat en affichant un emplacement réservé dans la page.
+
+    L'emplacement est rafraîchi à chaque `intervalle` : chaque rafraîchissement laisse Streamlit
+    interrompre le script si un widget a changé, sans attendre la fin d'un calcul devenu obsolète.
+    """
+    if job.future.done():
+        return job.future.result()
+
+    import streamlit as st
+
+    zone = st.empty()
+    try:
+        while True:
+            try:
+                return job.future.result(timeout=intervalle)
+            except FutureTimeoutError:
+                pass
+            with zone.container():
+                st.info(f"⏳ {message} ({time.monotonic() - job.debut:.1f} s)")
+                if job.progression is not None:
+                    st.progress(job.progression)
+    except CancelledError:
+        raise JobAnnule(job.cle)
+    finally:
+        zone.empty()
@@ -0,0 +1,332 @@
+"""Flux d'admissions en direct : suit un journal d'événements et tient à jour des agrégats incrémentaux.
+
+Usage :
+    python live_feed.py --source data/dataset_admission.csv --to data/admissions_live.jsonl --rate 5
+    python live_feed.py --source data/dataset_admission.csv --to tcp://127.0.0.1:8766 --rate 5
+
+Le tableau de bord lit le journal (JSONL ou CSV, en ajout seul) ou écoute le port TCP indiqué dans
+`config.LIVE_FEED` ; ce script rejoue des admissions existantes vers l'une de ces sources pour simuler le flux.
+Chaque événement est une ligne du jeu d'admissions (mêmes colonnes que `dataset_admission.csv`).
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from utils import corriger_annee
+
+# Indicateurs sommés par événement (les moyennes se déduisent des sommes et des effectifs non manquants)
+METRICS = [
+    "Durée du séjour estimé", "Lits occupes", "Materiel utilise", "Température",
+    "Nb medecin", "Nb infirmier", "Nb aide soignant",
+]
+
+# Dimensions filtrables de la page d'accueil, en plus de la date
+FILTER_COLUMNS = ["Service d'admission", "Saison", "Sexe", "Gravité", "Mode d'arrivée", "Type d'hospitalisation"]
+
+TCP_PREFIX = "tcp://"
+
+# Événements rejetés gardés pour l'affichage (les plus récents), et longueur de ligne conservée
+REJECTED_KEPT = 20
+REJECTED_CHARS = 200
+
+
+def _to_float(value):
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _parse_datetime(value):
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        moment = pd.Timestamp(value).to_pydatetime()
+    return moment
+
+
+class RunningTotals:
+    """Effectif, sommes et effectifs non manquants des indicateurs : ajout d'un événement en O(1)"""
+
+    __slots__ = ("count", "sums", "counts")
+
+    def __init__(self):
+        self.count = 0
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.counts = dict.fromkeys(METRICS, 0)
+
+    @classmethod
+    def from_frame(cls, df, poids=None):
+        """Agrégats d'un DataFrame d'admissions (calcul vectorisé) ; avec `poids` (poids de sondage
+        d'un échantillon), effectif, sommes et effectifs sont des estimations"""
+        totals = cls()
+        if poids is None:
+            totals.count = len(df)
+            for metric in METRICS:
+                totals.sums[metric] = float(df[metric].sum())
+                totals.counts[metric] = int(df[metric].count())
+            return totals
+        totals.count = float(sum(poids))
+        for metric in METRICS:
+            valeurs = df[metric].to_numpy(dtype=float)
+            presents = ~pd.isna(valeurs)
+            totals.sums[metric] = float((poids[presents] * valeurs[presents]).sum())
+            totals.counts[metric] = float(poids[presents].sum())
+        return totals
+
+    @classmethod
+    def from_dict(cls, state):
+        totals = cls()
+        totals.count = state["count"]
+        totals.sums.update(state["sums"])
+        totals.counts.update(state["counts"])
+        return totals
+
+    def to_dict(self):
+        return {"count": self.count, "sums": dict(self.sums), "counts": dict(self.counts)}
+
+    def add(self, values):
+        self.count += 1
+        for metric, value in values.items():
+            if not math.isnan(value):
+                self.sums[metric] += value
+                self.counts[metric] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        for metric in METRICS:
+            self.sums[metric] += other.sums[metric]
+            self.counts[metric] += other.counts[metric]
+        return self
+
+    def copy(self):
+        return RunningTotals().merge(self)
+
+    def mean(self, metric):
+        return self.sums[metric] / self.counts[metric] if self.counts[metric] else math.nan
+
+
+class LiveAggregates:
+    """Agrégats des événements reçus : totaux et cellules par combinaison de filtres, plus le nombre
+    d'événements rejetés et les derniers d'entre eux"""
+
+    def __init__(self):
+        self.totals = RunningTotals()
+        self.cells = {}
+        self.last_event = None
+        self.errors = 0
+        self.rejected = deque(maxlen=REJECTED_KEPT)
+        self._lock = threading.Lock()
+
+    def apply(self, event):
+        """Ajoute un événement (dictionnaire colonne -> valeur) ; les événements illisibles sont comptés et ignorés"""
+        try:
+            moment = _parse_datetime(event["Date_heure_admission"])
+            key = (moment.date(), *(str(event.get(column, "")) for column in FILTER_COLUMNS))
+            values = {metric: _to_float(event.get(metric)) for metric in METRICS}
+        except (KeyError, ValueError, TypeError) as error:
+            self.reject(event, error)
+            return
+        with self._lock:
+            self.totals.add(values)
+            self.cells.setdefault(key, RunningTotals()).add(values)
+            if self.last_event is None or moment > self.last_event:
+                self.last_event = moment
+
+    def reject(self, line, error):
+        """Compte un événement illisible et garde la ligne et la raison pour l'affichage"""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        rejection = {
+            "Reçu": datetime.now().replace(microsecond=0),
+            "Raison": f"{type(error).__name__} : {error}",
+            "Événement": str(line)[:REJECTED_CHARS],
+        }
+        with self._lock:
+            self.errors += 1
+            self.rejected.append(rejection)
+
+    def recent_rejections(self):
+        """Derniers événements rejetés, du plus récent au plus ancien"""
+        with self._lock:
+            return list(reversed(self.rejected))
+
+    def filtered(self, start_date, end_date, filters):
+        """Agrégats des événements dont la date et les dimensions correspondent aux filtres (colonne -> valeurs)"""
+        selections = [set(map(str, filters[column])) if column in filters else None for column in FILTER_COLUMNS]
+        result = RunningTotals()
+        with self._lock:
+            cells = list(self.cells.items())
+        for (day, *values), totals in cells:
+            if not start_date <= day <= end_date:
+                continue
+            if all(selection is None or value in selection for selection, value in zip(selections, values)):
+                result.merge(totals)
+        return result
+
+
+class FileTailer:
+    """Suit un journal d'admissions en ajout seul (JSONL, ou CSV avec ligne d'en-tête)"""
+
+    def __init__(self, path, aggregates, poll_interval=1.0, from_start=False):
+        self.path = Path(path)
+        self.aggregates = aggregates
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self.is_csv = self.path.suffix.lower() == ".csv"
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-feed-tail", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _parse(self, line, header):
+        if self.is_csv:
+            return dict(zip(header, next(csv.reader([line]))))
+        return json.loads(line)
+
+    def _run(self):
+        position, buffer, header = None, b"", None
+        while not self._stop.is_set():
+            size = self.path.stat().st_size if self.path.exists() else None
+            if size is None:
+                # Journal pas encore créé : il sera lu depuis le début
+                position = 0 if position is None else position
+            elif position is None or size < position:
+                # Premier passage, ou journal tronqué/remplacé
+                position = size if position is None and not self.from_start else 0
+                buffer, header = b"", None
+                if self.is_csv and position:
+                    with open(self.path, "rb") as stream:
+                        header = next(csv.reader([stream.readline().decode("utf-8", errors="replace")]))
+            if size is not None and size > position:
+                with open(self.path, "rb") as stream:
+                    stream.seek(position)
+                    chunk = stream.read()
+                position += len(chunk)
+                # La dernière ligne peut être en cours d'écriture : elle est gardée pour le passage suivant
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                for line in lines:
+                    try:
+                        line = line.decode("utf-8").strip()
+                        if not line:
+                            continue
+                        if self.is_csv and header is None:
+                            header = next(csv.reader([line]))
+                            continue
+                        self.aggregates.apply(self._parse(line, header))
+                    except (UnicodeDecodeError, ValueError, StopIteration) as error:
+                        self.aggregates.reject(line, error)
+            self._stop.wait(self.poll_interval)
+
+
+class _FeedRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                self.server.aggregates.apply(json.loads(line))
+            except ValueError as error:
+                self.server.aggregates.reject(line, error)
+
+
+class SocketFeed(socketserver.ThreadingTCPServer):
+    """Réception des événements sur un port TCP local : un événement JSON par ligne"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, aggregates, host="127.0.0.1", port=8766):
+        self.aggregates = aggregates
+        super().__init__((host, port), _FeedRequestHandler)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="live-feed-socket", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def _parse_tcp(source):
+    host, _, port = source[len(TCP_PREFIX):].rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def start_feed(source, aggregates=None, poll_interval=1.0, from_start=False):
+    """Démarre la lecture du flux (`tcp://hôte:port` ou chemin d'un journal) et retourne ses agrégats et le lecteur"""
+    aggregates = aggregates or LiveAggregates()
+    if str(source).startswith(TCP_PREFIX):
+        reader = SocketFeed(aggregates, *_parse_tcp(source)).start()
+    else:
+        reader = FileTailer(source, aggregates, poll_interval, from_start).start()
+    return aggregates, reader
+
+
+def replay(source, target, rate, limit=None):
+    """Rejoue les admissions d'un CSV vers un journal JSONL/CSV ou un port TCP, à `rate` événements par seconde"""
+    rows = pd.read_csv(source, nrows=limit)
+    if "Date_heure_admission" in rows:
+        # Années ramenées sur celles du jeu chargé par le tableau de bord (utils.corriger_annee) quand
+        # la source est une sortie brute du générateur ; les événements reçus sont pris tels quels
+        rows["Date_heure_admission"] = pd.to_datetime(rows["Date_heure_admission"]).map(corriger_annee).astype(str)
+    rows = rows.astype(object).where(lambda df: df.notna(), None)
+    delay = 1 / rate if rate > 0 else 0
+    if str(target).startswith(TCP_PREFIX):
+        with socket.create_connection(_parse_tcp(target)) as sock:
+            for row in rows.to_dict("records"):
+                sock.sendall((json.dumps(row, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                time.sleep(delay)
+        return
+
+    target = Path(target)
+    is_csv = target.suffix.lower() == ".csv"
+    write_header = is_csv and (not target.exists() or target.stat().st_size == 0)
+    with open(target, "a", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream) if is_csv else None
+        if write_header:
+            writer.writerow(rows.columns)
+        for row in rows.itertuples(index=False):
+            if is_csv:
+                writer.writerow(["" if value is None else value for value in row])
+            else:
+                stream.write(json.dumps(dict(zip(rows.columns, row)), ensure_ascii=False, default=str) + "\n")
+            stream.flush()
+            os.fsync(stream.fileno())
+            time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="data/dataset_admission.csv", help="CSV d'admissions à rejouer")
+    parser.add_argument("--to", default="data/admissions_live.jsonl", help="Journal (.jsonl/.csv) ou tcp://hôte:port")
+    parser.add_argument("--rate", type=float, default=5.0, help="Événements par seconde (0 = sans pause)")
+    parser.add_argument("--limit", type=int, default=None, help="Nombre maximal d'événements rejoués")
+    args = parser.parse_args()
+
+    replay(args.source, args.to, args.rate, args.limit)
+    print(f"✅ Admissions rejouées vers {args.to}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import streamlit as st
+
+import config
+import inference
+from cache_manager import cache_data, cache_resource
+from census import recensement_lits
+from forecast_server import BatchingForecaster, ForecastClient, ForecastService, LocalForecastClient
+from patients import PatientIndex
+from range_index import DailyRangeIndex
+from rollups import TimeRollups
+from sampling import EchantillonStratifie
+from utils import load_data2, load_data3
+
+APP_DIR = Path(__file__).parent
+
+# Mesures des agrégats jour -> semaine -> mois -> année partagés par les pages d'analyse
+MESURES_JOURNALIERES = ["Nombre_admissions", "Nb medecin", "Nb infirmier", "Nb aide soignant"]
+
+
+def dataset_path():
+    """Un fichier par site si `config.SITES_DIR` est défini, sinon le jeu unique"""
+    if config.SITES_DIR:
+        return APP_DIR / config.SITES_DIR
+    return APP_DIR / "data" / "dataset_admission.csv"
+
+
+def version_donnees():
+    """Chemin et date de modification des données, pour les caches persistants (exports, instantanés)"""
+    path = dataset_path()
+    fichiers = sorted(path.iterdir()) if path.is_dir() else [path]
+    return str(path), max((fichier.stat().st_mtime_ns for fichier in fichiers), default=0)
+
+
+def version_modeles():
+    """Date de modification des modèles entraînés (instantanés des prévisions)"""
+    return max((fichier.stat().st_mtime_ns for fichier in inference.MODELS_DIR.glob("*.pkl")), default=0)
+
+
+# Chargements mis en cache une fois par processus et partagés par toutes les pages et toutes les sessions :
+# définis ici plutôt que dans chaque page pour que `warmup.py` remplisse les mêmes caches
+
+@cache_data("admissions")
+def get_admissions():
+    """Admissions détaillées (Accueil, Occupation des lits)"""
+    return load_data2(str(dataset_path()))  # Convertir en string pour compatibilité
+
+
+@cache_data("admissions_journalieres")
+def get_daily():
+    """Jeu journalier agrégé (Analyse exploratoire, Visualisations avancées, Prédictions)"""
+    return load_data3(str(dataset_path()))
+
+
+# Index des sommes cumulées : totaux d'une période en deux recherches et une soustraction
+@cache_resource("agregats")
+def get_range_index():
+    return DailyRangeIndex(get_daily())
+
+
+# Agrégats jour -> semaine -> mois -> année, matérialisés une fois par saison et météo
+@cache_resource("agregats")
+def get_rollups():
+    return TimeRollups(get_daily(), mesures=MESURES_JOURNALIERES, cles=["Saison", "Météo"])
+
+
+# Recensement quotidien par service, calculé une seule fois sur tout l'historique
+@cache_data("agregats")
+def get_recensement():
+    return recensement_lits(get_admissions())
+
+
+# Index des admissions par patient (historiques et réadmissions), construit une fois au chargement
+@cache_resource("agregats")
+def get_patient_index():
+    return PatientIndex(get_admissions())
+
+
+# Échantillon stratifié du mode approché de l'accueil ; None si le mode est désactivé ou le jeu assez petit
+@cache_resource("agregats")
+def get_echantillon():
+    df = get_admissions()
+    options = config.APPROXIMATION
+    if not options["enabled"] or len(df) <= max(options["min_rows"], options["sample_size"]):
+        return None
+    return EchantillonStratifie(df, options["sample_size"], min_par_strate=options["min_per_stratum"])
+
+
+@cache_resource("modeles")
+def load_transformers():
+    # Encodeurs et scaler chargés depuis le dossier des modèles
+    return inference.load_transformers()
+
+
+@cache_resource("modeles")
+def load_prophet_model():
+    return inference.load_prophet_model()
+
+
+@cache_resource("modeles")
+def load_personnel_models():
+    return inference.load_personnel_models()
+
+
+@st.cache_resource
+def get_forecast_client():
+    # Serveur de prévision partagé entre plusieurs processus Streamlit
+    if config.FORECAST_SERVER["enabled"]:
+        return ForecastClient(config.FORECAST_SERVER["host"], config.FORECAST_SERVER["port"])
+
+    # Sinon, service en mémoire partagé par toutes les sessions du processus
+    service = ForecastService.from_models(load_prophet_model(), load_personnel_models(), load_transformers())
+    return LocalForecastClient(BatchingForecaster(service))
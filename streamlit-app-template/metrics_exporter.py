@@ -0,0 +1,210 @@
+"""Métriques du dashboard au format texte Prometheus.
+
+Servies en HTTP (`http://127.0.0.1:9464/metrics`) ou écrites périodiquement dans un fichier
+lu par le collecteur textfile de node-exporter, selon `config.METRICS`. Vérification locale :
+    curl -s http://127.0.0.1:9464/metrics
+"""
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import config
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bornes des histogrammes de durée (secondes)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_verrou = threading.Lock()
+
+
+def _echapper(valeur):
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{nom}="{_echapper(valeur)}"' for nom, valeur in labels) + "}"
+
+
+def _nombre(valeur):
+    if valeur == float("inf"):
+        return "+Inf"
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+class Histogram:
+    """Histogramme cumulatif par combinaison de labels"""
+
+    def __init__(self, nom, aide, labels=(), buckets=BUCKETS):
+        self.nom = nom
+        self.aide = aide
+        self.noms_labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # valeurs des labels -> (comptes par borne, somme, nombre)
+        self._series = {}
+
+    def observe(self, valeur, **labels):
+        cle = tuple(str(labels[nom]) for nom in self.noms_labels)
+        with _verrou:
+            comptes, somme, nombre = self._series.get(cle) or ([0] * len(self.buckets), 0.0, 0)
+            indice = bisect.bisect_left(self.buckets, valeur)
+            if indice < len(comptes):
+                comptes[indice] += 1
+            self._series[cle] = (comptes, somme + valeur, nombre + 1)
+
+    def lignes(self):
+        yield f"# HELP {self.nom} {self.aide}"
+        yield f"# TYPE {self.nom} histogram"
+        with _verrou:
+            series = {cle: (list(comptes), somme, nombre) for cle, (comptes, somme, nombre) in self._series.items()}
+        for cle, (comptes, somme, nombre) in sorted(series.items()):
+            labels = list(zip(self.noms_labels, cle))
+            cumul = 0
+            for borne, compte in zip(self.buckets, comptes):
+                cumul += compte
+                yield f"{self.nom}_bucket{_labels(labels + [('le', _nombre(borne))])} {cumul}"
+            yield f"{self.nom}_bucket{_labels(labels + [('le', '+Inf')])} {nombre}"
+            yield f"{self.nom}_sum{_labels(labels)} {_nombre(somme)}"
+            yield f"{self.nom}_count{_labels(labels)} {nombre}"
+
+
+RERUN = Histogram("dashboard_rerun_seconds", "Durée d'une exécution complète de page", labels=("page",))
+SECTION = Histogram("dashboard_section_seconds", "Durée des sections de page (filtres, agrégats, figures)", labels=("page", "section"))
+PREDICT = Histogram("dashboard_predict_seconds", "Durée d'un lot de prévisions (Prophet et effectifs)")
+
+HISTOGRAMMES = [RERUN, SECTION, PREDICT]
+
+
+def _famille(nom, type_metrique, aide, echantillons):
+    yield f"# HELP {nom} {aide}"
+    yield f"# TYPE {nom} {type_metrique}"
+    for labels, valeur in echantillons:
+        yield f"{nom}{_labels(labels)} {_nombre(valeur)}"
+
+
+def _metriques_caches():
+    from cache_manager import statistiques
+
+    caches = statistiques()
+    if caches.empty:
+        return
+    colonnes = [
+        ("dashboard_cache_hits_total", "counter", "Lectures servies par le cache", "Hits"),
+        ("dashboard_cache_misses_total", "counter", "Lectures ayant déclenché un chargement", "Défauts"),
+        ("dashboard_cache_evictions_total", "counter", "Entrées vidées pour respecter le budget", "Évictions"),
+        ("dashboard_cache_hit_ratio", "gauge", "Part des lectures servies par le cache", "Ratio"),
+        ("dashboard_cache_entries", "gauge", "Entrées présentes dans le cache", "Entrées"),
+        ("dashboard_cache_bytes", "gauge", "Mémoire profonde des entrées (jeux de données, modèles)", "Mémoire (Mo)"),
+    ]
+    for nom, type_metrique, aide, colonne in colonnes:
+        facteur = 2**20 if colonne == "Mémoire (Mo)" else 1
+        echantillons = [
+            ([("cache", ligne["Cache"])], round(ligne[colonne] * facteur) if facteur > 1 else ligne[colonne])
+            for _, ligne in caches.iterrows()
+        ]
+        yield from _famille(nom, type_metrique, aide, echantillons)
+
+
+def _sessions_actives():
+    try:
+        from streamlit.runtime import Runtime
+
+        if Runtime.exists():
+            return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:
+        pass
+    return None
+
+
+def _memoire_residente():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def rendre():
+    """Toutes les métriques au format texte Prometheus"""
+    lignes = []
+    for histogramme in HISTOGRAMMES:
+        lignes.extend(histogramme.lignes())
+    lignes.extend(_metriques_caches())
+    sessions = _sessions_actives()
+    if sessions is not None:
+        lignes.extend(_famille("dashboard_active_sessions", "gauge", "Sessions Streamlit actives", [([], sessions)]))
+    lignes.extend(_famille("dashboard_process_resident_bytes", "gauge", "Mémoire résidente du processus", [([], _memoire_residente())]))
+    return "\n".join(lignes) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        corps = rendre().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        # Pas de journal pour chaque collecte
+        pass
+
+
+def ecrire_fichier(path):
+    """Écrit les métriques de façon atomique (fichier temporaire puis renommage), pour node-exporter"""
+    path = Path(path)
+    temporaire = path.with_suffix(path.suffix + ".tmp")
+    temporaire.write_text(rendre(), encoding="utf-8")
+    os.replace(temporaire, path)
+
+
+def _ecrire_periodiquement(path, intervalle):
+    while True:
+        try:
+            ecrire_fichier(path)
+        except OSError:
+            pass
+        time.sleep(intervalle)
+
+
+_exportation = None
+
+
+def demarrer_exportation():
+    """Démarre une seule fois par processus le serveur HTTP et/ou l'écriture du fichier, selon `config.METRICS`"""
+    global _exportation
+    with _verrou:
+        if _exportation is not None:
+            return _exportation
+        _exportation = {}
+        if config.METRICS["port"]:
+            try:
+                serveur = ThreadingHTTPServer((config.METRICS["host"], config.METRICS["port"]), _MetricsHandler)
+            except OSError as error:
+                # Port déjà pris (autre processus Streamlit) : le dashboard continue sans exposition HTTP
+                _exportation["erreur"] = str(error)
+            else:
+                serveur.daemon_threads = True
+                threading.Thread(target=serveur.serve_forever, daemon=True, name="metrics-http").start()
+                _exportation["serveur"] = serveur
+        if config.METRICS["textfile"]:
+            thread = threading.Thread(
+                target=_ecrire_periodiquement,
+                args=(config.METRICS["textfile"], config.METRICS["textfile_interval"]),
+                daemon=True,
+                name="metrics-textfile",
+            )
+            thread.start()
+            _exportation["fichier"] = thread
+        return _exportation
@@ -0,0 +1,78 @@
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+
+from timings import PageTimer
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+HEADER_CSS = """
+    <style>
+        .header {
+            background-color: #003366;
+            padding: 30px;
+            text-align: center;
+            color: white;
+            font-size: 24px;
+            font-weight: bold;
+            border-radius: 10px;
+        }
+        .footer {
+            position: bottom;
+            bottom: 0;
+            width: 100%;
+            background-color: #003366;
+            color: white;
+            text-align: center;
+            padding: 10px;
+            font-size: 14px;
+            border-radius: 10px;
+        }
+        .sidebar .sidebar-content {
+            background-color: #f0f2f6;
+        }
+    </style>
+    """
+
+# Page -> instant (perf_counter) où son en-tête a été émis lors de la dernière exécution
+premiers_rendus = {}
+
+
+@lru_cache(maxsize=1)
+def _styles():
+    # Styles CSS personnalisés, lus une seule fois par processus
+    return (ASSETS_DIR / "css" / "style.css").read_text()
+
+
+def ouvrir_page(nom, titre_onglet, icone, titre, description, **page_config):
+    """En-tête commun à toutes les pages : configuration, chronométrage, bandeau, logo, styles et titre.
+
+    Appelé avant d'importer pandas, plotly ou les chargements de données : l'en-tête s'affiche
+    pendant que le reste de la page se prépare. Retourne le `PageTimer` de la page.
+    """
+    st.set_page_config(page_title=titre_onglet, page_icon=icone, layout="wide", **page_config)
+
+    # Chronométrage des sections (config.PROFILING)
+    timer = PageTimer(nom)
+    timer.etape("en-tête")
+
+    # --- HEADER ---
+    st.markdown(HEADER_CSS, unsafe_allow_html=True)
+
+    # Affichage du logo et du titre
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.image(ASSETS_DIR / "images" / "logo.png", width=400)
+    with col2:
+        st.markdown("<div class='header'>Hôpitaux Universitaires - Pitié Salpêtrière</div>", unsafe_allow_html=True)
+
+    st.markdown(f"<style>{_styles()}</style>", unsafe_allow_html=True)
+
+    # Titre de la page
+    st.title(titre)
+    st.markdown(description)
+
+    premiers_rendus[nom] = time.perf_counter()
+    return timer
@@ -1,88 +1,44 @@
 import os
 import sys
 
-import pandas as pd
-import plotly.express as px
 import streamlit as st
-from statsmodels.tsa.seasonal import seasonal_decompose
 
 # Ajout du chemin racine au path pour pouvoir importer utils et config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import config
-from utils import load_data, load_data3
-from pathlib import Path
-
-# Configuration de la page
-st.set_page_config(page_title="Analyse Exploratoire", page_icon="📊", layout="wide")
-
-# Définir le chemin absolu du logo
-logo_path = Path(__file__).parent.parent / "assets" / "images" / "logo.png"
-
-# --- HEADER ---
-st.markdown(
-    """
-    <style>
-        .header {
-            background-color: #003366;
-            padding: 30px;
-            text-align: center;
-            color: white;
-            font-size: 24px;
-            font-weight: bold;
-            border-radius: 10px;
-        }
-        .footer {
-            position: bottom;
-            bottom: 0;
-            width: 100%;
-            background-color: #003366;
-            color: white;
-            text-align: center;
-            padding: 10px;
-            font-size: 14px;
-            border-radius: 10px;
-        }
-        .sidebar .sidebar-content {
-            background-color: #f0f2f6;
-        }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-# # Affichage du logo et du titre
-col1, col2 = st.columns([1, 3])
-with col1:
-    st.image(logo_path, width=400)
-with col2:
-    st.markdown("<div class='header'>Hôpitaux Universitaires - Pitié Salpêtrière</div>", unsafe_allow_html=True)
-
-
-
-css_file = Path(__file__).parent.parent / "assets" / "css" / "style.css"
-# Chargement des styles CSS personnalisés
-with open(css_file, "r") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# Titre de la page
-st.title("📊 Analyse Exploratoire des Données")
-st.markdown(
-    "Explorez vos données d'admissions pour découvrir des tendances et des insights. Ces données sont regroupés par jour."
+from page_shell import ouvrir_page
+
+# En-tête affiché avant d'importer les bibliothèques d'analyse et de charger les données
+timer = ouvrir_page(
+    "Exploratory Analysis",
+    "Analyse Exploratoire",
+    "📊",
+    "📊 Analyse Exploratoire des Données",
+    "Explorez vos données d'admissions pour découvrir des tendances et des insights. Ces données sont regroupés par jour.",
 )
 
+timer.etape("imports")
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
-dataset_path = Path(__file__).parent.parent / "data" / "dataset_admission.csv"
-
-# Chargement et mise en cache des données
-@st.cache_data
-def get_data():
-    return load_data3(str(dataset_path))  # Convertir en string pour compatibilité
-
-
-
-
-df = get_data()
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
+import config
+import snapshots
+from cache_manager import cache_data
+from decomposition import METHODS, MIN_LENGTH, DecompositionStore, decompose
+from jobs import attendre, empreinte, executor
+from loaders import get_daily, get_range_index, get_rollups
+from range_index import NB_JOURS
+
+timer.etape("chargement")
+df = get_daily()
+range_index = get_range_index()
+rollups = get_rollups()
+
+timer.etape("widgets de filtre")
 # Sidebar pour les filtres
 st.sidebar.header("Filtres d'Analyse")
 
@@ -106,6 +62,7 @@ selected_saisons = st.sidebar.multiselect(
     key="c=saisons_explore",
 )
 
+timer.etape("filtrage")
 # Application des filtres
 filtered_df = df[
     (df["Date_admission"] >= start_datetime) 
@@ -113,24 +70,29 @@ filtered_df = df[
     & (df["Saison"].isin(selected_saisons))
 ]
 
+# Vue pré-calculée (snapshots.py) quand les filtres correspondent à un préréglage
+vue = snapshots.vue("Exploratory Analysis", periode=(start_date, end_date), saisons=selected_saisons)
+
+timer.etape("vue d'ensemble")
 # --------- SECTION 1: VUE D'ENSEMBLE DES DONNÉES ---------
 st.header("Vue d'ensemble des données")
 
 # Affichage des métriques clés dans des colonnes
+totals = range_index.totals(start_datetime, end_datetime, selected_saisons)
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Nombre Total d'Admissions", filtered_df["Nombre_admissions"].sum())
+    st.metric("Nombre Total d'Admissions", totals["Nombre_admissions"])
 
 with col2:
-    temperature_moyenne = round(filtered_df["Température"].mean()) if not filtered_df["Température"].isna().all() else 0
+    temperature_moyenne = round(totals["Température"] / totals[NB_JOURS]) if totals[NB_JOURS] else 0
     st.metric("Température Moyenne", f"{temperature_moyenne}°C")
 
 with col3:
-    st.metric("Nombre Total de Lits Occupés", filtered_df["Lits occupes"].sum())
+    st.metric("Nombre Total de Lits Occupés", totals["Lits occupes"])
 
 with col4:
-    medecins_moyen = round(filtered_df["Nb medecin"].mean()) if not filtered_df["Nb medecin"].isna().all() else 0
+    medecins_moyen = round(totals["Nb medecin"] / totals[NB_JOURS]) if totals[NB_JOURS] else 0
     st.metric("Moyenne Médecins Mobilisés", medecins_moyen)
 
 # Aperçu des données filtrées
@@ -138,35 +100,43 @@ with st.expander("Aperçu des données"):
     st.dataframe(filtered_df.head(10), use_container_width=True)
 
 
+timer.etape("événements : figure")
 # --------- SECTION 2: RÉPARTITION DES ADMISSIONS PAR ÉVÉNEMENT SPÉCIAL ---------
 st.header("Répartition des Admissions par Événement Spécial")
 
-# Calcul des admissions par événement spécial
-admissions_by_event = filtered_df.groupby("Evenement_Special", observed=True)["Nombre_admissions"].sum().reset_index()
-admissions_by_event = admissions_by_event.sort_values("Nombre_admissions", ascending=False)
-
-# Visualisation des admissions par événement spécial avec un graphique en barres
-fig_event = px.bar(
-    admissions_by_event,
-    x="Evenement_Special",
-    y="Nombre_admissions",
-    color="Evenement_Special",
-    labels={"Nombre_admissions": "Nombre d'Admissions", "Evenement_Special": "Événement Spécial"},
-    template=config.PLOT_CONFIG["template"],
-    color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
-)
+def figure_evenements():
+    # Calcul des admissions par événement spécial
+    admissions_by_event = range_index.by_event(start_datetime, end_datetime, selected_saisons)["Nombre_admissions"].reset_index()
+    admissions_by_event = admissions_by_event.sort_values("Nombre_admissions", ascending=False)
 
-fig_event.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=20, b=30),
-    showlegend=False,
-    xaxis_title="",
-    yaxis_title="Nombre d'Admissions",
-)
+    # Visualisation des admissions par événement spécial avec un graphique en barres
+    fig_event = px.bar(
+        admissions_by_event,
+        x="Evenement_Special",
+        y="Nombre_admissions",
+        color="Evenement_Special",
+        labels={"Nombre_admissions": "Nombre d'Admissions", "Evenement_Special": "Événement Spécial"},
+        template=config.PLOT_CONFIG["template"],
+        color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
+    )
 
+    fig_event.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=30),
+        showlegend=False,
+        xaxis_title="",
+        yaxis_title="Nombre d'Admissions",
+    )
+    return fig_event
+
+
+fig_event = vue.figure("evenements", figure_evenements)
+
+timer.etape("événements : affichage")
 st.plotly_chart(fig_event, use_container_width=True)
 
 
+timer.etape("analyse temporelle : figure")
 # --------- SECTION 3: ANALYSE TEMPORELLE ---------
 st.header("Analyse Temporelle des Admissions")
 
@@ -176,204 +146,254 @@ selected_time_analysis = st.radio(
     "Choisir une analyse temporelle :", time_options, horizontal=True
 )
 
-if selected_time_analysis == "Jour de la semaine":
-    # Ordre des jours de la semaine
-    days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+def figure_temporelle():
+    if selected_time_analysis == "Jour de la semaine":
+        # Agrégation des admissions par jour de la semaine (ordre des jours conservé)
+        admissions_by_day = rollups.par("Jour_semaine", start_datetime, end_datetime, Saison=selected_saisons)
+
+        # Visualisation des admissions par jour de la semaine
+        fig_time = px.line(
+            admissions_by_day,
+            x="Jour_semaine",
+            y="Nombre_admissions",
+            markers=True,
+            labels={"Nombre_admissions": "Nombre d'Admissions", "Jour_semaine": "Jour de la semaine"},
+            template=config.PLOT_CONFIG["template"],
+            color_discrete_sequence=[config.COLORS["primary"]],
+        )
+
+    elif selected_time_analysis == "Mois":
+        # Agrégation des admissions par mois
+        admissions_by_month = rollups.par("Mois", start_datetime, end_datetime, Saison=selected_saisons)
+
+        # Visualisation des admissions par mois
+        fig_time = px.line(
+            admissions_by_month,
+            x="Mois",
+            y="Nombre_admissions",
+            markers=True,
+            labels={"Nombre_admissions": "Nombre d'Admissions", "Mois": "Mois"},
+            template=config.PLOT_CONFIG["template"],
+            color_discrete_sequence=[config.COLORS["primary"]],
+        )
+
+    elif selected_time_analysis == "Année":
+        # Agrégation des admissions par année
+        admissions_by_year = rollups.par("Annee", start_datetime, end_datetime, Saison=selected_saisons)
+
+        # Visualisation des admissions par année
+        fig_time = px.bar(
+            admissions_by_year,
+            x="Annee",
+            y="Nombre_admissions",
+            labels={"Nombre_admissions": "Nombre d'Admissions", "Annee": "Année"},
+            template=config.PLOT_CONFIG["template"],
+            color_discrete_sequence=[config.COLORS["primary"]],
+        )
+
+    else:  # Saison
+        # Agrégation des admissions par saison
+        admissions_by_season = rollups.par("Saison", start_datetime, end_datetime, Saison=selected_saisons)
+
+        # Visualisation des admissions par saison
+        fig_time = px.bar(
+            admissions_by_season,
+            x="Saison",
+            y="Nombre_admissions",
+            labels={"Nombre_admissions": "Nombre d'Admissions", "Saison": "Saison"},
+            template=config.PLOT_CONFIG["template"],
+            color_discrete_sequence=[config.COLORS["primary"]],
+        )
+
+    # Ajustements du graphique
+    fig_time.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=30),
+        xaxis_title="",
+        yaxis_title="Nombre d'Admissions",
+    )
+    return fig_time
 
-    # Agrégation des admissions par jour de la semaine
-    admissions_by_day = filtered_df.groupby("Jour_semaine", observed=True)["Nombre_admissions"].sum().reset_index()
-    admissions_by_day["Jour_semaine"] = pd.Categorical(admissions_by_day["Jour_semaine"], categories=days_order, ordered=True)
-    admissions_by_day = admissions_by_day.sort_values("Jour_semaine")
 
-    # Visualisation des admissions par jour de la semaine
-    fig_time = px.line(
-        admissions_by_day,
-        x="Jour_semaine",
-        y="Nombre_admissions",
-        markers=True,
-        labels={"Nombre_admissions": "Nombre d'Admissions", "Jour_semaine": "Jour de la semaine"},
-        template=config.PLOT_CONFIG["template"],
-        color_discrete_sequence=[config.COLORS["primary"]],
-    )
+fig_time = vue.figure("temporelle", figure_temporelle, selected_time_analysis)
 
-elif selected_time_analysis == "Mois":
-    # Agrégation des admissions par mois
-    admissions_by_month = filtered_df.groupby("Mois", observed=True)["Nombre_admissions"].sum().reset_index()
+timer.etape("analyse temporelle : affichage")
+st.plotly_chart(fig_time, use_container_width=True)
 
-    # Visualisation des admissions par mois
-    fig_time = px.line(
-        admissions_by_month,
-        x="Mois",
-        y="Nombre_admissions",
-        markers=True,
-        labels={"Nombre_admissions": "Nombre d'Admissions", "Mois": "Mois"},
-        template=config.PLOT_CONFIG["template"],
-        color_discrete_sequence=[config.COLORS["primary"]],
-    )
 
-elif selected_time_analysis == "Année":
-    # Agrégation des admissions par année
-    admissions_by_year = filtered_df.groupby("Annee", observed=True)["Nombre_admissions"].sum().reset_index()
 
-    # Visualisation des admissions par année
-    fig_time = px.bar(
-        admissions_by_year,
-        x="Annee",
-        y="Nombre_admissions",
-        labels={"Nombre_admissions": "Nombre d'Admissions", "Annee": "Année"},
-        template=config.PLOT_CONFIG["template"],
-        color_discrete_sequence=[config.COLORS["primary"]],
-    )
+timer.etape("météo : figure")
+# --------- SECTION 4: ANALYSE DES ADMISSIONS PAR MÉTÉO ---------
+st.header("Analyse des Admissions par Météo")
 
-else:  # Saison
-    # Agrégation des admissions par saison
-    admissions_by_season = filtered_df.groupby("Saison", observed=True)["Nombre_admissions"].sum().reset_index()
+def figure_meteo():
+    # Agrégation des admissions par météo
+    admissions_by_weather = rollups.par("Météo", start_datetime, end_datetime, Saison=selected_saisons)
+    admissions_by_weather = admissions_by_weather.sort_values("Nombre_admissions", ascending=False)
 
-    # Visualisation des admissions par saison
-    fig_time = px.bar(
-        admissions_by_season,
-        x="Saison",
+    # Visualisation des admissions par condition météorologique
+    fig_weather = px.bar(
+        admissions_by_weather,
+        x="Météo",
         y="Nombre_admissions",
-        labels={"Nombre_admissions": "Nombre d'Admissions", "Saison": "Saison"},
+        color="Météo",
+        labels={"Nombre_admissions": "Nombre d'Admissions", "Météo": "Conditions Météorologiques"},
         template=config.PLOT_CONFIG["template"],
-        color_discrete_sequence=[config.COLORS["primary"]],
+        color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
     )
 
-# Ajustements du graphique
-fig_time.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=20, b=30),
-    xaxis_title="",
-    yaxis_title="Nombre d'Admissions",
-)
-
-st.plotly_chart(fig_time, use_container_width=True)
-
-
-
-# --------- SECTION 4: ANALYSE DES ADMISSIONS PAR MÉTÉO ---------
-st.header("Analyse des Admissions par Météo")
+    # Ajustement du layout
+    fig_weather.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=30),
+        xaxis_title="",
+        yaxis_title="Nombre d'Admissions",
+        showlegend=False,
+    )
+    return fig_weather
 
-# Agrégation des admissions par météo
-admissions_by_weather = filtered_df.groupby("Météo", observed=True)["Nombre_admissions"].sum().reset_index()
-admissions_by_weather = admissions_by_weather.sort_values("Nombre_admissions", ascending=False)
-
-# Visualisation des admissions par condition météorologique
-fig_weather = px.bar(
-    admissions_by_weather,
-    x="Météo",
-    y="Nombre_admissions",
-    color="Météo",
-    labels={"Nombre_admissions": "Nombre d'Admissions", "Météo": "Conditions Météorologiques"},
-    template=config.PLOT_CONFIG["template"],
-    color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
-)
 
-# Ajustement du layout
-fig_weather.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=20, b=30),
-    xaxis_title="",
-    yaxis_title="Nombre d'Admissions",
-    showlegend=False,
-)
+fig_weather = vue.figure("meteo", figure_meteo)
 
+timer.etape("météo : affichage")
 # Affichage du graphique
 st.plotly_chart(fig_weather, use_container_width=True)
 
 
+timer.etape("personnel : figure")
 # --------- SECTION 5: ÉVOLUTION DU PERSONNEL HOSPITALIER ---------
 st.header("Évolution du Personnel Hospitalier")
 
-# Agrégation des admissions et personnel hospitalier par mois
-admissions_personnel_mensuelles = filtered_df.groupby(filtered_df["Date_admission"].dt.to_period('M')).agg({
-    "Nb medecin": "sum",
-    "Nb infirmier": "sum",
-    "Nb aide soignant": "sum"
-}).reset_index()
-
-# Conversion des périodes en datetime pour Plotly
-admissions_personnel_mensuelles["Date_admission"] = admissions_personnel_mensuelles["Date_admission"].astype(str)
-
-# Création du graphique interactif avec Plotly
-fig_personnel = px.line(
-    admissions_personnel_mensuelles,
-    x="Date_admission",
-    y=["Nb medecin", "Nb infirmier", "Nb aide soignant"],
-    markers=True,
-    labels={"Date_admission": "Mois", "value": "Nombre de Personnel"},
-    title="",
-    template=config.PLOT_CONFIG["template"],
-    color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
-)
+def figure_personnel():
+    # Agrégation du personnel hospitalier par mois (libellés Année-Mois précalculés)
+    admissions_personnel_mensuelles = rollups.niveau("mois", start_datetime, end_datetime, Saison=selected_saisons)
+    admissions_personnel_mensuelles = admissions_personnel_mensuelles.rename(columns={"Libellé": "Date_admission"})
 
-# Personnalisation des couleurs et de la légende
-fig_personnel.update_traces(mode='lines+markers')
-fig_personnel.update_layout(
-    height=450,
-    margin=dict(l=20, r=20, t=40, b=30),
-    xaxis_title="Date (Année-Mois)",
-    yaxis_title="Effectif Total",
-    legend_title="Catégorie de Personnel",
-)
+    # Création du graphique interactif avec Plotly
+    fig_personnel = px.line(
+        admissions_personnel_mensuelles,
+        x="Date_admission",
+        y=["Nb medecin", "Nb infirmier", "Nb aide soignant"],
+        markers=True,
+        labels={"Date_admission": "Mois", "value": "Nombre de Personnel"},
+        title="",
+        template=config.PLOT_CONFIG["template"],
+        color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
+    )
+
+    # Personnalisation des couleurs et de la légende
+    fig_personnel.update_traces(mode='lines+markers')
+    fig_personnel.update_layout(
+        height=450,
+        margin=dict(l=20, r=20, t=40, b=30),
+        xaxis_title="Date (Année-Mois)",
+        yaxis_title="Effectif Total",
+        legend_title="Catégorie de Personnel",
+    )
+    return fig_personnel
+
+
+fig_personnel = vue.figure("personnel", figure_personnel)
 
+timer.etape("personnel : affichage")
 # Affichage du graphique
 st.plotly_chart(fig_personnel, use_container_width=True)
 
 
+timer.etape("saisonnalité : décomposition")
 # --------- SECTION 6: ANALYSE DE LA SAISONNALITÉ ---------
 st.header("Analyse de la Saisonnalité des Admissions")
 
-# Préparation des données pour l'analyse
-filtered_df["Date_admission"] = pd.to_datetime(filtered_df["Date_admission"])  # Assurer que c'est bien une date
-admissions_series = filtered_df.set_index("Date_admission")["Nombre_admissions"]
+# Au-delà de cette longueur, STL/MSTL sont calculés dans un processus séparé
+LONG_SERIES = 3 * 365
 
-# Vérifier si la série a suffisamment de points pour la décomposition
-if len(admissions_series) > 365:  # Vérification pour éviter les erreurs sur séries courtes
-    decomposition = seasonal_decompose(admissions_series, model="additive", period=365)  # Utilisation d'une période mensuelle pour détecter la saisonnalité
-
-    # Graphique de la série originale
-    fig_original = px.line(
-        x=admissions_series.index, 
-        y=admissions_series.values, 
-        labels={"x": "Date", "y": "Nombre d'Admissions"},
-        title="📈 Série Temporelle des Admissions (Originale)",
-    )
+@st.cache_resource
+def get_decomposition_store():
+    # Décompositions classiques prolongées de façon incrémentale quand la période s'étend
+    return DecompositionStore()
 
-    # Graphique de la tendance
-    fig_trend = px.line(
-        x=admissions_series.index, 
-        y=decomposition.trend, 
-        labels={"x": "Date", "y": "Tendance"},
-        title="📉 Tendance des Admissions"
-    )
+@st.cache_resource
+def get_decomposition_pool():
+    # Processus démarrés par `spawn` : un fork du serveur Streamlit, multithreadé, peut bloquer
+    # l'enfant sur un verrou hérité
+    return ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
 
-    # Graphique de la saisonnalité
-    fig_seasonal = px.line(
-        x=admissions_series.index, 
-        y=decomposition.seasonal, 
-        labels={"x": "Date", "y": "Saisonnalité"},
-        title="🌍 Saisonnalité des Admissions"
-    )
+@cache_data("decompositions", max_entries=32, show_spinner=False)
+def compute_decomposition(start_date, end_date, saisons, method, _admissions_series):
+    # Clé de cache : période filtrée, saisons et méthode (la série elle-même n'est pas hachée)
+    if method == "classique":
+        return get_decomposition_store().classical((saisons, method), _admissions_series)
+    if len(_admissions_series) > LONG_SERIES:
+        return get_decomposition_pool().submit(decompose, _admissions_series, method).result()
+    return decompose(_admissions_series, method)
 
-    # Graphique du résidu (bruit)
-    fig_residual = px.line(
-        x=admissions_series.index, 
-        y=decomposition.resid, 
-        labels={"x": "Date", "y": "Résidu (Bruit)"},
-        title="🎭 Résidu (Bruit Aléatoire)"
+selected_method = st.radio("Méthode de décomposition :", list(METHODS), horizontal=True)
+method = METHODS[selected_method]
+
+# Préparation des données pour l'analyse
+admissions_series = filtered_df.set_index(pd.to_datetime(filtered_df["Date_admission"]))["Nombre_admissions"].astype(float)
+
+
+def figure_decomposition():
+    # Calcul hors du thread du script : un changement de filtre interrompt l'attente, le calcul
+    # obsolète est annulé s'il n'est attendu par aucune autre session
+    job = executor().soumettre(
+        ("decomposition", method, empreinte(admissions_series)),
+        compute_decomposition,
+        start_date,
+        end_date,
+        tuple(sorted(selected_saisons)),
+        method,
+        admissions_series,
+        groupe="decomposition",
+    )
+    decomposition = attendre(job, "Décomposition de la série en cours...")
+
+    timer.etape("saisonnalité : figure")
+    # Une seule figure à quatre panneaux partageant l'axe des dates
+    fig_decomposition = make_subplots(
+        rows=4,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.06,
+        subplot_titles=[
+            "📈 Série Temporelle des Admissions (Originale)",
+            "📉 Tendance des Admissions",
+            "🌍 Saisonnalité des Admissions",
+            "🎭 Résidu (Bruit Aléatoire)",
+        ],
+    )
+    fig_decomposition.add_trace(go.Scatter(x=decomposition.index, y=decomposition["observed"], name="Nombre d'Admissions"), row=1, col=1)
+    fig_decomposition.add_trace(go.Scatter(x=decomposition.index, y=decomposition["trend"], name="Tendance"), row=2, col=1)
+    seasonal_columns = [column for column in decomposition.columns if column.startswith("seasonal_")] or ["seasonal"]
+    for column in seasonal_columns:
+        fig_decomposition.add_trace(go.Scatter(x=decomposition.index, y=decomposition[column], name=column.replace("seasonal", "Saisonnalité")), row=3, col=1)
+    fig_decomposition.add_trace(go.Scatter(x=decomposition.index, y=decomposition["resid"], name="Résidu (Bruit)"), row=4, col=1)
+    fig_decomposition.update_layout(
+        height=1100,
+        margin=dict(l=20, r=20, t=60, b=30),
+        template=config.PLOT_CONFIG["template"],
+        colorway=config.PLOT_CONFIG["color_discrete_sequence"],
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
     )
+    return fig_decomposition
 
-    # Affichage des graphiques dans Streamlit
-    st.plotly_chart(fig_original, use_container_width=True)
-    st.plotly_chart(fig_trend, use_container_width=True)
-    st.plotly_chart(fig_seasonal, use_container_width=True)
-    st.plotly_chart(fig_residual, use_container_width=True)
+
+# Vérifier si la série a suffisamment de points pour la décomposition
+if len(admissions_series) >= MIN_LENGTH[method]:
+    fig_decomposition = vue.figure("decomposition", figure_decomposition, method)
+
+    timer.etape("saisonnalité : affichage")
+    # Affichage du graphique dans Streamlit
+    st.plotly_chart(fig_decomposition, use_container_width=True)
 
 else:
-    st.warning("⚠️ Pas assez de données filtrées pour effectuer une décomposition saisonnière (minimum 1 an de données requis).")
+    st.warning(f"⚠️ Pas assez de données filtrées pour effectuer une décomposition saisonnière (minimum {MIN_LENGTH[method]} jours de données requis).")
 
 
 
+timer.etape("pied de page")
 # --- FOOTER ---
-st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
+
+timer.fin()
@@ -1,85 +1,34 @@
 import os
 import sys
 
-import pandas as pd
-import plotly.express as px
 import streamlit as st
-from pathlib import Path
 
 # Ajout du chemin racine au path pour pouvoir importer utils et config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import config
-from utils import load_data,load_data3
-
-# Configuration de la page
-st.set_page_config(page_title="Visualisations Avancées", page_icon="📈", layout="wide")
-
-
-# Définir le chemin absolu du logo
-logo_path = Path(__file__).parent.parent / "assets" / "images" / "logo.png"
-
-# --- HEADER ---
-st.markdown(
-    """
-    <style>
-        .header {
-            background-color: #003366;
-            padding: 30px;
-            text-align: center;
-            color: white;
-            font-size: 24px;
-            font-weight: bold;
-            border-radius: 10px;
-        }
-        .footer {
-            position: bottom;
-            bottom: 0;
-            width: 100%;
-            background-color: #003366;
-            color: white;
-            text-align: center;
-            padding: 10px;
-            font-size: 14px;
-            border-radius: 10px;
-        }
-        .sidebar .sidebar-content {
-            background-color: #f0f2f6;
-        }
-    </style>
-    """,
-    unsafe_allow_html=True
+from page_shell import ouvrir_page
+
+# En-tête affiché avant d'importer les bibliothèques d'analyse et de charger les données
+timer = ouvrir_page(
+    "Advanced Visualizations",
+    "Visualisations Avancées",
+    "📈",
+    "📈 Visualisations Avancées",
+    "Découvrez d'autres types de visualisations pour analyser vos données d'admission.",
 )
 
-# Affichage du logo et du titre
-col1, col2 = st.columns([1, 3])
-with col1:
-    st.image(logo_path, width=400)
-with col2:
-    st.markdown("<div class='header'>Hôpitaux Universitaires - Pitié Salpêtrière</div>", unsafe_allow_html=True)
-
-
-
-css_file = Path(__file__).parent.parent / "assets" / "css" / "style.css"
-# Chargement des styles CSS personnalisés
-with open(css_file, "r") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# Titre de la page
-st.title("📈 Visualisations Avancées")
-st.markdown(
-    "Découvrez d'autres types de visualisations pour analyser vos données d'admission."
-)
-
-dataset_path = Path(__file__).parent.parent / "data" / "dataset_admission.csv"
-
-# Chargement et mise en cache des données
-@st.cache_data
-def get_data():
-    return load_data3(str(dataset_path))
+timer.etape("imports")
+import pandas as pd
+import plotly.express as px
 
+import snapshots
+from loaders import get_daily, get_range_index, get_rollups
 
-df = get_data()
+timer.etape("chargement")
+df = get_daily()
+range_index = get_range_index()
+rollups = get_rollups()
 
+timer.etape("widgets de filtre")
 # Sidebar pour les filtres
 st.sidebar.header("Filtres d'Analyse")
 
@@ -103,6 +52,7 @@ selected_saisons = st.sidebar.multiselect(
     key="c=saisons_explore",
 )
 
+timer.etape("filtrage")
 # Application des filtres
 filtered_df = df[
     (df["Date_admission"] >= start_datetime) 
@@ -110,6 +60,10 @@ filtered_df = df[
     & (df["Saison"].isin(selected_saisons))
 ]
 
+# Vue pré-calculée (snapshots.py) quand les filtres correspondent à un préréglage
+vue = snapshots.vue("Advanced Visualizations", periode=(start_date, end_date), saisons=selected_saisons)
+
+timer.etape("carte de chaleur : figure")
 # --------- SECTION 1: CARTE DE CHALEUR DES ADMISSIONS ---------
 st.header("📊 Carte de Chaleur des Admissions")
 
@@ -119,68 +73,71 @@ selected_heatmap = st.radio(
     "Choisir un type de carte de chaleur :", heatmap_options, horizontal=True
 )
 
-if selected_heatmap == "Jour de la semaine vs Météo":
-    # Agrégation par jour de semaine et météo
-    heatmap_data = (
-        filtered_df.groupby(["Jour_semaine", "Météo"], observed=True)["Nombre_admissions"].sum().reset_index()
-    )
-
-    # Création du pivot pour la heatmap
-    heatmap_pivot = heatmap_data.pivot(
-        index="Jour_semaine", columns="Météo", values="Nombre_admissions"
-    )
-
-    # Ordre des jours de la semaine
-    days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    heatmap_pivot = heatmap_pivot.reindex(days_order)
-
-    # Création de la heatmap avec Plotly
-    fig_heatmap = px.imshow(
-        heatmap_pivot.values,
-        labels=dict(x="Météo", y="Jour de la semaine", color="Nombre d'Admissions"),
-        x=heatmap_pivot.columns,
-        y=heatmap_pivot.index,
-        color_continuous_scale="Blues",
-        aspect="auto",
-    )
-
-    fig_heatmap.update_layout(height=450, margin=dict(l=20, r=20, t=20, b=30))
-
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+def figure_carte_de_chaleur():
+    if selected_heatmap == "Jour de la semaine vs Météo":
+        # Agrégation par jour de semaine et météo
+        heatmap_data = rollups.par(
+            "Jour_semaine", start_datetime, end_datetime, by=["Météo"], Saison=selected_saisons
+        )
+
+        # Création du pivot pour la heatmap
+        heatmap_pivot = heatmap_data.pivot(
+            index="Jour_semaine", columns="Météo", values="Nombre_admissions"
+        )
+
+        # Ordre des jours de la semaine
+        days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        heatmap_pivot = heatmap_pivot.reindex(days_order)
+
+        # Création de la heatmap avec Plotly
+        fig_heatmap = px.imshow(
+            heatmap_pivot.values,
+            labels=dict(x="Météo", y="Jour de la semaine", color="Nombre d'Admissions"),
+            x=heatmap_pivot.columns,
+            y=heatmap_pivot.index,
+            color_continuous_scale="Blues",
+            aspect="auto",
+        )
+
+        fig_heatmap.update_layout(height=450, margin=dict(l=20, r=20, t=20, b=30))
+
+    else:  # Mois vs Météo
+        # Agrégation par mois et météo
+        heatmap_data = rollups.par("Mois", start_datetime, end_datetime, by=["Météo"], Saison=selected_saisons)
+
+        # Création du pivot pour la heatmap
+        heatmap_pivot = heatmap_data.pivot(
+            index="Mois", columns="Météo", values="Nombre_admissions"
+        )
+
+        # Ordre des mois
+        months_order = [
+            "January", "February", "March", "April", "May", "June", 
+            "July", "August", "September", "October", "November", "December"
+        ]
+        heatmap_pivot = heatmap_pivot.reindex(months_order)
 
-else:  # Mois vs Météo
-    # Agrégation par mois et météo
-    heatmap_data = (
-        filtered_df.groupby(["Mois", "Météo"])["Nombre_admissions"].sum().reset_index()
-    )
+        # Création de la heatmap avec Plotly
+        fig_heatmap = px.imshow(
+            heatmap_pivot.values,
+            labels=dict(x="Météo", y="Mois", color="Nombre d'Admissions"),
+            x=heatmap_pivot.columns,
+            y=heatmap_pivot.index,
+            color_continuous_scale="Blues",
+            aspect="auto",
+        )
 
-    # Création du pivot pour la heatmap
-    heatmap_pivot = heatmap_data.pivot(
-        index="Mois", columns="Météo", values="Nombre_admissions"
-    )
+        fig_heatmap.update_layout(height=450, margin=dict(l=20, r=20, t=20, b=30))
+    return fig_heatmap
 
-    # Ordre des mois
-    months_order = [
-        "January", "February", "March", "April", "May", "June", 
-        "July", "August", "September", "October", "November", "December"
-    ]
-    heatmap_pivot = heatmap_pivot.reindex(months_order)
-
-    # Création de la heatmap avec Plotly
-    fig_heatmap = px.imshow(
-        heatmap_pivot.values,
-        labels=dict(x="Météo", y="Mois", color="Nombre d'Admissions"),
-        x=heatmap_pivot.columns,
-        y=heatmap_pivot.index,
-        color_continuous_scale="Blues",
-        aspect="auto",
-    )
 
-    fig_heatmap.update_layout(height=450, margin=dict(l=20, r=20, t=20, b=30))
+fig_heatmap = vue.figure("carte_de_chaleur", figure_carte_de_chaleur, selected_heatmap)
 
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+timer.etape("carte de chaleur : affichage")
+st.plotly_chart(fig_heatmap, use_container_width=True)
 
 
+timer.etape("hiérarchie : figure")
 # --------- SECTION 2: VISUALISATION HIÉRARCHIQUE DES ADMISSIONS ---------
 st.header("📊 Visualisation hiérachique des admissions")
 
@@ -190,43 +147,47 @@ selected_hierarchy = st.radio(
     "Choisir un type de visualisation :", hierarchy_options, horizontal=True
 )
 
-# Ajout d'une colonne "Année-Mois" pour structurer la hiérarchie temporelle
-filtered_df["year_month"] = filtered_df["Date_admission"].dt.strftime("%Y-%m")
-
-# Agrégation des admissions par saison et période (année-mois)
-hierarchy_data = (
-    filtered_df.groupby(["Saison", "year_month"], observed=True)["Nombre_admissions"].sum().reset_index()
-)
-
-if selected_hierarchy == "Treemap":
-    # Création du treemap
-    fig_hierarchy = px.treemap(
-        hierarchy_data,
-        path=["Saison", "year_month"],
-        values="Nombre_admissions",
-        color="Nombre_admissions",
-        color_continuous_scale="Blues",
-        title="🌍 Répartition des Admissions par Saison et Période",
-    )
-
-else:  # Sunburst
-    # Création du sunburst
-    fig_hierarchy = px.sunburst(
-        hierarchy_data,
-        path=["Saison", "year_month"],
-        values="Nombre_admissions",
-        color="Nombre_admissions",
-        color_continuous_scale="Blues",
-        title="☀️ Répartition des Admissions par Saison et Période",
-    )
-
-# Mise en page du graphique
-fig_hierarchy.update_layout(height=500, margin=dict(l=20, r=20, t=30, b=30))
-
+def figure_hierarchie():
+    # Agrégation des admissions par saison et période (libellé Année-Mois précalculé par mois)
+    hierarchy_data = rollups.niveau(
+        "mois", start_datetime, end_datetime, par=["Saison"], Saison=selected_saisons
+    ).rename(columns={"Libellé": "year_month"})
+
+    if selected_hierarchy == "Treemap":
+        # Création du treemap
+        fig_hierarchy = px.treemap(
+            hierarchy_data,
+            path=["Saison", "year_month"],
+            values="Nombre_admissions",
+            color="Nombre_admissions",
+            color_continuous_scale="Blues",
+            title="🌍 Répartition des Admissions par Saison et Période",
+        )
+
+    else:  # Sunburst
+        # Création du sunburst
+        fig_hierarchy = px.sunburst(
+            hierarchy_data,
+            path=["Saison", "year_month"],
+            values="Nombre_admissions",
+            color="Nombre_admissions",
+            color_continuous_scale="Blues",
+            title="☀️ Répartition des Admissions par Saison et Période",
+        )
+
+    # Mise en page du graphique
+    fig_hierarchy.update_layout(height=500, margin=dict(l=20, r=20, t=30, b=30))
+    return fig_hierarchy
+
+
+fig_hierarchy = vue.figure("hierarchie", figure_hierarchie, selected_hierarchy)
+
+timer.etape("hiérarchie : affichage")
 # Affichage du graphique
 st.plotly_chart(fig_hierarchy, use_container_width=True)
 
 
+timer.etape("comparaison : agrégats")
 # --------- SECTION 3: ANALYSE COMPARATIVE ---------
 st.header("📊 Analyse Comparative des Admissions par Événement Spécial")
 
@@ -261,24 +222,17 @@ period1_end_dt = pd.to_datetime(period1_end)
 period2_start_dt = pd.to_datetime(period2_start)
 period2_end_dt = pd.to_datetime(period2_end)
 
-# Filtrer les données pour chaque période
-period1_df = filtered_df[
-    (filtered_df["Date_admission"] >= period1_start_dt)
-    & (filtered_df["Date_admission"] <= period1_end_dt)
-]
-
-period2_df = filtered_df[
-    (filtered_df["Date_admission"] >= period2_start_dt)
-    & (filtered_df["Date_admission"] <= period2_end_dt)
-]
-
-# Agrégation des admissions par événement spécial pour chaque période
-period1_events = period1_df.groupby("Evenement_Special")["Nombre_admissions"].sum().reset_index()
+# Agrégation des admissions par événement spécial pour chaque période (restreinte aux filtres de la barre latérale)
+period1_events = range_index.by_event(
+    max(period1_start_dt, start_datetime), min(period1_end_dt, end_datetime), selected_saisons
+)["Nombre_admissions"].reset_index()
 period1_events["Période"] = (
     f"Période 1 ({period1_start.strftime('%d/%m/%Y')} - {period1_end.strftime('%d/%m/%Y')})"
 )
 
-period2_events = period2_df.groupby("Evenement_Special")["Nombre_admissions"].sum().reset_index()
+period2_events = range_index.by_event(
+    max(period2_start_dt, start_datetime), min(period2_end_dt, end_datetime), selected_saisons
+)["Nombre_admissions"].reset_index()
 period2_events["Période"] = (
     f"Période 2 ({period2_start.strftime('%d/%m/%Y')} - {period2_end.strftime('%d/%m/%Y')})"
 )
@@ -286,26 +240,36 @@ period2_events["Période"] = (
 # Combinaison des données des deux périodes
 combined_events = pd.concat([period1_events, period2_events])
 
-# Création du graphique comparatif
-fig_compare = px.bar(
-    combined_events,
-    x="Evenement_Special",
-    y="Nombre_admissions",
-    color="Période",
-    barmode="group",
-    labels={"Nombre_admissions": "Nombre d'Admissions", "Evenement_Special": "Événement Spécial", "Période": "Période"},
-    template="plotly_white",
-)
+timer.etape("comparaison : figure")
+def figure_comparaison():
+    # Création du graphique comparatif
+    fig_compare = px.bar(
+        combined_events,
+        x="Evenement_Special",
+        y="Nombre_admissions",
+        color="Période",
+        barmode="group",
+        labels={"Nombre_admissions": "Nombre d'Admissions", "Evenement_Special": "Événement Spécial", "Période": "Période"},
+        template="plotly_white",
+    )
+
+    fig_compare.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=30),
+        xaxis_title="",
+        yaxis_title="Nombre d'Admissions",
+    )
+    return fig_compare
 
-fig_compare.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=20, b=30),
-    xaxis_title="",
-    yaxis_title="Nombre d'Admissions",
+
+fig_compare = vue.figure(
+    "comparaison", figure_comparaison, period1_start, period1_end, period2_start, period2_end
 )
 
+timer.etape("comparaison : affichage")
 st.plotly_chart(fig_compare, use_container_width=True)
 
+timer.etape("comparaison : tableau des variations")
 # Affichage du pourcentage de variation
 if st.checkbox("Afficher le pourcentage de variation"):
     # Calcul des variations
@@ -357,5 +321,8 @@ if st.checkbox("Afficher le pourcentage de variation"):
 
 
 
+timer.etape("pied de page")
 # --- FOOTER ---
-st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
+
+timer.fin()
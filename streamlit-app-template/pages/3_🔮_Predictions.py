@@ -1,83 +1,37 @@
 import os
 import sys
 
-import pandas as pd
-import plotly.express as px
 import streamlit as st
-import joblib
 
 # Ajout du chemin racine au path pour pouvoir importer utils et config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import config
-from utils import load_data, load_data3
-from pathlib import Path
-
-# Configuration de la page
-st.set_page_config(page_title="Prédictions", page_icon="🔮", layout="wide")
-
-# Définir le chemin absolu du logo
-logo_path = Path(__file__).parent.parent / "assets" / "images" / "logo.png"
-
-# --- HEADER ---
-st.markdown(
-    """
-    <style>
-        .header {
-            background-color: #003366;
-            padding: 30px;
-            text-align: center;
-            color: white;
-            font-size: 24px;
-            font-weight: bold;
-            border-radius: 10px;
-        }
-        .footer {
-            position: bottom;
-            bottom: 0;
-            width: 100%;
-            background-color: #003366;
-            color: white;
-            text-align: center;
-            padding: 10px;
-            font-size: 14px;
-            border-radius: 10px;
-        }
-        .sidebar .sidebar-content {
-            background-color: #f0f2f6;
-        }
-    </style>
-    """,
-    unsafe_allow_html=True
+from page_shell import ouvrir_page
+
+# En-tête affiché avant d'importer les bibliothèques d'analyse et de charger les données
+timer = ouvrir_page(
+    "Predictions",
+    "Prédictions",
+    "🔮",
+    "🔮 Prédictions & Estimations",
+    "Projections basées sur les modèles de ML et de TS développés sur vos données historiques.",
 )
 
-# Affichage du logo et du titre
-col1, col2 = st.columns([1, 3])
-with col1:
-    st.image(logo_path, width=400)
-with col2:
-    st.markdown("<div class='header'>Hôpitaux Universitaires - Pitié Salpêtrière</div>", unsafe_allow_html=True)
-
-
-
-css_file = Path(__file__).parent.parent / "assets" / "css" / "style.css"
-# Chargement des styles CSS personnalisés
-with open(css_file, "r") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# Titre de la page
-st.title("🔮 Prédictions & Estimations")
-st.markdown("Projections basées sur les modèles de ML et de TS développés sur vos données historiques.")
-
-dataset_path = Path(__file__).parent.parent / "data" / "dataset_admission.csv"
-
-# Chargement et mise en cache des données
-@st.cache_data
-def get_data():
-    return load_data3(str(dataset_path))
+timer.etape("imports")
+import pandas as pd
+import plotly.express as px
 
+import config
+import inference
+import snapshots
+from exports import bouton_export
+from french_calendar import is_holiday, is_school_vacation
+from jobs import attendre, executor
+from loaders import get_daily, get_forecast_client, version_donnees, version_modeles
 
-df = get_data()
+timer.etape("chargement")
+df = get_daily()
 
+timer.etape("widgets de filtre")
 # Sidebar pour les filtres
 st.sidebar.header("Filtres d'Analyse")
 
@@ -101,6 +55,7 @@ selected_saisons = st.sidebar.multiselect(
     key="c=saisons_pred",
 )
 
+timer.etape("filtrage")
 # Application des filtres
 filtered_df = df[
     (df["Date_admission"] >= start_datetime) 
@@ -108,36 +63,47 @@ filtered_df = df[
     & (df["Saison"].isin(selected_saisons))
 ]
 
+# Vue pré-calculée (snapshots.py) quand les filtres correspondent à un préréglage : les prévisions
+# des paramètres par défaut sont servies sans charger les modèles
+vue = snapshots.vue("Predictions", periode=(start_date, end_date), saisons=selected_saisons, modeles=version_modeles())
 
+timer.etape("historique : figure")
 # --------- SECTION 1:  PREDICTIONS  ---------
 st.header("📈 Projections des Admissions")
 
-# Tri des données par date pour l'affichage correct
-filtered_df = filtered_df.sort_values("Date_admission")
-
-# Affichage des admissions journalières sans agrégation mensuelle
-fig_admissions = px.line(
-    filtered_df,
-    x="Date_admission",
-    y="Nombre_admissions",
-    markers=True,
-    title="Admissions Journalières Historiques",
-    labels={"Nombre_admissions": "Nombre d'Admissions", "Date_admission": "Date"},
-    template=config.PLOT_CONFIG["template"],
-    color_discrete_sequence=[config.COLORS["primary"]],
-)
+def figure_historique():
+    # Tri des données par date pour l'affichage correct
+    historique = filtered_df.sort_values("Date_admission")
+
+    # Affichage des admissions journalières sans agrégation mensuelle
+    fig_admissions = px.line(
+        historique,
+        x="Date_admission",
+        y="Nombre_admissions",
+        markers=True,
+        title="Admissions Journalières Historiques",
+        labels={"Nombre_admissions": "Nombre d'Admissions", "Date_admission": "Date"},
+        template=config.PLOT_CONFIG["template"],
+        color_discrete_sequence=[config.COLORS["primary"]],
+    )
 
-# Mise en page du graphique
-fig_admissions.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=50, b=30),
-    xaxis_title="",
-    yaxis_title="Admissions",
-)
+    # Mise en page du graphique
+    fig_admissions.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=50, b=30),
+        xaxis_title="",
+        yaxis_title="Admissions",
+    )
+    return fig_admissions
+
+
+fig_admissions = vue.figure("historique", figure_historique)
 
+timer.etape("historique : affichage")
 # Affichage du graphique dans Streamlit
 st.plotly_chart(fig_admissions, use_container_width=True)
 
+timer.etape("paramètres de projection")
 # --------- SECTION 2: PARAMÈTRES DE PROJECTION ---------
 st.subheader("📊 Paramètres de Projection")
 
@@ -166,11 +132,15 @@ with col2:
 # Autres paramètres (Vacances scolaires et Événement Spécial)
 col3, col4 = st.columns(2)
 
+# Par défaut : "Oui" si la majorité des jours projetés sont fériés ou en vacances scolaires (calendrier embarqué)
+jours_projection = pd.date_range(df["Date_admission"].max() + pd.Timedelta(days=1), periods=num_days, freq="D")
+part_vacances = (is_holiday(jours_projection) | is_school_vacation(jours_projection)).mean()
+
 with col3:
     vacances_projection = st.selectbox(
         "Vacances scolaires",
         options=["Oui", "Non"],
-        index=1,
+        index=0 if part_vacances >= 0.5 else 1,
         key="vacances_projection",
     )
 
@@ -181,156 +151,88 @@ with col3:
         key="evenement_projection",
     )
 
-# --------- CHARGEMENT DES TRANSFORMATEURS ---------
-@st.cache_resource
-def load_transformers():
-    # Définir le dossier des modèles en chemin absolu
-    models_dir = Path(__file__).parent.parent / "models"
-
-    # Charger les modèles avec des chemins absolus
-    ordinal_encoder = joblib.load(models_dir / "ordinal_encoder.pkl")
-    onehot_encoder = joblib.load(models_dir / "onehot_encoder.pkl")
-    scaler = joblib.load(models_dir / "scaler.pkl")
-
-    return ordinal_encoder, onehot_encoder, scaler
-
-ordinal_encoder, onehot_encoder, scaler = load_transformers()
-
-# --------- CHARGEMENT DU MODÈLE PROPHET ---------
-@st.cache_resource
-def load_prophet_model():
-    # Définir le chemin absolu vers le modèle
-    model_path = Path(__file__).parent.parent / "models" / "prophet_model.pkl"
-    
-    # Charger le modèle
-    return joblib.load(model_path)
-
-prophet_model = load_prophet_model()
-
-# --------- APPLICATION DU PRÉPROCESSING ---------
-# Création du DataFrame des jours à projeter
-future_dates = pd.date_range(start=df["Date_admission"].max(), periods=num_days + 1, freq="D")[1:]
-future_df = pd.DataFrame({"ds": future_dates})
-
-# Transformation des variables catégoriques
-future_df["Jour_semaine"] = future_df["ds"].dt.day_name()
-future_df["Mois"] = future_df["ds"].dt.month_name()
-future_df["Saison"] = future_df["ds"].dt.month.map({12: "Hiver", 1: "Hiver", 2: "Hiver",
-                                                    3: "Printemps", 4: "Printemps", 5: "Printemps",
-                                                    6: "Été", 7: "Été", 8: "Été",
-                                                    9: "Automne", 10: "Automne", 11: "Automne"})
-
-# Encodage ordinal
-future_df[["Jour_semaine", "Mois", "Saison"]] = ordinal_encoder.transform(future_df[["Jour_semaine", "Mois", "Saison"]])
-
-# Encodage OneHot pour l'Événement Spécial uniquement (sans météo)
-nb_rows = len(future_df)
-encoded_array = onehot_encoder.transform(pd.DataFrame({
-    "Evenement_Special": [evenement_projection for _ in range(nb_rows)]  # Répéter l'événement spécial pour chaque ligne
-}))
-encoded_features = pd.DataFrame(encoded_array, columns=onehot_encoder.get_feature_names_out(["Evenement_Special"]))
+# --------- PRÉDICTION DES ADMISSIONS ET DES EFFECTIFS ---------
+parametres = dict(
+    start=df["Date_admission"].max() + pd.Timedelta(days=1),
+    nb_days=num_days,
+    evenement=evenement_projection,
+    vacances=1 if vacances_projection == "Oui" else 0,
+    temperature=temperature_projection,
+)
 
-# Ajout des variables projetées
-future_df["Vacances_scolaires"] = 1 if vacances_projection == "Oui" else 0
-# Transformer la température en un DataFrame pour correspondre au nombre de lignes de `future_df`
-temp_scaled = scaler.transform(pd.DataFrame({"Température": [temperature_projection] * len(future_df)}))
 
-# Appliquer la transformation correctement
-future_df["Température"] = temp_scaled.flatten()
+def prevoir():
+    timer.etape("chargement des modèles")
+    # Chargements et prévisions hors du thread du script : un changement de paramètre interrompt
+    # l'attente au lieu d'attendre la fin d'une prévision devenue obsolète
+    forecast_client = attendre(executor().soumettre(("modeles",), get_forecast_client), "Chargement des modèles...")
 
+    timer.etape("prévision")
+    # Un seul appel : regroupé avec les requêtes simultanées des autres sessions
+    job = executor().soumettre(("prevision", *parametres.values()), forecast_client.forecast, groupe="prevision", **parametres)
+    return attendre(job, "Prévision en cours...")
 
-# Fusion des données encodées
-future_df = pd.concat([future_df, encoded_features], axis=1)
 
-# --------- PRÉDICTION AVEC PROPHET ---------
-forecast = prophet_model.predict(future_df)
+forecast = vue.valeurs("prevision", prevoir, *parametres.values())
 
+timer.etape("projection : figure")
 # --------- COMBINAISON AVEC DONNÉES HISTORIQUES ---------
 historical_df = df[["Date_admission", "Nombre_admissions"]].rename(columns={"Date_admission": "ds", "Nombre_admissions": "y"})
 historical_df["type"] = "Historique"
 
-projection_df = forecast[["ds", "yhat"]].rename(columns={"yhat": "y"})
+# Les prédictions d'admissions sont déjà arrondies en entiers par le service
+projection_df = forecast[["ds", "y"]].copy()
 projection_df["type"] = "Projection"
 
-# Convertir les prédictions en entiers
-projection_df["y"] = projection_df["y"].round().astype(int)
-
 combined_df = pd.concat([historical_df, projection_df])
 
 # --------- AFFICHAGE DES PROJECTIONS ---------
-fig_forecast = px.line(
-    combined_df,
-    x="ds",
-    y="y",
-    color="type",
-    markers=True,
-    title="📈 Prédiction des Admissions Hospitalières",
-    labels={"y": "Nombre d'Admissions", "ds": "Date", "type": "Données"},
-    template="plotly_white",
-    color_discrete_map={"Historique": "blue", "Projection": "red"},
-)
+def figure_projection():
+    fig_forecast = px.line(
+        combined_df,
+        x="ds",
+        y="y",
+        color="type",
+        markers=True,
+        title="📈 Prédiction des Admissions Hospitalières",
+        labels={"y": "Nombre d'Admissions", "ds": "Date", "type": "Données"},
+        template="plotly_white",
+        color_discrete_map={"Historique": "blue", "Projection": "red"},
+    )
 
-fig_forecast.update_layout(
-    height=400,
-    margin=dict(l=20, r=20, t=50, b=30),
-    xaxis_title="",
-    yaxis_title="Admissions",
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-)
+    fig_forecast.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=50, b=30),
+        xaxis_title="",
+        yaxis_title="Admissions",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig_forecast
 
+
+fig_forecast = vue.figure("projection", figure_projection, *parametres.values())
+
+timer.etape("projection : affichage")
 st.plotly_chart(fig_forecast, use_container_width=True)
 
+timer.etape("projection : export")
 # --------- OPTION DE TÉLÉCHARGEMENT DES PROJECTIONS ---------
-csv_buffer = projection_df.to_csv(index=False).encode("utf-8")
-st.download_button(
-    label="📥 Télécharger les prédictions (CSV)",
-    data=csv_buffer,
-    file_name="predictions_admissions.csv",
-    mime="text/csv",
+bouton_export(
+    projection_df,
+    "predictions_admissions",
+    cle=("projection", version_donnees(), version_modeles(), *parametres.values()),
+    label="📥 Télécharger les prédictions",
 )
 
 
+timer.etape("effectifs : figures")
 # --------- SECTION 3: PRÉDICTION DES EFFECTIFS MÉDICAUX ---------
 st.subheader("📊 Prédiction des Effectifs Médicaux")
 
-# --------- CHARGEMENT DES MODÈLES ---------
-@st.cache_resource
-def load_personnel_models():
-    # Définir le dossier contenant les modèles
-    models_dir = Path(__file__).parent.parent / "models"
-
-    # Charger les modèles avec des chemins absolus
-    model_medecins = joblib.load(models_dir / "model_nb_medecins.pkl")
-    model_infirmiers = joblib.load(models_dir / "model_nb_infirmiers.pkl")
-    model_aides_soignants = joblib.load(models_dir / "model_nb_aides_soignants.pkl")
-
-    return model_medecins, model_infirmiers, model_aides_soignants
-
-model_medecins, model_infirmiers, model_aides_soignants = load_personnel_models()
-
-# --------- PRÉPARATION DES DONNÉES POUR LA PRÉDICTION ---------
-# On ajoute le nombre d'admissions prédites dans `future_df`
-future_df["Nombre_admissions"] = projection_df["y"]
-
-# Retirer la colonne "ds" avant la prédiction (XGBoost ne supporte pas les dates)
-future_df_xgb = future_df.drop(columns=["ds"], errors="ignore")
-
-# Récupération des features utilisées lors de l'entraînement
-expected_features = model_medecins.feature_names_in_
-
-# Réordonner les colonnes et supprimer celles qui ne sont pas nécessaires
-future_df_xgb = future_df_xgb[expected_features]
-
-# Prédiction des effectifs
-nb_medecins_pred = model_medecins.predict(future_df_xgb).round().astype(int)
-nb_infirmiers_pred = model_infirmiers.predict(future_df_xgb).round().astype(int)
-nb_aides_soignants_pred = model_aides_soignants.predict(future_df_xgb).round().astype(int)
-
-# Création du DataFrame des prédictions
+# Création du DataFrame des prédictions (effectifs calculés avec les admissions prédites)
 projection_personnel_df = projection_df.copy()
-projection_personnel_df["Nb_medecins"] = nb_medecins_pred
-projection_personnel_df["Nb_infirmiers"] = nb_infirmiers_pred
-projection_personnel_df["Nb_aides_soignants"] = nb_aides_soignants_pred
+for target in inference.STAFFING_TARGETS:
+    projection_personnel_df[target] = forecast[target].to_numpy()
 
 # --------- COMBINAISON AVEC DONNÉES HISTORIQUES ---------
 historical_personnel_df = df[["Date_admission", "Nombre_admissions", "Nb medecin", "Nb infirmier", "Nb aide soignant"]].rename(
@@ -344,62 +246,50 @@ combined_personnel_df = pd.concat([historical_personnel_df, projection_personnel
 # --------- AFFICHAGE DES PRÉDICTIONS ---------
 # Création des trois graphiques séparés
 
-fig_medecins = px.line(
-    combined_personnel_df,
-    x="ds",
-    y="Nb_medecins",
-    color="type",
-    markers=True,
-    title="📈 Prédiction du Nombre de Médecins",
-    labels={"ds": "Date", "Nb_medecins": "Nombre de Médecins"},
-    template="plotly_white",
-    color_discrete_map={"Historique": "blue", "Projection": "red"},
-)
+def figure_effectif(colonne, libelle):
+    return px.line(
+        combined_personnel_df,
+        x="ds",
+        y=colonne,
+        color="type",
+        markers=True,
+        title=f"📈 Prédiction du Nombre {libelle}",
+        labels={"ds": "Date", colonne: f"Nombre {libelle}"},
+        template="plotly_white",
+        color_discrete_map={"Historique": "blue", "Projection": "red"},
+    )
 
-fig_infirmiers = px.line(
-    combined_personnel_df,
-    x="ds",
-    y="Nb_infirmiers",
-    color="type",
-    markers=True,
-    title="📈 Prédiction du Nombre d'Infirmiers",
-    labels={"ds": "Date", "Nb_infirmiers": "Nombre d'Infirmiers"},
-    template="plotly_white",
-    color_discrete_map={"Historique": "blue", "Projection": "red"},
-)
 
-fig_aides_soignants = px.line(
-    combined_personnel_df,
-    x="ds",
-    y="Nb_aides_soignants",
-    color="type",
-    markers=True,
-    title="📈 Prédiction du Nombre d'Aides-Soignants",
-    labels={"ds": "Date", "Nb_aides_soignants": "Nombre d'Aides-Soignants"},
-    template="plotly_white",
-    color_discrete_map={"Historique": "blue", "Projection": "red"},
+fig_medecins = vue.figure("medecins", lambda: figure_effectif("Nb_medecins", "de Médecins"), *parametres.values())
+fig_infirmiers = vue.figure("infirmiers", lambda: figure_effectif("Nb_infirmiers", "d'Infirmiers"), *parametres.values())
+fig_aides_soignants = vue.figure(
+    "aides_soignants", lambda: figure_effectif("Nb_aides_soignants", "d'Aides-Soignants"), *parametres.values()
 )
 
+timer.etape("effectifs : affichage")
 # Affichage des graphiques dans trois colonnes
 
 st.plotly_chart(fig_medecins, use_container_width=True)
 st.plotly_chart(fig_infirmiers, use_container_width=True)
 st.plotly_chart(fig_aides_soignants, use_container_width=True)
 
+timer.etape("effectifs : tableau et export")
 # --------- AFFICHAGE DU TABLEAU DES PRÉDICTIONS ---------
 st.subheader("📋 Résumé des Prédictions")
 st.dataframe(projection_personnel_df, use_container_width=True)
 
 # --------- OPTION DE TÉLÉCHARGEMENT DES PRÉDICTIONS ---------
-csv_buffer = projection_personnel_df.to_csv(index=False).encode("utf-8")
-st.download_button(
-    label="📥 Télécharger les prédictions (CSV)",
-    data=csv_buffer,
-    file_name="predictions_personnel.csv",
-    mime="text/csv",
+bouton_export(
+    projection_personnel_df,
+    "predictions_personnel",
+    cle=("personnel", version_donnees(), version_modeles(), *parametres.values()),
+    label="📥 Télécharger les prédictions",
 )
 
 
 
+timer.etape("pied de page")
 # --- FOOTER ---
-st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
+
+timer.fin()
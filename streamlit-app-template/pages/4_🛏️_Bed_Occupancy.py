@@ -0,0 +1,146 @@
+import os
+import sys
+
+import streamlit as st
+
+# Ajout du chemin racine au path pour pouvoir importer utils et config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from page_shell import ouvrir_page
+
+# En-tête affiché avant d'importer les bibliothèques d'analyse et de charger les données
+timer = ouvrir_page(
+    "Bed Occupancy",
+    "Occupation des Lits",
+    "🛏️",
+    "🛏️ Occupation des Lits",
+    "Nombre de patients hospitalisés chaque jour, par service, reconstitué à partir de la date d'admission et de la durée de séjour estimée.",
+)
+
+timer.etape("imports")
+import pandas as pd
+import plotly.express as px
+
+import config
+from census import SERVICE, indicateurs_occupation
+from exports import bouton_export
+from loaders import get_admissions, get_recensement, version_donnees
+
+timer.etape("chargement")
+df = get_admissions()
+recensement = get_recensement()
+
+timer.etape("widgets de filtre")
+# Sidebar pour les filtres
+st.sidebar.header("Filtres d'Analyse")
+
+# Filtres pour la période
+start_date, end_date = st.sidebar.date_input(
+    "Période",
+    value=(df["Date_admission"].min().date(), df["Date_admission"].max().date()),
+    key="date_range_occupation",
+)
+
+# Filtre pour les services
+all_services = recensement.columns.tolist()
+selected_services = st.sidebar.multiselect(
+    "Sélectionner des services",
+    options=all_services,
+    default=all_services,
+    key="services_occupation",
+)
+
+timer.etape("filtrage")
+# Application des filtres : simple sélection de lignes et de colonnes du recensement
+recensement_filtre = recensement.loc[pd.to_datetime(start_date):pd.to_datetime(end_date), selected_services]
+occupation = indicateurs_occupation(recensement_filtre)
+
+timer.etape("indicateurs")
+# --------- SECTION 1: INDICATEURS ---------
+st.header("Vue d'ensemble")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.metric("Lits Occupés (dernier jour)", occupation["dernier_jour"])
+
+with col2:
+    st.metric("Lits Occupés par Jour (moyenne)", round(occupation["moyenne"]))
+
+with col3:
+    date_pic = f"le {occupation['date_pic']:%d/%m/%Y}" if occupation["date_pic"] else None
+    st.metric("Pic d'Occupation", occupation["pic"], help=date_pic)
+
+timer.etape("évolution : figure")
+# --------- SECTION 2: ÉVOLUTION PAR SERVICE ---------
+st.header("📈 Lits occupés par jour et par service")
+
+occupation_long = recensement_filtre.reset_index().melt(id_vars="Date", var_name=SERVICE, value_name="Lits occupés")
+fig_occupation = px.area(
+    occupation_long,
+    x="Date",
+    y="Lits occupés",
+    color=SERVICE,
+    labels={SERVICE: "Service"},
+    template=config.PLOT_CONFIG["template"],
+    color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
+)
+fig_occupation.update_layout(
+    height=450,
+    margin=dict(l=20, r=20, t=20, b=30),
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+)
+timer.etape("évolution : affichage")
+st.plotly_chart(fig_occupation, use_container_width=True)
+
+timer.etape("profil hebdomadaire : figure")
+# --------- SECTION 3: PROFIL HEBDOMADAIRE ---------
+st.header("📅 Occupation moyenne selon le jour de la semaine")
+
+jours_ordre = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+profil_hebdo = recensement_filtre.groupby(recensement_filtre.index.day_name()).mean().reindex(jours_ordre)
+profil_hebdo = profil_hebdo.rename_axis("Jour_semaine").reset_index().melt(
+    id_vars="Jour_semaine", var_name=SERVICE, value_name="Lits occupés"
+)
+fig_hebdo = px.bar(
+    profil_hebdo,
+    x="Jour_semaine",
+    y="Lits occupés",
+    color=SERVICE,
+    barmode="group",
+    labels={"Jour_semaine": "Jour de la semaine", SERVICE: "Service"},
+    template=config.PLOT_CONFIG["template"],
+    color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
+)
+fig_hebdo.update_layout(height=400, margin=dict(l=20, r=20, t=20, b=30))
+timer.etape("profil hebdomadaire : affichage")
+st.plotly_chart(fig_hebdo, use_container_width=True)
+
+timer.etape("synthèse et export")
+# --------- SECTION 4: SYNTHÈSE PAR SERVICE ---------
+st.header("🏥 Synthèse par service")
+
+synthese = pd.DataFrame(
+    {
+        "Moyenne": recensement_filtre.mean().round(1),
+        "Minimum": recensement_filtre.min(),
+        "Pic": recensement_filtre.max(),
+        "Date du pic": recensement_filtre.idxmax().dt.strftime("%d/%m/%Y") if len(recensement_filtre) else None,
+    }
+).rename_axis(SERVICE).reset_index()
+st.dataframe(synthese, hide_index=True, use_container_width=True)
+
+# Téléchargement du recensement filtré, produit au clic seulement
+bouton_export(
+    recensement_filtre,
+    "recensement_lits",
+    cle=(version_donnees(), start_date, end_date, selected_services),
+    label="Télécharger le recensement",
+    index=True,
+)
+
+
+timer.etape("pied de page")
+# --- FOOTER ---
+st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
+
+timer.fin()
@@ -0,0 +1,213 @@
+import os
+import sys
+
+import streamlit as st
+
+# Ajout du chemin racine au path pour pouvoir importer utils et config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from page_shell import ouvrir_page
+
+# En-tête affiché avant d'importer les bibliothèques d'analyse et de charger les données
+timer = ouvrir_page(
+    "Patients",
+    "Patients",
+    "🩺",
+    "🩺 Parcours des Patients",
+    "Historique des admissions d'un patient et taux de réadmission après la sortie, par service et par gravité.",
+)
+
+timer.etape("imports")
+import pandas as pd
+import plotly.express as px
+
+import config
+from census import SERVICE
+from exports import bouton_export
+from loaders import get_admissions, get_patient_index, version_donnees
+from patients import GRAVITE, PATIENT, SITE, est_readmission
+
+timer.etape("chargement")
+df = get_admissions()
+index_patients = get_patient_index()
+
+timer.etape("widgets de filtre")
+# Sidebar pour les filtres
+st.sidebar.header("Filtres d'Analyse")
+
+# Filtres pour la période
+start_date, end_date = st.sidebar.date_input(
+    "Période d'admission",
+    value=(df["Date_admission"].min().date(), df["Date_admission"].max().date()),
+    key="date_range_patients",
+)
+
+# Filtre pour les services
+all_services = index_patients.modalites[0].tolist()
+selected_services = st.sidebar.multiselect(
+    "Sélectionner des services",
+    options=all_services,
+    default=all_services,
+    key="services_patients",
+)
+
+# Filtre pour la gravité
+all_gravites = index_patients.modalites[1].tolist()
+selected_gravites = st.sidebar.multiselect(
+    "Sélectionner la gravité",
+    options=all_gravites,
+    default=all_gravites,
+    key="gravites_patients",
+)
+
+# Délai de réadmission
+jours_readmission = st.sidebar.slider(
+    "Réadmission : jours après la sortie",
+    min_value=1,
+    max_value=90,
+    value=config.PATIENTS["readmission_days"],
+    key="jours_readmission",
+)
+
+timer.etape("filtrage")
+# Masque des admissions sélectionnées (services et gravités comparés sur les codes de l'index) :
+# les calculs par patient se font ensuite sur les tableaux de l'index
+dates = df["Date_admission"].to_numpy()
+masque = (
+    (dates >= pd.to_datetime(start_date).to_datetime64())
+    & (dates <= pd.to_datetime(end_date).to_datetime64())
+    & index_patients.selection(SERVICE, selected_services)
+    & index_patients.selection(GRAVITE, selected_gravites)
+)
+
+timer.etape("réadmissions")
+# --------- SECTION 1: RÉADMISSIONS ---------
+st.header(f"🔁 Réadmissions à {jours_readmission} jours")
+
+readmissions = index_patients.readmissions(masque, jours_readmission)
+total_admissions = int(readmissions["Admissions"].sum())
+total_readmissions = int(readmissions["Réadmissions"].sum())
+
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("Admissions", int(masque.sum()))
+
+with col2:
+    st.metric("Patients Distincts", index_patients.nb_patients_distincts(masque))
+
+with col3:
+    st.metric("Réadmissions", total_readmissions)
+
+with col4:
+    taux = round(100 * total_readmissions / total_admissions, 2) if total_admissions else 0
+    st.metric(
+        "Taux de Réadmission",
+        f"{taux} %",
+        help=f"Sur {total_admissions} admissions dont les {jours_readmission} jours suivant la sortie sont observés",
+    )
+
+timer.etape("réadmissions : figure")
+taux_pivot = readmissions.pivot(index=SERVICE, columns=GRAVITE, values="Taux (%)")
+taux_pivot = taux_pivot.reindex(columns=[gravite for gravite in all_gravites if gravite in taux_pivot.columns])
+
+fig_readmissions = px.imshow(
+    taux_pivot.values,
+    labels=dict(x="Gravité", y="Service", color="Taux (%)"),
+    x=taux_pivot.columns,
+    y=taux_pivot.index,
+    color_continuous_scale="Blues",
+    text_auto=True,
+    aspect="auto",
+)
+fig_readmissions.update_layout(height=450, margin=dict(l=20, r=20, t=20, b=30))
+
+timer.etape("réadmissions : affichage")
+st.plotly_chart(fig_readmissions, use_container_width=True)
+
+with st.expander("Détail par service et gravité"):
+    st.dataframe(readmissions, hide_index=True, use_container_width=True)
+
+    # Téléchargement du tableau des réadmissions, produit au clic seulement
+    bouton_export(
+        readmissions,
+        "readmissions",
+        cle=(version_donnees(), start_date, end_date, selected_services, selected_gravites, jours_readmission),
+        label="Télécharger les réadmissions",
+    )
+
+timer.etape("historique du patient")
+# --------- SECTION 2: HISTORIQUE D'UN PATIENT ---------
+st.header("🧾 Historique d'un patient")
+
+# Patients les plus fréquemment admis sur la sélection, pour amorcer la recherche
+frequents = index_patients.plus_frequents(config.PATIENTS["top_patients"], masque)
+
+col_recherche, col_frequents = st.columns([1, 2])
+
+with col_recherche:
+    # Plusieurs sites : les identifiants ne sont uniques que dans un site
+    if SITE in index_patients.cles:
+        sites = index_patients.patients.levels[0].tolist()
+        site = st.selectbox(
+            "Site",
+            options=sites,
+            index=sites.index(frequents[SITE].iloc[0]) if len(frequents) else 0,
+            key="patient_site",
+        )
+    identifiant = st.number_input(
+        "Identifiant du patient",
+        min_value=0,
+        value=int(frequents[PATIENT].iloc[0]) if len(frequents) else 0,
+        step=1,
+        key="patient_id",
+    )
+    patient = (site, identifiant) if SITE in index_patients.cles else identifiant
+
+with col_frequents:
+    with st.expander("Patients les plus fréquemment admis"):
+        st.dataframe(frequents, hide_index=True, use_container_width=True)
+
+historique = index_patients.historique(df, patient)
+
+if historique.empty:
+    st.info(f"Aucune admission pour le patient {identifiant}.")
+else:
+    col5, col6, col7 = st.columns(3)
+
+    with col5:
+        st.metric("Admissions", len(historique))
+
+    with col6:
+        st.metric("Jours d'Hospitalisation", int(historique["Durée du séjour estimé"].sum()))
+
+    with col7:
+        readmis = int(est_readmission(historique["Délai avant réadmission (j)"], jours_readmission).sum())
+        st.metric(f"Réadmissions à {jours_readmission} jours", readmis)
+
+    timer.etape("historique du patient : figure")
+    # Séjours du patient sur une frise : de l'admission à la sortie, par service
+    fig_parcours = px.timeline(
+        historique,
+        x_start="Date_admission",
+        x_end="Sortie",
+        y=SERVICE,
+        color=GRAVITE,
+        hover_data=["Motif d'admission", "Type d'hospitalisation", "Durée du séjour estimé"],
+        template=config.PLOT_CONFIG["template"],
+        color_discrete_sequence=config.PLOT_CONFIG["color_discrete_sequence"],
+    )
+    fig_parcours.update_layout(height=300, margin=dict(l=20, r=20, t=20, b=30), yaxis_title="")
+    st.plotly_chart(fig_parcours, use_container_width=True)
+
+    colonnes = [
+        "Date_heure_admission", "Sortie", SERVICE, GRAVITE, "Motif d'admission", "Mode d'arrivée",
+        "Type d'hospitalisation", "Durée du séjour estimé", "Délai avant réadmission (j)",
+    ]
+    st.dataframe(historique[[colonne for colonne in colonnes if colonne in historique]], hide_index=True, use_container_width=True)
+
+
+timer.etape("pied de page")
+# --- FOOTER ---
+st.markdown("<div class='footer'>© 2024 - Hôpitaux Universitaires | Tous droits réservés</div>", unsafe_allow_html=True)
+
+timer.fin()
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from census import SERVICE, intervalles_sejour
+
+PATIENT = "ID_patient"
+SITE = "Site"
+HORODATAGE = "Date_heure_admission"
+GRAVITE = "Gravité"
+
+
+def est_readmission(delai, jours):
+    """Délais (jours entre une sortie et l'admission suivante) qui font une réadmission à `jours` jours.
+    Un délai négatif vient de séjours qui se chevauchent : ce n'est pas une réadmission."""
+    delai = np.asarray(delai)
+    return (delai >= 0) & (delai <= jours)
+
+
+class PatientIndex:
+    """Index des admissions par patient, construit une fois au chargement.
+
+    Les positions des lignes sont rangées patient par patient, chacun trié par horodatage
+    d'admission : l'historique d'un patient est la tranche contiguë `positions[debuts[k]:debuts[k + 1]]`,
+    et la table de hachage de `patients` (pd.Index) donne `k` à partir de l'identifiant. Avec une
+    colonne `Site` (plusieurs sites chargés), un patient est le couple (site, identifiant) : les
+    identifiants ne sont uniques que dans un site, et `patients` est alors un pd.MultiIndex. Le délai
+    entre la sortie de chaque admission et l'admission suivante du même patient est calculé dans le
+    même ordre (tri + décalage), sans boucle par patient.
+
+    L'index ne conserve que des tableaux (positions, codes, sorties, délais), pas le DataFrame :
+    l'historique d'un patient se lit dans le jeu d'admissions passé à `historique`, celui qui a
+    servi à construire l'index.
+    """
+
+    def __init__(self, df, par=(SERVICE, GRAVITE)):
+        self.par = list(par)
+        self.cles = [SITE, PATIENT] if SITE in df else [PATIENT]
+        codes_cles = [pd.factorize(df[colonne], sort=True)[0] for colonne in self.cles]
+        colonne_temps = HORODATAGE if HORODATAGE in df else "Date_admission"
+        self.positions = np.lexsort((df[colonne_temps].to_numpy(), *reversed(codes_cles)))
+
+        nouveau = np.zeros(len(self.positions), dtype=bool)
+        nouveau[:1] = True
+        for code in codes_cles:
+            code_trie = code[self.positions]
+            nouveau[1:] |= code_trie[1:] != code_trie[:-1]
+        self.debuts = np.r_[np.flatnonzero(nouveau), len(self.positions)]
+        cles = df[self.cles].iloc[self.positions[nouveau]]
+        self.patients = pd.MultiIndex.from_frame(cles) if len(self.cles) > 1 else pd.Index(cles[PATIENT].to_numpy(), name=PATIENT)
+
+        # Numéro de patient (0..nb_patients-1) de chaque ligne, dans l'ordre du DataFrame
+        self.code_patient = np.empty(len(self.positions), dtype=np.int64)
+        self.code_patient[self.positions] = np.cumsum(nouveau) - 1
+
+        # Sortie = lendemain du dernier jour d'hospitalisation (census.intervalles_sejour)
+        admission, self.sortie = intervalles_sejour(df)
+        self.fin_observation = admission.max() if len(admission) else np.datetime64("today", "D")
+
+        # Jours entre la sortie et l'admission suivante du même patient (NaN pour la dernière admission)
+        delai_trie = np.full(len(self.positions), np.nan, dtype=np.float32)
+        meme_patient = ~nouveau[1:]
+        ecart = (admission[self.positions][1:] - self.sortie[self.positions][:-1]).astype(np.float32)
+        delai_trie[:-1][meme_patient] = ecart[meme_patient]
+        self.delai = np.empty_like(delai_trie)
+        self.delai[self.positions] = delai_trie
+
+        # Groupes de `par` (ex. service x gravité) codés une fois pour des agrégats par bincount
+        self.codes, self.modalites = zip(*(pd.factorize(df[colonne], sort=True, use_na_sentinel=False) for colonne in self.par))
+        self.groupe = np.zeros(len(df), dtype=np.int64)
+        for code, modalites in zip(self.codes, self.modalites):
+            self.groupe = self.groupe * len(modalites) + code
+
+    @property
+    def nb_patients(self):
+        return len(self.patients)
+
+    def selection(self, colonne, valeurs):
+        """Masque des lignes dont `colonne` (une colonne de `par`) prend l'une des `valeurs`, sur les codes entiers"""
+        i = self.par.index(colonne)
+        retenues = self.modalites[i].get_indexer(list(valeurs))
+        return np.isin(self.codes[i], retenues[retenues >= 0])
+
+    def lignes(self, patient):
+        """Positions des admissions de `patient` (identifiant, ou couple (site, identifiant) avec
+        plusieurs sites), dans l'ordre chronologique (vide si inconnu)"""
+        k = self.patients.get_indexer([patient])[0]
+        if k < 0:
+            return self.positions[:0]
+        return self.positions[self.debuts[k]:self.debuts[k + 1]]
+
+    def historique(self, df, patient):
+        """Admissions de `patient` dans `df` avec leur date de sortie et le délai avant l'admission suivante"""
+        lignes = self.lignes(patient)
+        return df.iloc[lignes].assign(
+            Sortie=pd.to_datetime(self.sortie[lignes]),
+            **{"Délai avant réadmission (j)": self.delai[lignes]},
+        )
+
+    def plus_frequents(self, n=20, masque=None):
+        """Patients ayant le plus d'admissions (parmi les lignes de `masque`)"""
+        if masque is None:
+            comptes = np.diff(self.debuts)
+        else:
+            comptes = np.bincount(self.code_patient[np.asarray(masque)], minlength=self.nb_patients)
+        n = min(n, len(comptes))
+        if n == 0:
+            return pd.DataFrame({colonne: [] for colonne in [*self.cles, "Admissions"]})
+        meilleurs = np.argpartition(-comptes, n - 1)[:n]
+        # À égalité, ordre des clés : `patients` est trié par site puis identifiant
+        meilleurs = meilleurs[np.lexsort((meilleurs, -comptes[meilleurs]))]
+        return self.patients[meilleurs].to_frame(index=False).assign(Admissions=comptes[meilleurs])
+
+    def nb_patients_distincts(self, masque):
+        return int(np.count_nonzero(np.bincount(self.code_patient[np.asarray(masque)], minlength=self.nb_patients)))
+
+    def readmissions(self, masque=None, jours=30):
+        """Taux de réadmission à `jours` jours des admissions de `masque`, par groupe de `par`.
+
+        Une admission est suivie d'une réadmission si le même patient est admis entre sa sortie et
+        `jours` jours après (`est_readmission`), y compris après la fin de la période sélectionnée. Seules les
+        admissions dont ces `jours` jours sont entièrement observés dans les données sont comptées.
+        """
+        eligibles = self.sortie + np.timedelta64(int(jours), "D") <= self.fin_observation
+        if masque is not None:
+            eligibles &= np.asarray(masque)
+        readmis = eligibles & est_readmission(self.delai, jours)
+
+        taille = int(np.prod([len(modalites) for modalites in self.modalites]))
+        admissions = np.bincount(self.groupe[eligibles], minlength=taille)
+        readmissions = np.bincount(self.groupe[readmis], minlength=taille)
+        groupes = pd.MultiIndex.from_product(self.modalites, names=self.par).to_frame(index=False)
+        resultat = groupes.assign(Admissions=admissions, Réadmissions=readmissions)
+        resultat = resultat[resultat["Admissions"] > 0].reset_index(drop=True)
+        resultat["Taux (%)"] = (100 * resultat["Réadmissions"] / resultat["Admissions"]).round(2)
+        return resultat
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Indicateurs indexés par défaut sur le jeu journalier (`load_data3`)
+DEFAULT_METRICS = [
+    "Nombre_admissions", "Lits occupes", "Materiel utilise", "Température",
+    "Nb medecin", "Nb infirmier", "Nb aide soignant",
+]
+
+# Colonne ajoutée aux résultats : nombre de jours couverts par la fenêtre
+NB_JOURS = "Nb_jours"
+
+
+class DailyRangeIndex:
+    """Sommes cumulées du jeu journalier, ventilées par événement spécial et par saison.
+
+    Le total d'un indicateur sur une période s'obtient par deux recherches dichotomiques
+    et une soustraction, quelle que soit la longueur de l'historique.
+    """
+
+    def __init__(self, daily_df, metrics=None, date_column="Date_admission",
+                 event_column="Evenement_Special", season_column="Saison"):
+        daily_df = daily_df.sort_values(date_column)
+        self.metrics = list(metrics or DEFAULT_METRICS)
+        self.dtypes = {metric: daily_df[metric].dtype for metric in self.metrics}
+        self.dates = pd.to_datetime(daily_df[date_column]).to_numpy()
+
+        # Catégories (triées) et code de chaque jour
+        event_codes, self.events = pd.factorize(daily_df[event_column].astype(str), sort=True)
+        season_codes, self.seasons = pd.factorize(daily_df[season_column].astype(str), sort=True)
+
+        # Valeurs journalières réparties dans la case (événement, saison) du jour, puis cumulées
+        n = len(daily_df)
+        values = np.column_stack([daily_df[self.metrics].fillna(0).to_numpy(dtype=np.float64), np.ones(n)])
+        split = np.zeros((n + 1, len(self.events), len(self.seasons), values.shape[1]))
+        split[np.arange(1, n + 1), event_codes, season_codes] = values
+        self.cumsums = np.cumsum(split, axis=0)
+
+    def _window(self, start, end):
+        """Sommes sur [start, end] par (événement, saison, indicateur)"""
+        i = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), side="left")
+        j = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), side="right")
+        return self.cumsums[max(j, i)] - self.cumsums[i]
+
+    def _season_mask(self, saisons):
+        if saisons is None:
+            return np.ones(len(self.seasons), dtype=bool)
+        return np.isin(self.seasons, list(saisons))
+
+    def _to_frame(self, sums, index):
+        frame = pd.DataFrame(sums, columns=[*self.metrics, NB_JOURS], index=index)
+        frame[NB_JOURS] = frame[NB_JOURS].astype(int)
+        for metric, dtype in self.dtypes.items():
+            if pd.api.types.is_integer_dtype(dtype):
+                frame[metric] = frame[metric].round().astype(dtype)
+        return frame
+
+    def totals(self, start, end, saisons=None):
+        """Totaux des indicateurs sur la période (et les saisons choisies), avec le nombre de jours"""
+        sums = self._window(start, end)[:, self._season_mask(saisons)].sum(axis=(0, 1))
+        return self._to_frame(sums[np.newaxis], index=[0]).iloc[0]
+
+    def by_event(self, start, end, saisons=None):
+        """Totaux par événement spécial sur la période ; seuls les événements présents sont retournés"""
+        sums = self._window(start, end)[:, self._season_mask(saisons)].sum(axis=1)
+        frame = self._to_frame(sums, index=pd.Index(self.events, name="Evenement_Special"))
+        return frame[frame[NB_JOURS] > 0]
+
+    def by_season(self, start, end, saisons=None):
+        """Totaux par saison sur la période ; seules les saisons présentes sont retournées"""
+        mask = self._season_mask(saisons)
+        sums = self._window(start, end)[:, mask].sum(axis=0)
+        frame = self._to_frame(sums, index=pd.Index(self.seasons[mask], name="Saison"))
+        return frame[frame[NB_JOURS] > 0]
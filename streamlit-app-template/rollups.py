@@ -0,0 +1,115 @@
+import pandas as pd
+
+from utils import JOURS_ORDRE, MOIS_ORDRE
+
+NIVEAUX = ["jour", "semaine", "mois", "annee"]
+
+# Libellés des périodes, formatés une fois par période et non par ligne
+FORMATS_LIBELLES = {"jour": "%Y-%m-%d", "semaine": "%G-S%V", "mois": "%Y-%m", "annee": "%Y"}
+
+# Attributs calendaires portés par chaque niveau
+ATTRIBUTS = {
+    "jour": ["Jour_semaine", "Mois", "Annee"],
+    "semaine": [],
+    "mois": ["Mois", "Annee"],
+    "annee": ["Annee"],
+}
+
+# Niveau le plus grossier qui porte chaque attribut calendaire
+NIVEAU_ATTRIBUT = {"Jour_semaine": "jour", "Mois": "mois", "Annee": "annee"}
+
+
+def _debuts(dates):
+    """Début de la semaine, du mois et de l'année de chaque date"""
+    return {
+        "semaine": dates - pd.to_timedelta(dates.dt.weekday, unit="D"),
+        "mois": dates.dt.to_period("M").dt.to_timestamp(),
+        "annee": dates.dt.to_period("Y").dt.to_timestamp(),
+    }
+
+
+def _fins(niveau, debuts):
+    if niveau == "jour":
+        return debuts
+    if niveau == "semaine":
+        return debuts + pd.Timedelta(days=6)
+    if niveau == "mois":
+        return debuts + pd.offsets.MonthEnd(0)
+    return debuts + pd.offsets.YearEnd(0)
+
+
+def _attributs(table, niveau):
+    """Ajoute la fin de période, le libellé et les attributs calendaires à une table agrégée"""
+    periodes = table["Période"]
+    table["Fin"] = _fins(niveau, periodes)
+    uniques = periodes.drop_duplicates()
+    table["Libellé"] = periodes.map(dict(zip(uniques, uniques.dt.strftime(FORMATS_LIBELLES[niveau]))))
+    if "Jour_semaine" in ATTRIBUTS[niveau]:
+        table["Jour_semaine"] = pd.Categorical(periodes.dt.day_name(), categories=JOURS_ORDRE, ordered=True)
+    if "Mois" in ATTRIBUTS[niveau]:
+        table["Mois"] = pd.Categorical(periodes.dt.month_name(), categories=MOIS_ORDRE, ordered=True)
+    if "Annee" in ATTRIBUTS[niveau]:
+        table["Annee"] = periodes.dt.year
+    return table
+
+
+class TimeRollups:
+    """Agrégats matérialisés jour -> semaine -> mois -> année d'une table journalière.
+
+    Les semaines et les mois sont calculés à partir des jours, les années à partir des mois.
+    Une requête sur une fenêtre de dates lit les périodes entièrement couvertes dans le niveau
+    matérialisé et ne réagrège, à partir des jours, que les périodes coupées par la fenêtre.
+    """
+
+    def __init__(self, daily, mesures, cles=(), date_column="Date_admission"):
+        self.mesures = list(mesures)
+        self.cles = list(cles)
+        jours = daily.assign(**{"Période": pd.to_datetime(daily[date_column]).dt.normalize()})
+        jours = jours.groupby(["Période", *self.cles], observed=True, sort=True)[self.mesures].sum().reset_index()
+        for niveau, debuts in _debuts(jours["Période"]).items():
+            jours[f"_{niveau}"] = debuts
+
+        self.niveaux = {"jour": _attributs(jours, "jour")}
+        self.niveaux["semaine"] = self._agreger(jours, "semaine")
+        self.niveaux["mois"] = self._agreger(jours, "mois")
+        self.niveaux["annee"] = self._agreger(self.niveaux["mois"].rename(columns={"_annee_mois": "_annee"}), "annee")
+
+    def _agreger(self, table, niveau):
+        colonnes = [f"_{niveau}", *self.cles]
+        agregat = table.groupby(colonnes, observed=True, sort=True)[self.mesures].sum().reset_index()
+        agregat = agregat.rename(columns={f"_{niveau}": "Période"})
+        if niveau == "mois":
+            # Début d'année de chaque mois, pour construire le niveau année à partir des mois
+            agregat["_annee_mois"] = agregat["Période"].dt.to_period("Y").dt.to_timestamp()
+        return _attributs(agregat, niveau)
+
+    def _filtrer(self, table, filtres):
+        for colonne, valeurs in filtres.items():
+            table = table[table[colonne].isin(list(valeurs))]
+        return table
+
+    def niveau(self, niveau, start=None, end=None, par=(), **filtres):
+        """Sommes des mesures par période du niveau (et par clés `par`), sur [start, end] et les filtres de clés"""
+        table = self._filtrer(self.niveaux[niveau], filtres)
+        if start is not None or end is not None:
+            start = pd.Timestamp(start) if start is not None else self.niveaux["jour"]["Période"].min()
+            end = pd.Timestamp(end) if end is not None else self.niveaux["jour"]["Période"].max()
+            entieres = table[(table["Période"] >= start) & (table["Fin"] <= end)]
+            if niveau != "jour":
+                # Périodes coupées par la fenêtre : réagrégées à partir des jours concernés
+                jours = self._filtrer(self.niveaux["jour"], filtres)
+                jours = jours[(jours["Période"] >= start) & (jours["Période"] <= end)]
+                coupes = jours[~jours[f"_{niveau}"].isin(entieres["Période"])]
+                if len(coupes):
+                    entieres = pd.concat([entieres, self._agreger(coupes, niveau)], ignore_index=True)
+            table = entieres
+
+        colonnes = ["Période", "Libellé", *ATTRIBUTS[niveau], *par]
+        return table.groupby(colonnes, observed=True, sort=True)[self.mesures].sum().reset_index()
+
+    def par(self, attribut, start=None, end=None, by=(), **filtres):
+        """Sommes par attribut calendaire (Jour_semaine, Mois, Annee) ou par clé, lues au niveau le plus grossier possible"""
+        niveau = NIVEAU_ATTRIBUT.get(attribut, "annee")
+        par = [colonne for colonne in [attribut, *by] if colonne not in ATTRIBUTS[niveau]]
+        table = self.niveau(niveau, start, end, par=par, **filtres)
+        return table.groupby([attribut, *by], observed=True, sort=True)[self.mesures].sum().reset_index()
@@ -0,0 +1,109 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from census import SERVICE
+
+GRAVITE = "Gravité"
+
+
+class EchantillonStratifie:
+    """Échantillon aléatoire stratifié des admissions, tiré une fois au chargement.
+
+    Les strates croisent `par` (ex. service x gravité) et le mois d'admission. Chaque strate reçoit
+    une part du budget `taille` proportionnelle à son effectif, et au moins `min_par_strate` lignes
+    (ou toutes si elle en compte moins) : les petites strates restent représentées. Chaque ligne
+    porte le poids de sondage N_h / n_h de sa strate ; les totaux pondérés sont sans biais et leur
+    variance suit la formule de l'échantillonnage stratifié sans remise.
+    """
+
+    def __init__(self, df, taille, par=(SERVICE, GRAVITE), min_par_strate=30, seed=0):
+        cles = [df[colonne] for colonne in par]
+        cles.append(df["Date_admission"].to_numpy().astype("datetime64[M]"))
+        strate = np.zeros(len(df), dtype=np.int64)
+        for cle in cles:
+            codes, modalites = pd.factorize(cle, use_na_sentinel=False)
+            strate = strate * len(modalites) + codes
+        strate, _ = pd.factorize(strate)
+
+        self.effectifs = np.bincount(strate).astype(np.float64)
+        self.tailles = np.minimum(
+            np.maximum(np.round(taille * self.effectifs / max(len(df), 1)), min_par_strate),
+            self.effectifs,
+        )
+
+        # Tirage sans remise dans chaque strate : les `n_h` premières lignes d'un ordre aléatoire
+        rng = np.random.default_rng(seed)
+        ordre = np.lexsort((rng.random(len(df)), strate))
+        debuts = np.r_[0, np.cumsum(self.effectifs)[:-1]].astype(np.int64)
+        rang = np.arange(len(df)) - debuts[strate[ordre]]
+        self.lignes = np.sort(ordre[rang < self.tailles[strate[ordre]]])
+
+        self.df = df.iloc[self.lignes].reset_index(drop=True)
+        self.strate = strate[self.lignes]
+        self.poids = (self.effectifs / self.tailles)[self.strate]
+        self.nb_lignes_source = len(df)
+
+    def __len__(self):
+        return len(self.df)
+
+    def ecart_type_total(self, y):
+        """Écart-type de l'estimation du total de `y` (une valeur par ligne de l'échantillon)"""
+        y = np.asarray(y, dtype=np.float64)
+        n, effectifs = self.tailles, self.effectifs
+        somme = np.bincount(self.strate, weights=y, minlength=len(n))
+        carres = np.bincount(self.strate, weights=y * y, minlength=len(n))
+        variance_strate = np.zeros_like(n)
+        plusieurs = n > 1
+        variance_strate[plusieurs] = (carres[plusieurs] - somme[plusieurs] ** 2 / n[plusieurs]) / (n[plusieurs] - 1)
+        variance = effectifs**2 * (1 - n / effectifs) * np.maximum(variance_strate, 0) / n
+        return float(np.sqrt(variance.sum()))
+
+    def total(self, y):
+        """Total estimé de `y` et son écart-type"""
+        y = np.asarray(y, dtype=np.float64)
+        return float(np.dot(self.poids, y)), self.ecart_type_total(y)
+
+    def ratio(self, y, x):
+        """Rapport estimé total(y) / total(x) (ex. une moyenne sur un sous-ensemble) et son écart-type,
+        par linéarisation"""
+        y = np.asarray(y, dtype=np.float64)
+        x = np.asarray(x, dtype=np.float64)
+        total_x = float(np.dot(self.poids, x))
+        if total_x == 0:
+            return np.nan, np.nan
+        rapport = float(np.dot(self.poids, y)) / total_x
+        return rapport, self.ecart_type_total((y - rapport * x) / total_x)
+
+
+def quantile_normal(confiance):
+    """Multiplicateur de l'écart-type pour un intervalle de confiance bilatéral au niveau `confiance`"""
+    return NormalDist().inv_cdf((1 + confiance) / 2)
+
+
+def arrondi_marge(marge):
+    """Marge d'erreur arrondie à deux chiffres significatifs"""
+    if not np.isfinite(marge) or marge == 0:
+        return 0
+    arrondie = float(f"{marge:.2g}")
+    return int(arrondie) if arrondie >= 10 else arrondie
+
+
+def effectifs(df, colonnes, poids=None):
+    """Admissions par combinaison de `colonnes` ; avec `poids`, effectifs estimés d'un échantillon"""
+    if poids is None:
+        return df.groupby(colonnes, observed=True).size()
+    return pd.Series(poids, index=df.index).groupby([df[colonne] for colonne in colonnes], observed=True).sum()
+
+
+def moyennes(df, colonnes, valeur, poids=None):
+    """Moyenne de `valeur` par combinaison de `colonnes`, pondérée par `poids` s'ils sont donnés"""
+    if poids is None:
+        return df.groupby(colonnes, observed=True)[valeur].mean()
+    valeurs = df[valeur].to_numpy(dtype=np.float64)
+    presents = ~np.isnan(valeurs)
+    groupes = [df[colonne] for colonne in colonnes]
+    sommes = pd.Series(np.where(presents, poids * valeurs, 0), index=df.index).groupby(groupes, observed=True).sum()
+    comptes = pd.Series(np.where(presents, poids, 0), index=df.index).groupby(groupes, observed=True).sum()
+    return (sommes / comptes).rename(valeur)
@@ -0,0 +1,370 @@
+"""Instantanés pré-calculés des vues par défaut : figures Plotly (JSON) et indicateurs de chaque page.
+
+Usage :
+    python snapshots.py                                  # préréglages de config.SNAPSHOTS, régénération incrémentale
+    python snapshots.py --force                          # tout régénérer (ex. après un déploiement)
+    python snapshots.py --pages Home.py --presets defaut
+
+Chaque page est exécutée avec `AppTest` pour chaque préréglage (période et valeurs de widgets), en
+mode capture : les figures et valeurs construites par la page via `Vue.figure` et `Vue.valeurs`
+sont enregistrées avec l'état des filtres qui les a produites. Quand les filtres d'une session
+correspondent à un instantané de la même version des données, la page le sert sans rien recalculer ;
+sinon elle calcule en direct, comme avant.
+
+La régénération est incrémentale : l'empreinte de chaque jour d'admissions est conservée dans le
+manifeste, et seuls les préréglages dont la fenêtre couvre un jour modifié (ou dont la fenêtre a
+bougé) sont recalculés. Prévu pour tourner chaque nuit, ex. `0 3 * * * python snapshots.py`.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from io import StringIO
+from pathlib import Path
+
+import config
+
+APP_DIR = Path(__file__).parent
+
+# Pages servies par instantanés : nom dans les instantanés, clé du widget de période, et dépendances
+# au-delà de la fenêtre (`historique` : figures ou indicateurs calculés sur tout l'historique,
+# `modeles` : prévisions des modèles entraînés). L'occupation des lits n'a pas de vue par défaut figée
+# (date de référence glissante) et reste calculée en direct.
+PAGES = {
+    "Home.py": {"nom": "Home", "periode": "date_range_home", "historique": True},
+    "pages/1_📊_Exploratory_Analysis.py": {"nom": "Exploratory Analysis", "periode": "date_range_explore"},
+    "pages/2_📈_Advanced_Visualizations.py": {"nom": "Advanced Visualizations", "periode": "date_range_explore"},
+    "pages/3_🔮_Predictions.py": {"nom": "Predictions", "periode": "date_range_pred", "historique": True, "modeles": True},
+}
+
+# Capture en cours (exécution par ce script), None pendant le service normal
+_capture = None
+
+_verrou = threading.Lock()
+_manifeste = {"mtime": None, "contenu": {}}
+
+
+def dossier_instantanes():
+    return APP_DIR / config.SNAPSHOTS["dir"]
+
+
+def _normaliser(valeur):
+    # Sélections multiples : l'ordre de sélection ne change pas la vue
+    if isinstance(valeur, dict):
+        return {str(cle): _normaliser(v) for cle, v in valeur.items()}
+    if isinstance(valeur, (list, set, frozenset)):
+        return sorted((_normaliser(v) for v in valeur), key=repr)
+    if isinstance(valeur, tuple):
+        return [_normaliser(v) for v in valeur]
+    if hasattr(valeur, "isoformat"):
+        return valeur.isoformat()
+    if hasattr(valeur, "item"):
+        return valeur.item()
+    return valeur
+
+
+def _cle(*valeurs):
+    return json.dumps(_normaliser(valeurs), sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _encoder(valeur):
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(valeur, pd.DataFrame):
+        return {"__dataframe__": valeur.to_json(orient="table", date_format="iso")}
+    if isinstance(valeur, (datetime, date)):
+        return {"__date__": valeur.isoformat()}
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    raise TypeError(f"Valeur non sérialisable dans un instantané : {type(valeur).__name__}")
+
+
+def _decoder(objet):
+    if "__dataframe__" in objet:
+        import pandas as pd
+
+        return pd.read_json(StringIO(objet["__dataframe__"]), orient="table")
+    if "__date__" in objet:
+        import pandas as pd
+
+        return pd.Timestamp(objet["__date__"])
+    return objet
+
+
+class Vue:
+    """Figures et valeurs d'une page : servies depuis l'instantané quand il existe, calculées sinon"""
+
+    def __init__(self, contenu=None, capture=None):
+        self.contenu = contenu
+        self.capture = capture
+
+    @property
+    def servie(self):
+        return self.contenu is not None
+
+    def figure(self, nom, construire, *dependances):
+        """Figure `nom` ; `dependances` : widgets de la page qui la modifient en plus des filtres"""
+        cle = _cle(nom, *dependances)
+        if self.contenu is not None and cle in self.contenu["figures"]:
+            import plotly.graph_objects as go
+
+            # Figure déjà validée à la capture ; Streamlit la revalide à l'affichage
+            return go.Figure(json.loads(self.contenu["figures"][cle]), _validate=False)
+        fig = construire()
+        if self.capture is not None:
+            self.capture["figures"][cle] = fig.to_json()
+        return fig
+
+    def valeurs(self, nom, calculer, *dependances):
+        """Indicateurs `nom` (scalaires, dictionnaires, dates ou DataFrame)"""
+        cle = _cle(nom, *dependances)
+        if self.contenu is not None and cle in self.contenu["valeurs"]:
+            return json.loads(self.contenu["valeurs"][cle], object_hook=_decoder)
+        valeur = calculer()
+        if self.capture is not None:
+            self.capture["valeurs"][cle] = json.dumps(valeur, default=_encoder, ensure_ascii=False)
+        return valeur
+
+
+def _lire_manifeste():
+    chemin = dossier_instantanes() / "manifest.json"
+    try:
+        mtime = chemin.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    with _verrou:
+        if _manifeste["mtime"] != mtime:
+            _manifeste["contenu"] = json.loads(chemin.read_text(encoding="utf-8"))
+            _manifeste["mtime"] = mtime
+        return _manifeste["contenu"]
+
+
+@lru_cache(maxsize=64)
+def _lire_instantane(fichier):
+    # Les fichiers sont nommés par empreinte : un nom ne désigne jamais deux contenus différents
+    return json.loads((dossier_instantanes() / fichier).read_text(encoding="utf-8"))
+
+
+def vue(page, **etat):
+    """Vue de `page` pour l'état des filtres `etat` (valeurs des widgets qui déterminent la page)"""
+    if _capture is not None:
+        _capture.update(page=page, etat=_cle(etat))
+        return Vue(capture=_capture)
+    if not config.SNAPSHOTS["enabled"]:
+        return Vue()
+
+    from loaders import version_donnees
+
+    manifeste = _lire_manifeste()
+    if not manifeste or manifeste.get("version") != list(version_donnees()):
+        return Vue()
+    cle_etat = _cle(etat)
+    for entree in manifeste["instantanes"].get(page, {}).values():
+        if entree["etat"] == cle_etat:
+            try:
+                contenu = _lire_instantane(entree["fichier"])
+            except FileNotFoundError:
+                return Vue()
+
+            import streamlit as st
+
+            st.sidebar.caption(f"⚡ Vue pré-calculée le {datetime.fromisoformat(entree['genere']):%d/%m/%Y à %H:%M}")
+            return Vue(contenu)
+    return Vue()
+
+
+# --------- Génération (CLI) ---------
+
+def empreintes_jours(df):
+    """Empreinte des lignes de chaque jour d'admission : un jour ajouté, retiré ou modifié change d'empreinte"""
+    import pandas as pd
+
+    lignes = pd.util.hash_pandas_object(df, index=False)
+    par_jour = lignes.groupby(df["Date_admission"].dt.normalize().to_numpy()).sum()
+    return {f"{jour:%Y-%m-%d}": str(valeur) for jour, valeur in par_jour.items()}
+
+
+def resoudre_periode(preset, premier_jour, dernier_jour):
+    """Fenêtre (début, fin) d'un préréglage : toute la période, `jours` derniers jours ou `debut`/`fin` fixes"""
+    if "jours" in preset:
+        debut = date.fromordinal(dernier_jour.toordinal() - preset["jours"] + 1)
+        return max(debut, premier_jour), dernier_jour
+    debut = date.fromisoformat(preset["debut"]) if preset.get("debut") else premier_jour
+    fin = date.fromisoformat(preset["fin"]) if preset.get("fin") else dernier_jour
+    return max(debut, premier_jour), min(fin, dernier_jour)
+
+
+def presets(nom_page):
+    return config.SNAPSHOTS["pages"].get(nom_page, config.SNAPSHOTS["presets"])
+
+
+def _source(page):
+    return hashlib.blake2b((APP_DIR / page).read_bytes(), digest_size=8).hexdigest()
+
+
+def capturer(page, preset, fenetre, premier_jour, dernier_jour):
+    """Exécute la page avec les filtres du préréglage et retourne la capture (état, figures, valeurs)"""
+    global _capture
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_DIR / page), default_timeout=600)
+    if fenetre != (premier_jour, dernier_jour):
+        at.session_state[PAGES[page]["periode"]] = fenetre
+    for cle, valeur in preset.get("widgets", {}).items():
+        at.session_state[cle] = valeur
+
+    _capture = {"figures": {}, "valeurs": {}}
+    try:
+        at.run()
+        capture = _capture
+    finally:
+        _capture = None
+    if at.exception:
+        raise RuntimeError(f"{page} [{preset['nom']}] : {at.exception[0].value}")
+    if "etat" not in capture:
+        raise RuntimeError(f"{page} n'appelle pas snapshots.vue()")
+    return capture
+
+
+def raison_regeneration(page, preset, precedent, fenetre, jours_modifies, modeles_modifies, source, force):
+    """Motif de régénération d'un préréglage, ou None s'il peut être conservé"""
+    options = PAGES[page]
+    if force:
+        return "forcée"
+    if precedent is None:
+        return "nouveau"
+    if not (dossier_instantanes() / precedent["fichier"]).exists():
+        return "fichier manquant"
+    if precedent["preset"] != preset or precedent["source"] != source:
+        return "préréglage ou page modifié"
+    if precedent["fenetre"] != [jour.isoformat() for jour in fenetre]:
+        return "fenêtre déplacée"
+    if options.get("modeles") and modeles_modifies:
+        return "modèles réentraînés"
+    if jours_modifies and options.get("historique"):
+        return f"{len(jours_modifies)} jour(s) modifié(s)"
+    # L'occupation et les agrégats d'une fenêtre ne dépendent que des jours jusqu'à sa fin
+    touches = [jour for jour in jours_modifies if jour <= fenetre[1].isoformat()]
+    if touches:
+        return f"{len(touches)} jour(s) modifié(s) dans la fenêtre"
+    return None
+
+
+def generer(pages=None, noms_presets=None, force=False):
+    """Régénère les instantanés dont les données ont changé et réécrit le manifeste ; retourne le rapport"""
+    import warnings
+
+    from streamlit.logger import set_log_level
+
+    from loaders import get_admissions, version_donnees, version_modeles
+
+    warnings.filterwarnings("ignore")
+    set_log_level("error")
+
+    dossier = dossier_instantanes()
+    dossier.mkdir(parents=True, exist_ok=True)
+    ancien = _lire_manifeste() or {"jours": {}, "instantanes": {}, "modeles": None}
+
+    df = get_admissions()
+    jours = empreintes_jours(df)
+    jours_modifies = sorted(
+        jour for jour in set(jours) | set(ancien["jours"]) if jours.get(jour) != ancien["jours"].get(jour)
+    )
+    premier_jour, dernier_jour = date.fromisoformat(min(jours)), date.fromisoformat(max(jours))
+    modeles = version_modeles()
+
+    manifeste = {
+        "version": list(version_donnees()),
+        "modeles": modeles,
+        "jours": jours,
+        "genere": datetime.now().isoformat(timespec="seconds"),
+        "instantanes": {},
+    }
+    rapport = []
+    for page, options in PAGES.items():
+        nom_page = options["nom"]
+        anciens = ancien["instantanes"].get(nom_page, {})
+        source = _source(page)
+        for preset in presets(nom_page):
+            precedent = anciens.get(preset["nom"])
+            selectionne = (pages is None or page in pages) and (noms_presets is None or preset["nom"] in noms_presets)
+            if not selectionne:
+                # Hors sélection : conservé tel quel tant que ses données n'ont pas changé
+                if precedent is not None and not raison_regeneration(
+                    page, preset, precedent, tuple(map(date.fromisoformat, precedent["fenetre"])), jours_modifies,
+                    modeles != ancien["modeles"], source, False,
+                ):
+                    manifeste["instantanes"].setdefault(nom_page, {})[preset["nom"]] = precedent
+                continue
+
+            fenetre = resoudre_periode(preset, premier_jour, dernier_jour)
+            raison = raison_regeneration(
+                page, preset, precedent, fenetre, jours_modifies, modeles != ancien["modeles"], source, force
+            )
+            if raison is None:
+                manifeste["instantanes"].setdefault(nom_page, {})[preset["nom"]] = precedent
+                rapport.append((nom_page, preset["nom"], "conservé", 0.0))
+                continue
+
+            debut = time.perf_counter()
+            capture = capturer(page, preset, fenetre, premier_jour, dernier_jour)
+            contenu = {
+                "page": nom_page,
+                "preset": preset["nom"],
+                "etat": capture["etat"],
+                "figures": capture["figures"],
+                "valeurs": capture["valeurs"],
+            }
+            texte = json.dumps(contenu, ensure_ascii=False)
+            fichier = f"{hashlib.blake2b(texte.encode(), digest_size=12).hexdigest()}.json"
+            (dossier / fichier).write_text(texte, encoding="utf-8")
+            manifeste["instantanes"].setdefault(nom_page, {})[preset["nom"]] = {
+                "etat": capture["etat"],
+                "fenetre": [jour.isoformat() for jour in fenetre],
+                "preset": preset,
+                "source": source,
+                "fichier": fichier,
+                "genere": datetime.now().isoformat(timespec="seconds"),
+            }
+            rapport.append((nom_page, preset["nom"], raison, time.perf_counter() - debut))
+
+    # Le manifeste est remplacé en une fois : une génération interrompue laisse l'ancien en place
+    temporaire = dossier / f"manifest.json.{os.getpid()}.tmp"
+    temporaire.write_text(json.dumps(manifeste, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(temporaire, dossier / "manifest.json")
+
+    utilises = {entree["fichier"] for entrees in manifeste["instantanes"].values() for entree in entrees.values()}
+    for fichier in dossier.glob("*.json"):
+        if fichier.name != "manifest.json" and fichier.name not in utilises:
+            fichier.unlink(missing_ok=True)
+    return rapport
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=None, choices=list(PAGES))
+    parser.add_argument("--presets", nargs="+", default=None, help="Noms des préréglages à régénérer (défaut : tous)")
+    parser.add_argument("--force", action="store_true", help="Régénérer même si les données n'ont pas changé")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    rapport = generer(args.pages, args.presets, args.force)
+    print(f"{'page':<26} {'préréglage':<20} {'durée (s)':>9}  statut")
+    for nom_page, nom_preset, statut, duree in rapport:
+        print(f"{nom_page:<26} {nom_preset:<20} {duree:>9.1f}  {statut}")
+    regeneres = sum(statut != "conservé" for *_, statut, _ in rapport)
+    print(f"✅ {regeneres} instantané(s) régénéré(s), {len(rapport) - regeneres} conservé(s) en {time.perf_counter() - debut:.1f} s")
+
+
+if __name__ == "__main__":
+    # Les pages importent `snapshots` : la capture doit passer par ce module, pas par `__main__`
+    sys.path.insert(0, str(APP_DIR))
+    import snapshots
+
+    snapshots.main()
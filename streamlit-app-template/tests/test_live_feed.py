@@ -0,0 +1,32 @@
+import json
+import time
+
+from live_feed import FileTailer, LiveAggregates
+
+EVENEMENT = {"Date_heure_admission": "2026-03-02 10:15:00", "Service d'admission": "Urgences", "Lits occupes": 1}
+
+
+def test_evenements_rejetes_comptes_et_gardes(tmp_path):
+    journal = tmp_path / "admissions.jsonl"
+    journal.write_bytes(
+        json.dumps(EVENEMENT).encode() + b"\n"
+        + b"{pas du json}\n"
+        + b"\xff\xfe\n"
+        + json.dumps({"Service d'admission": "Urgences"}).encode() + b"\n"
+    )
+    agregats = LiveAggregates()
+    tailer = FileTailer(journal, agregats, poll_interval=0.01, from_start=True).start()
+    try:
+        for _ in range(200):
+            if agregats.totals.count + agregats.errors == 4:
+                break
+            time.sleep(0.01)
+    finally:
+        tailer.stop()
+
+    assert agregats.totals.count == 1
+    assert agregats.last_event.year == 2026
+    assert agregats.errors == 3
+    rejets = agregats.recent_rejections()
+    assert [rejet["Raison"].split(" :")[0] for rejet in rejets] == ["KeyError", "UnicodeDecodeError", "JSONDecodeError"]
+    assert rejets[2]["Événement"] == "{pas du json}"
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from patients import PatientIndex, est_readmission
+
+
+def admissions(lignes):
+    """Jeu d'admissions minimal : (site, identifiant, date, durée) par ligne"""
+    df = pd.DataFrame(lignes, columns=["Site", "ID_patient", "Date_heure_admission", "Durée du séjour estimé"])
+    df["Date_heure_admission"] = pd.to_datetime(df["Date_heure_admission"])
+    df["Date_admission"] = df["Date_heure_admission"].dt.normalize()
+    return df.assign(**{"Service d'admission": "Urgences", "Gravité": "Faible"})
+
+
+def test_patients_distincts_par_site():
+    # Le patient 1 du site A et le patient 1 du site B sont deux personnes différentes
+    df = admissions([
+        ("A", 1, "2024-01-01", 2),
+        ("B", 1, "2024-01-05", 2),
+        ("A", 1, "2024-03-01", 2),
+        ("B", 2, "2024-06-01", 2),
+    ])
+    index = PatientIndex(df)
+
+    assert index.nb_patients == 3
+    assert index.lignes(("A", 1)).tolist() == [0, 2]
+    assert index.lignes(("B", 1)).tolist() == [1]
+    assert np.isnan(index.delai[1])
+    assert index.readmissions(jours=30)["Réadmissions"].sum() == 0
+    assert index.plus_frequents(1).to_dict("records") == [{"Site": "A", "ID_patient": 1, "Admissions": 2}]
+
+
+def test_sans_site_identifiant_seul():
+    df = admissions([("A", 1, "2024-01-01", 2), ("A", 1, "2024-01-10", 2)]).drop(columns="Site")
+    index = PatientIndex(df)
+
+    assert index.nb_patients == 1
+    assert index.lignes(1).tolist() == [0, 1]
+    assert index.delai[0] == 7
+
+
+def test_sejours_chevauchants_pas_readmission():
+    # Deuxième admission pendant le premier séjour : délai négatif, pas une réadmission
+    df = admissions([
+        ("A", 1, "2024-01-01", 10),
+        ("A", 1, "2024-01-05", 2),
+        ("A", 1, "2024-01-09", 2),
+        ("A", 2, "2024-06-01", 1),
+    ]).drop(columns="Site")
+    index = PatientIndex(df)
+
+    assert index.delai[:2].tolist() == [-6, 2]
+    assert est_readmission(index.delai, 30).tolist() == [False, True, False, False]
+    assert index.readmissions(jours=30)["Réadmissions"].sum() == 1
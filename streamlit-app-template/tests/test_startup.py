@@ -0,0 +1,13 @@
+import pytest
+
+from bench_startup import MAX_TTFR_MS, PAGES, bench_page
+
+# Jeu généré (bench_pages.fixture) : le test ne dépend pas des données locales de l'application
+NB_ROWS = 50_000
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_premier_rendu(page):
+    # Médiane de trois exécutions, chacune dans un processus neuf (imports et caches froids)
+    mesures = bench_page(page, repeat=3, nb_rows=NB_ROWS)
+    assert mesures["ttfr_p50_ms"] <= MAX_TTFR_MS, f"{page} : premier rendu en {mesures['ttfr_p50_ms']:.0f} ms"
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import config
+
+TOTAL = "page (total)"
+
+_verrou = threading.Lock()
+# (page, section) -> dernières durées en secondes, partagées par toutes les sessions du processus
+_durees = defaultdict(lambda: deque(maxlen=config.PROFILING["window"]))
+
+
+def enregistrer(page, section, secondes):
+    with _verrou:
+        _durees[(page, section)].append(secondes)
+    if config.METRICS["enabled"]:
+        from metrics_exporter import RERUN, SECTION
+
+        if section == TOTAL:
+            RERUN.observe(secondes, page=page)
+        else:
+            SECTION.observe(secondes, page=page, section=section)
+
+
+def statistiques(page=None):
+    """Nombre de mesures, p50/p95/p99 et dernière durée (ms) par section, dans l'ordre d'exécution"""
+    # Importés ici : le module est chargé par l'en-tête des pages, avant les bibliothèques d'analyse
+    import numpy as np
+    import pandas as pd
+
+    with _verrou:
+        mesures = {cle: np.array(durees) * 1000 for cle, durees in _durees.items() if page in (None, cle[0])}
+    lignes = [
+        {
+            "Page": cle[0],
+            "Section": cle[1],
+            "n": len(durees),
+            "p50 (ms)": np.percentile(durees, 50),
+            "p95 (ms)": np.percentile(durees, 95),
+            "p99 (ms)": np.percentile(durees, 99),
+            "dernière (ms)": durees[-1],
+        }
+        for cle, durees in mesures.items()
+    ]
+    return pd.DataFrame(lignes, columns=["Page", "Section", "n", "p50 (ms)", "p95 (ms)", "p99 (ms)", "dernière (ms)"])
+
+
+def reinitialiser(page=None):
+    with _verrou:
+        for cle in [cle for cle in _durees if page in (None, cle[0])]:
+            del _durees[cle]
+
+
+class PageTimer:
+    """Chronométrage des sections d'une exécution de page.
+
+    `etape(nom)` clôt la section en cours et ouvre la suivante, sans réindenter le code de la page ;
+    `section(nom)` s'utilise comme gestionnaire de contexte ou comme décorateur. Actif si
+    `config.PROFILING` ou `config.METRICS` l'est ; sinon chaque appel se réduit à un test de booléen.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.actif = config.PROFILING["enabled"] or config.METRICS["enabled"]
+        self._en_cours = None
+        if config.METRICS["enabled"]:
+            from metrics_exporter import demarrer_exportation
+
+            demarrer_exportation()
+        if self.actif:
+            self._debut_page = self._debut = time.perf_counter()
+
+    def etape(self, nom):
+        if not self.actif:
+            return
+        maintenant = time.perf_counter()
+        if self._en_cours is not None:
+            enregistrer(self.page, self._en_cours, maintenant - self._debut)
+        self._en_cours, self._debut = nom, maintenant
+
+    def section(self, nom):
+        if not self.actif:
+            return nullcontext()
+        return self._section(nom)
+
+    @contextmanager
+    def _section(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            enregistrer(self.page, nom, time.perf_counter() - debut)
+
+    def fin(self):
+        """Clôt la dernière section, enregistre la durée totale et affiche le panneau si demandé"""
+        if not self.actif:
+            return
+        self.etape(None)
+        enregistrer(self.page, TOTAL, time.perf_counter() - self._debut_page)
+        if config.PROFILING["enabled"] and config.PROFILING["panel"]:
+            afficher_panneau(self.page)
+
+
+def afficher_panneau(page):
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Temps par section", expanded=False):
+        stats = statistiques(page).drop(columns="Page")
+        st.dataframe(stats.round(1), hide_index=True, use_container_width=True)
+        if st.button("Réinitialiser", key=f"reinitialiser_temps_{page}"):
+            reinitialiser(page)
+
+    with st.sidebar.expander("🗄️ Caches", expanded=False):
+        from cache_manager import statistiques as statistiques_caches
+
+        st.dataframe(statistiques_caches().round(3), hide_index=True, use_container_width=True)
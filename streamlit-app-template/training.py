@@ -0,0 +1,291 @@
+"""Pipeline d'entraînement des modèles de prévision (extrait de notebooks/modelisation.ipynb).
+
+Usage :
+    python training.py --data data/model_data.csv --output models --jobs 8
+
+Les candidats des grilles (Prophet et modèles de personnel) sont évalués en parallèle
+dans un pool de processus ; chaque ajustement est mis en cache sur disque selon ses paramètres.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+from inference import MODELS_DIR
+
+DATA_PATH = Path(__file__).parent / "data" / "model_data.csv"
+CACHE_DIR = Path(__file__).parent / ".cache" / "training"
+
+# Date limite des données d'entraînement (identique à `load_data3`)
+DATE_LIMITE = "2024-11-15"
+
+# Variables externes ajoutées comme régresseurs à Prophet
+EXTERNAL_FEATURES = [
+    "Jour_semaine", "Mois", "Saison", "Vacances_scolaires", "Température",
+    "Evenement_Special_Canicule", "Evenement_Special_Pollens allergènes",
+    "Evenement_Special_Épidémie de gastro", "Evenement_Special_Épidémie de grippe",
+]
+
+# Colonnes exclues des features des modèles de personnel
+NON_FEATURES = ["Date_admission", "Annee", "Jour", "Lits occupes", "Materiel utilise",
+                "Nb medecin", "Nb infirmier", "Nb aide soignant"]
+
+# Grille de Prophet
+PROPHET_GRID = {
+    "changepoint_prior_scale": [0.01, 0.05, 0.1, 0.2],
+    "seasonality_prior_scale": [1, 5, 10],
+}
+
+# Grilles des modèles de personnel
+STAFFING_GRIDS = {
+    "Random Forest": {"n_estimators": [100, 200], "max_depth": [10, 20, None]},
+    "XGBoost": {"n_estimators": [100, 200], "max_depth": [3, 6], "learning_rate": [0.01, 0.1]},
+    "Régression Linéaire": {},
+}
+
+# Cible -> nom du fichier du modèle sauvegardé
+STAFFING_TARGETS = {
+    "Nb medecin": "model_nb_medecins.pkl",
+    "Nb infirmier": "model_nb_infirmiers.pkl",
+    "Nb aide soignant": "model_nb_aides_soignants.pkl",
+}
+
+CV_FOLDS = 3
+
+
+def load_daily(file_path=DATA_PATH, date_limite=DATE_LIMITE):
+    """Charge le jeu journalier trié jusqu'à la date limite"""
+    df = pd.read_csv(file_path)
+    df["Date_admission"] = pd.to_datetime(df["Date_admission"])
+    df = df.sort_values(by="Date_admission")
+    return df[df["Date_admission"] <= date_limite].reset_index(drop=True)
+
+
+def encode_daily(df, transformers):
+    """Applique des transformateurs déjà ajustés (ordinal, OneHot, scaler) au jeu journalier"""
+    ordinal_encoder, onehot_encoder, scaler = transformers
+    data = df.copy()
+    data["Vacances_scolaires"] = data["Vacances_scolaires"].map({"Oui": 1, "Non": 0}).astype(int)
+    data[["Jour_semaine", "Mois", "Saison"]] = ordinal_encoder.transform(data[["Jour_semaine", "Mois", "Saison"]])
+
+    encoded_features = pd.DataFrame(
+        onehot_encoder.transform(data[["Evenement_Special"]]),
+        columns=onehot_encoder.get_feature_names_out(["Evenement_Special"]),
+        index=data.index,
+    )
+    data = pd.concat([data.drop(columns=["Météo", "Evenement_Special"]), encoded_features], axis=1)
+    data[["Température"]] = scaler.transform(data[["Température"]])
+    return data
+
+
+def prepare_data(file_path=DATA_PATH, date_limite=DATE_LIMITE):
+    """Charge le jeu journalier, ajuste les encodeurs et découpe train/test (80/20 chronologique)"""
+    df = load_daily(file_path, date_limite)
+
+    ordinal_encoder = OrdinalEncoder().fit(df[["Jour_semaine", "Mois", "Saison"]])
+    onehot_encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop="first").fit(df[["Evenement_Special"]])
+    scaler = StandardScaler().fit(df[["Température"]])
+    transformers = (ordinal_encoder, onehot_encoder, scaler)
+    data = encode_daily(df, transformers)
+
+    split = int(len(data) * 0.8)
+    train, test = data.iloc[:split], data.iloc[split:]
+    return train, test, transformers
+
+
+def _quiet_prophet_logs():
+    import cmdstanpy
+
+    # Désactiver les logs inutiles
+    logging.getLogger("prophet").setLevel(logging.ERROR)
+    cmdstanpy.utils.get_logger().setLevel(logging.ERROR)
+
+
+def fit_prophet(params, train, test):
+    """Ajuste Prophet avec régresseurs externes sur `train` et mesure l'erreur sur `test`"""
+    from prophet import Prophet
+
+    _quiet_prophet_logs()
+    model = Prophet(yearly_seasonality=True, weekly_seasonality=True, daily_seasonality=False, **params)
+    for feature in EXTERNAL_FEATURES:
+        model.add_regressor(feature)
+    model.fit(train[["Date_admission", "Nombre_admissions", *EXTERNAL_FEATURES]].rename(
+        columns={"Date_admission": "ds", "Nombre_admissions": "y"}
+    ))
+
+    forecast = model.predict(test[["Date_admission", *EXTERNAL_FEATURES]].rename(columns={"Date_admission": "ds"}))
+    y_pred = forecast["yhat"].to_numpy()
+    y_true = test["Nombre_admissions"].to_numpy()
+    return {
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "model": model,
+    }
+
+
+def make_regressor(model_name, params):
+    """Instancie un modèle de personnel (un seul thread par modèle : le parallélisme est entre candidats)"""
+    if model_name == "Random Forest":
+        from sklearn.ensemble import RandomForestRegressor
+
+        return RandomForestRegressor(n_jobs=1, random_state=42, **params)
+    if model_name == "XGBoost":
+        from xgboost import XGBRegressor
+
+        return XGBRegressor(n_jobs=1, **params)
+    if model_name == "Régression Linéaire":
+        from sklearn.linear_model import LinearRegression
+
+        return LinearRegression(**params)
+    raise ValueError(f"Modèle inconnu : {model_name}")
+
+
+def fit_regressor(model_name, params, X_fit, y_fit, X_eval, y_eval):
+    """Ajuste un modèle de personnel sur un pli et mesure l'erreur sur le pli de validation"""
+    model = make_regressor(model_name, params)
+    model.fit(X_fit, y_fit)
+    y_pred = model.predict(X_eval)
+    return {
+        "mae": float(mean_absolute_error(y_eval, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_eval, y_pred))),
+        "model": model,
+    }
+
+
+def _run_task(cache_dir, fn_name, args):
+    """Exécuté dans un processus du pool : appelle la fonction d'ajustement, via le cache disque si actif"""
+    fn = globals()[fn_name]
+    if cache_dir is not None:
+        fn = joblib.Memory(cache_dir, verbose=0).cache(fn)
+    return fn(*args)
+
+
+def _grid(param_grid):
+    """Liste des combinaisons de paramètres d'une grille (une combinaison vide si la grille est vide)"""
+    keys = list(param_grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+
+
+def run_pipeline(data_path=DATA_PATH, output_dir=MODELS_DIR, n_jobs=None, cache_dir=CACHE_DIR):
+    """Évalue toutes les grilles en parallèle, sauvegarde les meilleurs modèles et retourne le rapport"""
+    start = time.perf_counter()
+    train, test, transformers = prepare_data(data_path)
+    X_train = train.drop(columns=NON_FEATURES)
+    X_test = test.drop(columns=NON_FEATURES)
+    folds = list(KFold(n_splits=CV_FOLDS).split(X_train))
+    cache_dir = None if cache_dir is None else str(cache_dir)
+
+    with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        def submit(fn_name, *args):
+            return executor.submit(_run_task, cache_dir, fn_name, args)
+
+        # Phase 1 : candidats Prophet (évalués sur le test) et validation croisée des modèles de personnel
+        prophet_futures = {
+            tuple(params.items()): submit("fit_prophet", params, train, test) for params in _grid(PROPHET_GRID)
+        }
+        cv_futures = {}
+        for target, (model_name, param_grid) in itertools.product(STAFFING_TARGETS, STAFFING_GRIDS.items()):
+            for params in _grid(param_grid):
+                for fold, (fit_idx, eval_idx) in enumerate(folds):
+                    cv_futures[(target, model_name, tuple(params.items()), fold)] = submit(
+                        "fit_regressor", model_name, params,
+                        X_train.iloc[fit_idx], train[target].iloc[fit_idx],
+                        X_train.iloc[eval_idx], train[target].iloc[eval_idx],
+                    )
+
+        # Meilleurs paramètres par (cible, modèle) selon la MAE moyenne de validation croisée
+        cv_scores = {}
+        for (target, model_name, params, fold), future in cv_futures.items():
+            cv_scores.setdefault((target, model_name, params), []).append(future.result()["mae"])
+        best_params = {}
+        for (target, model_name, params), scores in cv_scores.items():
+            score = float(np.mean(scores))
+            if (target, model_name) not in best_params or score < best_params[(target, model_name)][1]:
+                best_params[(target, model_name)] = (params, score)
+
+        # Phase 2 : ajustement des meilleurs candidats sur tout le train et comparaison sur le test
+        holdout_futures = {
+            key: submit("fit_regressor", key[1], dict(params), X_train, train[key[0]], X_test, test[key[0]])
+            for key, (params, _) in best_params.items()
+        }
+        prophet_results = {params: future.result() for params, future in prophet_futures.items()}
+        holdout_results = {key: future.result() for key, future in holdout_futures.items()}
+
+    # Sélection des gagnants
+    best_prophet_params = min(prophet_results, key=lambda params: prophet_results[params]["mae"])
+    report = {
+        "data": str(data_path),
+        "prophet": {
+            "best_params": dict(best_prophet_params),
+            "candidates": [{"params": dict(params), "mae": r["mae"], "rmse": r["rmse"]} for params, r in prophet_results.items()],
+        },
+        "staffing": {},
+    }
+    winners = {}
+    for target in STAFFING_TARGETS:
+        candidates = {model_name: holdout_results[(target, model_name)] for model_name in STAFFING_GRIDS}
+        model_name = min(candidates, key=lambda name: candidates[name]["mae"])
+        winners[target] = candidates[model_name]["model"]
+        report["staffing"][target] = {
+            "best_model": model_name,
+            "candidates": [
+                {
+                    "model": name,
+                    "params": dict(best_params[(target, name)][0]),
+                    "cv_mae": best_params[(target, name)][1],
+                    "mae": result["mae"],
+                    "rmse": result["rmse"],
+                }
+                for name, result in candidates.items()
+            ],
+        }
+
+    # Sauvegarde des modèles et transformateurs gagnants
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ordinal_encoder, onehot_encoder, scaler = transformers
+    joblib.dump(prophet_results[best_prophet_params]["model"], output_dir / "prophet_model.pkl")
+    joblib.dump(ordinal_encoder, output_dir / "ordinal_encoder.pkl")
+    joblib.dump(onehot_encoder, output_dir / "onehot_encoder.pkl")
+    joblib.dump(scaler, output_dir / "scaler.pkl")
+    for target, file_name in STAFFING_TARGETS.items():
+        joblib.dump(winners[target], output_dir / file_name)
+
+    report["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(DATA_PATH), help="Jeu de données journalier (CSV)")
+    parser.add_argument("--output", default=str(MODELS_DIR), help="Dossier de sauvegarde des modèles")
+    parser.add_argument("--jobs", type=int, default=None, help="Nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR), help="Cache disque des ajustements")
+    parser.add_argument("--no-cache", action="store_true", help="Désactive le cache des ajustements")
+    parser.add_argument("--report", default=None, help="Chemin du rapport JSON (défaut : <output>/training_report.json)")
+    args = parser.parse_args()
+
+    report = run_pipeline(args.data, args.output, args.jobs, None if args.no_cache else args.cache_dir)
+
+    print(f"✅ Meilleur Prophet : {report['prophet']['best_params']}")
+    for target, result in report["staffing"].items():
+        print(f"🏆 {target} : {result['best_model']}")
+    print(f"⏱ Durée totale : {report['elapsed_seconds']} s")
+
+    report_path = Path(args.report or Path(args.output) / "training_report.json")
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
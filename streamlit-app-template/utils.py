@@ -1,5 +1,13 @@
-import pandas as pd
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
 
 
 def load_data(file_path):
@@ -38,25 +46,98 @@ def definir_tranche_age(age):
         return "Senior"
     
 
-def load_data2(file_path):
-    """Charge et prépare les données pour l'analyse"""
-    # Détermine le format en fonction de l'extension
-    if file_path.endswith(".csv"):
+MOIS_ORDRE = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+JOURS_ORDRE = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Colonnes identiques pour toutes les admissions d'un même jour (on garde la première valeur)
+COLONNES_JOUR = ["Jour_semaine", "Mois", "Annee", "Saison", "Vacances_scolaires", "Evenement_Special"]
+# Colonnes sommées par jour
+COLONNES_SOMMES = ["Lits occupes", "Materiel utilise", "Nb medecin", "Nb infirmier", "Nb aide soignant"]
+
+
+def lister_sites(path):
+    """Fichiers d'admissions à charger : le fichier lui-même, ou un fichier par site si `path` est un dossier.
+
+    Un dossier `*.parquet` (Parquet partitionné) est un seul jeu de données.
+    """
+    path = Path(path)
+    if path.is_dir() and path.suffix != ".parquet":
+        return sorted([*path.glob("*.csv"), *path.glob("*.parquet")])
+    return [path]
+
+
+def _lire_admissions(file_path):
+    """Lit un fichier d'admissions brut (CSV ou Parquet) et prépare les colonnes de date"""
+    file_path = str(file_path)
+    if file_path.endswith(".parquet"):
+        # Colonnes relues comme depuis un CSV : `Annee`, clé de partition, est recalculée plus bas et
+        # les catégories redeviennent des chaînes
+        df = pd.read_parquet(file_path).drop(columns="Annee", errors="ignore")
+        for colonne in df.select_dtypes("category").columns:
+            df[colonne] = df[colonne].astype(df[colonne].cat.categories.dtype)
+    else:
         df = pd.read_csv(file_path)
-        df["Date_heure_admission"] = pd.to_datetime(df["Date_heure_admission"])
-        df["Date_heure_admission"] = df["Date_heure_admission"].apply(corriger_annee)
-        df["Date_admission"] = df["Date_heure_admission"].dt.date
-        df["Annee"] = df["Date_heure_admission"].dt.year
-        df["Tranche_age"] = df["Âge"].apply(definir_tranche_age)
-            # Assurer l'ordre des mois
-        mois_ordre = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-        df["Mois"] = pd.Categorical(df["Mois"], categories=mois_ordre, ordered=True)
-        # Assurer l'ordre des jours de la semaine
-        jours_ordre = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        df["Jour_semaine"] = pd.Categorical(df["Jour_semaine"], categories=jours_ordre, ordered=True)
+    df["Date_heure_admission"] = pd.to_datetime(df["Date_heure_admission"])
+    df["Date_heure_admission"] = df["Date_heure_admission"].apply(corriger_annee)
+    df["Date_admission"] = df["Date_heure_admission"].dt.date
+    df["Annee"] = df["Date_heure_admission"].dt.year
+    # Assurer l'ordre des mois et des jours de la semaine
+    df["Mois"] = pd.Categorical(df["Mois"], categories=MOIS_ORDRE, ordered=True)
+    df["Jour_semaine"] = pd.Categorical(df["Jour_semaine"], categories=JOURS_ORDRE, ordered=True)
+    return df
+
+
+# Pools de processus des chargements multi-sites, par nombre de processus : gardés d'un chargement
+# à l'autre plutôt que démarrés et arrêtés à chaque appel
+_pools = {}
+_verrou_pools = threading.Lock()
 
+
+def _pool_sites(nb_processus):
+    # Processus démarrés par `spawn` : un fork du serveur Streamlit, multithreadé, peut bloquer
+    # l'enfant sur un verrou hérité
+    with _verrou_pools:
+        if nb_processus not in _pools:
+            _pools[nb_processus] = ProcessPoolExecutor(nb_processus, mp_context=multiprocessing.get_context("spawn"))
+        return _pools[nb_processus]
+
+
+def _charger_sites(fonction, fichiers, max_workers=None):
+    """Applique `fonction` à chaque site, dans un pool de processus s'il y a plusieurs sites"""
+    if len(fichiers) == 1:
+        return [fonction(fichiers[0])]
+    nb_processus = min(len(fichiers), max_workers or os.cpu_count())
+    try:
+        return list(_pool_sites(nb_processus).map(fonction, fichiers))
+    except BrokenProcessPool:
+        # Processus tué (mémoire...) : le pool est inutilisable, le prochain chargement en démarre un autre
+        with _verrou_pools:
+            _pools.pop(nb_processus, None)
+        raise
+
+
+def _admissions_site(file_path):
+    df = _lire_admissions(file_path)
+    df["Tranche_age"] = df["Âge"].apply(definir_tranche_age)
+    return df
+
+
+def load_data2(file_path, max_workers=None):
+    """Charge et prépare les données pour l'analyse (un fichier, ou un dossier avec un fichier par site).
+
+    Les pages détaillées filtrent, échantillonnent et exportent des admissions : les sites sont lus en
+    parallèle puis réunis en un seul DataFrame. Le jeu journalier (`load_data3`) ne réunit que des
+    agrégats partiels.
+    """
+    fichiers = lister_sites(file_path)
+    sites = _charger_sites(_admissions_site, fichiers, max_workers)
+    if len(sites) == 1:
+        df = sites[0]
     else:
-        df = pd.read_parquet(file_path)
+        # Une seule copie des lignes ; le site est une catégorie (un code par ligne, pas une chaîne)
+        df = pd.concat(sites, ignore_index=True)
+        codes = np.repeat(np.arange(len(sites)), [len(site) for site in sites])
+        df["Site"] = pd.Categorical.from_codes(codes, [fichier.stem for fichier in fichiers])
 
     # Conversion de la colonne Date_heure_admission au bon format
     if not pd.api.types.is_datetime64_dtype(df["Date_admission"]):
@@ -64,49 +145,59 @@ def load_data2(file_path):
     
     return df
 
-def load_data3(file_path):
-    """Charge et prépare les données pour l'analyse"""
-    # Détermine le format en fonction de l'extension
-    if file_path.endswith(".csv"):
-        df = pd.read_csv(file_path)
-        df["Date_heure_admission"] = pd.to_datetime(df["Date_heure_admission"])
-        df["Date_heure_admission"] = df["Date_heure_admission"].apply(corriger_annee)
-        df["Date_admission"] = df["Date_heure_admission"].dt.date
-        df["Annee"] = df["Date_heure_admission"].dt.year 
-        date_limite = datetime.strptime("2024-11-15", "%Y-%m-%d").date()
-        df = df[df["Date_admission"] <= date_limite] 
-        # Assurer l'ordre des mois
-        mois_ordre = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-        df["Mois"] = pd.Categorical(df["Mois"], categories=mois_ordre, ordered=True)
-        # Assurer l'ordre des jours de la semaine
-        jours_ordre = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        df["Jour_semaine"] = pd.Categorical(df["Jour_semaine"], categories=jours_ordre, ordered=True)
-        admission_df = df.groupby("Date_admission", observed=True).agg({
-            "Jour_semaine": "first",
-            "Mois": "first",
-            "Annee": 'first',
-            "Saison": "first",
-            "Vacances_scolaires": "first",
-            "Température": "mean",
-            "Météo": lambda x: x.mode()[0] if not x.mode().empty else None,
-            "Lits occupes": "sum",
-            "Materiel utilise": "sum",
-            "Nb medecin": "sum",
-            "Nb infirmier": "sum",
-            "Nb aide soignant": "sum" ,
-            "Evenement_Special": "first"
-        }).reset_index()
-
-        admission_df["Température"] = admission_df["Température"].round().astype(int)
-        admission_df["Nb medecin"] = (admission_df["Nb medecin"] / 4).round().astype(int)
-        admission_df["Nb infirmier"] = (admission_df["Nb infirmier"] / 4).round().astype(int)
-        admission_df["Nb aide soignant"] = (admission_df["Nb aide soignant"] / 4).round().astype(int)
-
-        admission_df["Nombre_admissions"] = df.groupby("Date_admission").size().values
-        admission_df = admission_df.sort_values(by="Date_admission")
 
-    else:
-        df = pd.read_parquet(file_path)
+def agregats_partiels(file_path):
+    """Agrégats journaliers partiels d'un site : effectifs, sommes et comptes de météo par jour"""
+    df = _lire_admissions(file_path)
+    date_limite = datetime.strptime("2024-11-15", "%Y-%m-%d").date()
+    df = df[df["Date_admission"] <= date_limite]
+
+    grouped = df.groupby("Date_admission")
+    partiel = grouped[COLONNES_JOUR].first()
+    partiel[COLONNES_SOMMES] = grouped[COLONNES_SOMMES].sum()
+    partiel["Température_somme"] = grouped["Température"].sum()
+    partiel["Température_n"] = grouped["Température"].count()
+    partiel["Nombre_admissions"] = grouped.size()
+    meteo = df.groupby(["Date_admission", "Météo"]).size()
+    return partiel, meteo
+
+
+def fusionner_agregats(partiels):
+    """Fusionne les agrégats partiels des sites en un jeu journalier (moyenne = somme / effectif, mode = comptes)"""
+    concatenes = pd.concat([partiel for partiel, _ in partiels])
+    grouped = concatenes.groupby(level=0, sort=True)
+    jours = grouped[["Jour_semaine", "Mois", "Annee", "Saison"]].first()
+    sommes = grouped[[*COLONNES_SOMMES, "Température_somme", "Température_n", "Nombre_admissions"]].sum()
+
+    # Mode de la météo : valeur la plus fréquente, la plus petite en cas d'égalité (comme `Series.mode()[0]`)
+    meteo = pd.concat([comptes for _, comptes in partiels]).groupby(level=[0, 1]).sum().rename("n").reset_index()
+    meteo = meteo.sort_values(["Date_admission", "n", "Météo"], ascending=[True, False, True])
+    meteo = meteo.drop_duplicates("Date_admission").set_index("Date_admission")["Météo"]
+
+    # Vacances et événement peuvent différer d'un site à l'autre : « Oui » ou l'événement dès qu'un site
+    # le signale (le premier par ordre alphabétique si plusieurs), quel que soit l'ordre des fichiers
+    vacances = (concatenes["Vacances_scolaires"] == "Oui").groupby(level=0, sort=True).any()
+    evenements = concatenes["Evenement_Special"]
+    evenement = evenements.where(evenements != "Aucun").groupby(level=0, sort=True).min().fillna("Aucun")
+
+    admission_df = jours[["Jour_semaine", "Mois", "Annee", "Saison"]].copy()
+    admission_df["Vacances_scolaires"] = vacances.map({True: "Oui", False: "Non"})
+    admission_df["Température"] = (sommes["Température_somme"] / sommes["Température_n"]).round().astype(int)
+    admission_df["Météo"] = meteo.reindex(admission_df.index)
+    admission_df["Lits occupes"] = sommes["Lits occupes"]
+    admission_df["Materiel utilise"] = sommes["Materiel utilise"]
+    admission_df["Nb medecin"] = (sommes["Nb medecin"] / 4).round().astype(int)
+    admission_df["Nb infirmier"] = (sommes["Nb infirmier"] / 4).round().astype(int)
+    admission_df["Nb aide soignant"] = (sommes["Nb aide soignant"] / 4).round().astype(int)
+    admission_df["Evenement_Special"] = evenement
+    admission_df["Nombre_admissions"] = sommes["Nombre_admissions"]
+    return admission_df.reset_index()
+
+
+def load_data3(file_path, max_workers=None):
+    """Charge le jeu journalier : agrégats partiels calculés par site en parallèle, puis fusionnés"""
+    partiels = _charger_sites(agregats_partiels, lister_sites(file_path), max_workers)
+    admission_df = fusionner_agregats(partiels).sort_values(by="Date_admission")
 
     # Conversion de la colonne Date_heure_admission au bon format
     if not pd.api.types.is_datetime64_dtype(admission_df["Date_admission"]):
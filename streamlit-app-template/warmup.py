@@ -0,0 +1,158 @@
+"""Préchauffage du dashboard : données, agrégats et modèles chargés avant la première visite.
+
+Usage :
+    python warmup.py                                  # vérifie et chronomètre chaque étape, code 1 en cas d'échec
+    python warmup.py --serve -- --server.port 8501    # préchauffe puis lance Streamlit dans le même processus
+
+Avec `--serve`, le préchauffage tourne dans un thread pendant le démarrage de Streamlit et remplit
+les mêmes caches (`loaders.py`) que les pages. L'état est exposé sur `config.WARMUP` :
+    curl -i http://127.0.0.1:8599/ready     # 503 tant que le préchauffage n'est pas terminé, 200 ensuite
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import config
+
+APP_DIR = Path(__file__).parent
+
+
+def _importer_graphiques():
+    # Premier import de plotly (plus d'une seconde), payé sinon par la première page affichée
+    import plotly.express  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+
+
+def etapes():
+    """Étapes dans l'ordre des dépendances : les agrégats réutilisent les jeux déjà en cache"""
+    # Import différé : les caches de `loaders` sont déclarés une fois le runtime Streamlit démarré
+    import loaders
+
+    return [
+        ("modules graphiques", _importer_graphiques),
+        ("admissions", loaders.get_admissions),
+        ("admissions journalières", loaders.get_daily),
+        ("index des périodes", loaders.get_range_index),
+        ("agrégats temporels", loaders.get_rollups),
+        ("recensement des lits", loaders.get_recensement),
+        ("index des patients", loaders.get_patient_index),
+        ("échantillon stratifié", loaders.get_echantillon),
+        ("modèles et service de prévision", loaders.get_forecast_client),
+    ]
+
+_verrou = threading.Lock()
+_etat = {"pret": False, "en_cours": False, "etapes": [], "secondes": None, "erreur": None}
+
+
+def etat():
+    """Copie de l'état du préchauffage (prêt, étapes terminées, durée, erreur)"""
+    with _verrou:
+        return {**_etat, "etapes": list(_etat["etapes"])}
+
+
+def rechauffer(liste_etapes=None):
+    """Exécute chaque étape en la chronométrant ; s'arrête à la première erreur. Retourne l'état final"""
+    with _verrou:
+        _etat.update(pret=False, en_cours=True, etapes=[], secondes=None, erreur=None)
+    debut = time.perf_counter()
+    for nom, fonction in liste_etapes or etapes():
+        debut_etape = time.perf_counter()
+        try:
+            fonction()
+        except Exception as error:
+            with _verrou:
+                _etat.update(en_cours=False, erreur=f"{nom} : {type(error).__name__}: {error}")
+            break
+        with _verrou:
+            _etat["etapes"].append({"etape": nom, "secondes": round(time.perf_counter() - debut_etape, 3)})
+    else:
+        with _verrou:
+            _etat.update(pret=True, en_cours=False, secondes=round(time.perf_counter() - debut, 3))
+        if config.WARMUP["ready_file"]:
+            Path(config.WARMUP["ready_file"]).write_text(json.dumps(etat(), ensure_ascii=False))
+    return etat()
+
+
+class _ReadinessHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        chemin = self.path.split("?")[0]
+        if chemin == "/ready":
+            courant = etat()
+            code = 200 if courant["pret"] else 503
+        elif chemin == "/health":
+            # Vivacité seule : le processus répond, même pendant le préchauffage
+            courant, code = {"vivant": True}, 200
+        else:
+            self.send_error(404)
+            return
+        corps = json.dumps(courant, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        # Pas de journal pour chaque sonde du répartiteur de charge
+        pass
+
+
+def demarrer_sonde(host=None, port=None):
+    """Serveur HTTP de l'état de préchauffage (`/ready`, `/health`), dans un thread"""
+    serveur = ThreadingHTTPServer((host or config.WARMUP["host"], port or config.WARMUP["port"]), _ReadinessHandler)
+    serveur.daemon_threads = True
+    threading.Thread(target=serveur.serve_forever, daemon=True, name="warmup-ready").start()
+    return serveur
+
+
+def _afficher(courant):
+    for etape in courant["etapes"]:
+        print(f"  {etape['etape']:<35} {etape['secondes']:>8.2f} s")
+    if courant["pret"]:
+        print(f"✅ Préchauffage terminé en {courant['secondes']:.2f} s")
+    else:
+        print(f"❌ Préchauffage interrompu : {courant['erreur']}")
+
+
+def _rechauffer_serveur(attente_max=30):
+    # Attendre le runtime Streamlit pour que les caches soient créés avec son gestionnaire de stockage
+    from streamlit.runtime import Runtime
+
+    limite = time.monotonic() + attente_max
+    while not Runtime.exists() and time.monotonic() < limite:
+        time.sleep(0.05)
+    _afficher(rechauffer())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--serve", action="store_true", help="Lancer Streamlit dans le même processus après le préchauffage")
+    parser.add_argument("--host", default=config.WARMUP["host"], help="Adresse de la sonde /ready")
+    parser.add_argument("--port", type=int, default=config.WARMUP["port"], help="Port de la sonde /ready")
+    parser.add_argument("--ready-file", default=config.WARMUP["ready_file"], help="Fichier créé une fois prêt")
+    parser.add_argument("streamlit_args", nargs="*", help="Options transmises à `streamlit run` (après --)")
+    args = parser.parse_args()
+    config.WARMUP["ready_file"] = args.ready_file
+
+    if not args.serve:
+        courant = rechauffer()
+        _afficher(courant)
+        sys.exit(0 if courant["pret"] else 1)
+
+    # Les caches Streamlit sont propres au processus : le préchauffage doit tourner dans celui du serveur
+    demarrer_sonde(args.host, args.port)
+    print(f"⏳ Préchauffage en cours, état sur http://{args.host}:{args.port}/ready")
+    threading.Thread(target=_rechauffer_serveur, daemon=True, name="warmup").start()
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", str(APP_DIR / "Home.py"), *args.streamlit_args]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()